@@ -0,0 +1,81 @@
+"""Measure how long importing the editor module takes and what it pulls in.
+
+Usage::
+
+    python benchmarks/import_benchmark.py [--runs 5] [--max-ms 400]
+
+Every run starts a fresh interpreter with ``python -X importtime``.  The
+median cumulative time of ``kartoteka.ui`` and the slowest imported modules
+are printed.  The exit status is 1 when one of the heavy dependencies
+(``HEAVY_MODULES``) is imported eagerly or the median exceeds ``--max-ms``,
+so the script can guard against regressions in CI.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("openai", "requests", "PIL", "customtkinter")
+
+
+def parse_importtime(stderr):
+    """Return ``{module: (self_us, cumulative_us)}`` from ``-X importtime`` output."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        times[parts[2].strip()] = (int(parts[0]), int(parts[1]))
+    return times
+
+
+def run_once(code="import kartoteka.ui"):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    runs = [run_once() for _ in range(args.runs)]
+    totals = [times["kartoteka.ui"][1] / 1000 for times in runs]
+    median = statistics.median(totals)
+    print(f"import kartoteka.ui: median {median:.1f} ms over {args.runs} runs")
+
+    # leave out what the interpreter imports on its own (site, .pth files)
+    baseline = run_once("pass")
+    last = {m: t for m, t in runs[-1].items() if m not in baseline}
+    print("Slowest modules (cumulative):")
+    for name, (_self, cumulative) in sorted(
+        last.items(), key=lambda item: item[1][1], reverse=True
+    )[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    eager = [m for m in HEAVY_MODULES if m in last]
+    status = 0
+    if eager:
+        print(f"Heavy modules imported eagerly: {', '.join(eager)}")
+        status = 1
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"Import time above the limit of {args.max_ms:.0f} ms")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Measure accuracy and latency of the offline recognition engine.
+
+Usage::
+
+    python benchmarks/ocr_benchmark.py <folder> [--logos set_logos]
+
+Labels are read from ``<folder>/labels.csv`` (columns ``file``, ``name``,
+``number`` and ``set`` with the set code) or, when the file is missing, from
+file names in the ``name_number_setcode.jpg`` form.
+"""
+
+import argparse
+import csv
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kartoteka import ocr  # noqa: E402
+
+
+def load_labels(folder):
+    path = os.path.join(folder, "labels.csv")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8", newline="") as f:
+            return {row["file"]: row for row in csv.DictReader(f)}
+    labels = {}
+    for file in os.listdir(folder):
+        if not file.lower().endswith((".jpg", ".jpeg", ".png")):
+            continue
+        parts = re.split(r"[|_-]", os.path.splitext(file)[0])
+        if len(parts) >= 3:
+            labels[file] = {
+                "name": parts[0],
+                "number": parts[1],
+                "set": "_".join(parts[2:]),
+            }
+    return labels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("folder")
+    parser.add_argument("--logos", default="set_logos")
+    args = parser.parse_args(argv)
+
+    labels = load_labels(args.folder)
+    if not labels:
+        print("[ERROR] No labelled scans found")
+        return 1
+    if not ocr.available():
+        print("[WARN] pytesseract/tesseract not available, only set symbols are matched")
+
+    timings = []
+    hits = {"name": 0, "number": 0, "set": 0}
+    confident = 0
+    for file, label in sorted(labels.items()):
+        start = time.perf_counter()
+        result = ocr.recognize(os.path.join(args.folder, file), args.logos)
+        timings.append((time.perf_counter() - start) * 1000)
+        if result["confidence"] >= ocr.OCR_CONFIDENCE:
+            confident += 1
+        hits["name"] += result["name"].lower() == label["name"].strip().lower()
+        hits["number"] += result["number"] == str(label["number"]).lstrip("0")
+        hits["set"] += result["set_code"].lower() == label["set"].strip().lower()
+
+    total = len(labels)
+    timings.sort()
+    print(f"Scans:            {total}")
+    for key, value in hits.items():
+        print(f"{key.capitalize() + ' accuracy:':<18}{value / total:.1%}")
+    print(f"Confident:        {confident / total:.1%} (rest escalated to OpenAI)")
+    print(f"Latency p50:      {statistics.median(timings):.1f} ms")
+    print(f"Latency p95:      {timings[int(0.95 * (total - 1))]:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Measure how long the application needs to show the welcome screen.
+
+Usage::
+
+    python benchmarks/startup_benchmark.py [--runs 5]
+
+Every run creates a fresh window, records the time until the welcome screen
+is built (``ui_ready_at``) and until the background set synchronisation has
+finished (``sets_synced_at``), then closes the window.  A display is
+required.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def run_once(timeout=30.0):
+    import customtkinter as ctk
+    from kartoteka import CardEditorApp
+
+    root = ctk.CTk()
+    started = time.perf_counter()
+    app = CardEditorApp(root)
+    ui_ready = time.perf_counter() - started
+
+    def wait_for_sync():
+        if getattr(app, "sets_synced_at", None) is not None or (
+            time.perf_counter() - started > timeout
+        ):
+            root.quit()
+            return
+        root.after(20, wait_for_sync)
+
+    root.after(20, wait_for_sync)
+    root.mainloop()
+    synced = getattr(app, "sets_synced_at", None)
+    root.destroy()
+    return ui_ready, synced
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    ui_times, sync_times = [], []
+    for _ in range(args.runs):
+        ui_ready, synced = run_once()
+        ui_times.append(ui_ready)
+        if synced is not None:
+            sync_times.append(synced)
+    print(f"Welcome screen:  median {statistics.median(ui_times):.3f} s")
+    if sync_times:
+        print(f"Sets synced:     median {statistics.median(sync_times):.3f} s")
+    else:
+        print("Sets synced:     did not finish within the timeout")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
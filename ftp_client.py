@@ -1,5 +1,11 @@
 import os
-from ftplib import FTP, all_errors
+import queue
+import threading
+import time
+from calendar import timegm
+from ftplib import FTP, all_errors, error_perm
+
+FTP_WORKERS = int(os.getenv("FTP_WORKERS", "4"))
 
 
 class FTPClient:
@@ -27,27 +33,147 @@ class FTPClient:
                 pass
             self.ftp = None
 
-    def upload_file(self, local_path, remote_path=None):
-        """Upload a single file to the FTP server."""
+    def upload_file(self, local_path, remote_path=None, callback=None):
+        """Upload a single file to the FTP server.
+
+        ``callback`` is passed to ``storbinary`` and receives every block
+        sent, which allows callers to report progress.
+        """
         if self.ftp is None:
             self.connect()
         remote_path = remote_path or os.path.basename(local_path)
         try:
             with open(local_path, "rb") as fh:
-                self.ftp.storbinary(f"STOR {remote_path}", fh)
+                self.ftp.storbinary(f"STOR {remote_path}", fh, callback=callback)
+        except all_errors as exc:  # pragma: no cover - network failure
+            raise RuntimeError(f"FTP upload failed: {exc}") from exc
+
+    def remote_state(self, remote_path):
+        """Return ``(size, mtime)`` of ``remote_path`` or ``(None, None)``."""
+        if self.ftp is None:
+            self.connect()
+        try:
+            self.ftp.voidcmd("TYPE I")
+            size = self.ftp.size(remote_path)
+        except error_perm:
+            return None, None
+        mtime = None
+        try:
+            resp = self.ftp.voidcmd(f"MDTM {remote_path}")
+            stamp = resp.split()[-1][:14]
+            mtime = timegm(time.strptime(stamp, "%Y%m%d%H%M%S"))
+        except (error_perm, ValueError, IndexError):
+            pass
+        return size, mtime
+
+    def sync_file(self, local_path, remote_path, callback=None):
+        """Upload ``local_path`` unless the server already has it.
+
+        Files whose remote size matches and whose remote modification time is
+        not older than the local one are skipped.  A smaller remote file is
+        treated as an interrupted transfer and continued with ``REST``.
+        ``callback`` receives the number of bytes sent after every block.
+        Returns ``"skipped"``, ``"resumed"`` or ``"uploaded"``.
+        """
+        if self.ftp is None:
+            self.connect()
+        local_size = os.path.getsize(local_path)
+        remote_size, remote_mtime = self.remote_state(remote_path)
+        if remote_size == local_size and (
+            remote_mtime is None or remote_mtime >= int(os.path.getmtime(local_path))
+        ):
+            if callback:
+                callback(local_size)
+            return "skipped"
+        offset = remote_size if remote_size and remote_size < local_size else 0
+        try:
+            with open(local_path, "rb") as fh:
+                fh.seek(offset)
+                if callback and offset:
+                    callback(offset)
+                self.ftp.storbinary(
+                    f"STOR {remote_path}",
+                    fh,
+                    callback=(lambda block: callback(len(block))) if callback else None,
+                    rest=offset or None,
+                )
         except all_errors as exc:  # pragma: no cover - network failure
             raise RuntimeError(f"FTP upload failed: {exc}") from exc
+        return "resumed" if offset else "uploaded"
 
-    def upload_directory(self, directory, remote_dir="."):
-        """Upload all files from ``directory`` to ``remote_dir``."""
+    def upload_directory(self, directory, remote_dir=".", workers=FTP_WORKERS, progress=None):
+        """Upload all files from ``directory`` to ``remote_dir``.
+
+        Files are distributed over ``workers`` parallel FTP sessions.
+        ``progress(sent_bytes, total_bytes, filename)`` is called from the
+        worker threads whenever data is sent.  Returns a dictionary counting
+        uploaded, resumed and skipped files.
+        """
         if self.ftp is None:
             self.connect()
-        for entry in os.listdir(directory):
+        if remote_dir not in ("", "."):
+            try:
+                self.ftp.mkd(remote_dir)
+            except error_perm:
+                pass
+        jobs = queue.Queue()
+        total = 0
+        for entry in sorted(os.listdir(directory)):
             path = os.path.join(directory, entry)
             if not os.path.isfile(path):
                 continue
-            dest = f"{remote_dir.rstrip('/')}/{entry}"
-            self.upload_file(path, dest)
+            total += os.path.getsize(path)
+            jobs.put((path, f"{remote_dir.rstrip('/')}/{entry}"))
+
+        lock = threading.Lock()
+        summary = {"uploaded": 0, "resumed": 0, "skipped": 0}
+        sent = 0
+        errors = []
+
+        def work(client):
+            nonlocal sent
+            while not errors:
+                try:
+                    path, dest = jobs.get_nowait()
+                except queue.Empty:
+                    return
+                name = os.path.basename(path)
+
+                def report(count):
+                    nonlocal sent
+                    with lock:
+                        sent += count
+                        current = sent
+                    if progress:
+                        progress(current, total, name)
+
+                try:
+                    result = client.sync_file(path, dest, report)
+                except Exception as exc:
+                    errors.append(exc)
+                    return
+                with lock:
+                    summary[result] += 1
+
+        clients = [self]
+        threads = []
+        try:
+            for _ in range(max(1, min(workers, jobs.qsize())) - 1):
+                extra = FTPClient(self.host, self.user, self.password)
+                extra.connect()
+                clients.append(extra)
+            for client in clients:
+                t = threading.Thread(target=work, args=(client,), daemon=True)
+                t.start()
+                threads.append(t)
+            for t in threads:
+                t.join()
+        finally:
+            for client in clients[1:]:
+                client.close()
+        if errors:
+            raise errors[0]
+        return summary
 
     def __enter__(self):
         self.connect()
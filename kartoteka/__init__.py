@@ -1,3 +1,10 @@
-from .ui import CardEditorApp
-
 __all__ = ["CardEditorApp"]
+
+
+def __getattr__(name):
+    # the Tk editor is imported on demand so ``kartoteka.core`` works headless
+    if name == "CardEditorApp":
+        from .ui import CardEditorApp
+
+        return CardEditorApp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,112 @@
+import tkinter as tk
+
+from .lazy import LazyModule
+
+ctk = LazyModule("customtkinter")
+
+ROW_HEIGHT = 44
+HEADER_FONT = ("Segoe UI", 12, "bold")
+ROW_FONT = ("Segoe UI", 11)
+
+
+def flatten_sets(sets_by_era, show_headers=True):
+    """Return cheatsheet rows as ``(kind, text, code)`` tuples."""
+    rows = []
+    for era, sets in sets_by_era.items():
+        if show_headers:
+            rows.append(("header", era, None))
+        for item in sets:
+            rows.append(("set", f"{item['name']} ({item['code']})", item["code"]))
+    return rows
+
+
+def visible_rows(top, height, total, row_height=ROW_HEIGHT):
+    """Return the ``(first, count)`` rows intersecting a viewport.
+
+    ``top`` is the canvas coordinate of the upper edge of the viewport.  One
+    extra row is included so partially visible rows at both edges are drawn.
+    """
+    first = max(0, int(top // row_height))
+    count = int(height // row_height) + 2
+    return first, max(0, min(count, total - first))
+
+
+class CheatSheet(tk.Frame):
+    """Scrollable list of set logos that only creates widgets for visible rows.
+
+    Rows live on a canvas whose scroll region covers all sets; a small pool of
+    row widgets is moved and re-labelled whenever the view changes, so the
+    number of widgets depends on the window height rather than on the
+    number of sets.
+    """
+
+    def __init__(self, master, rows, logos, bg, width=240):
+        super().__init__(master, bg=bg, width=width)
+        self.rows = rows
+        self.logos = logos
+        self.bg = bg
+        self.pool = []
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0, width=width)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_view_changed)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda _e: self.render())
+        self._bind_wheel(self.canvas)
+        self.set_rows(rows)
+
+    def set_rows(self, rows):
+        self.rows = rows
+        self.canvas.configure(
+            scrollregion=(0, 0, 0, len(rows) * ROW_HEIGHT)
+        )
+        self.render()
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", lambda _e: self.canvas.yview_scroll(-1, "units"))
+        widget.bind("<Button-5>", lambda _e: self.canvas.yview_scroll(1, "units"))
+
+    def _on_wheel(self, event):
+        self.canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
+
+    def _on_view_changed(self, first, last):
+        self.scrollbar.set(first, last)
+        self.render()
+
+    def _make_row(self):
+        frame = tk.Frame(self.canvas, bg=self.bg)
+        # fixed-size holder keeps every row ROW_HEIGHT tall with or without a logo
+        holder = tk.Frame(frame, bg=self.bg, width=ROW_HEIGHT + 4, height=ROW_HEIGHT)
+        holder.pack_propagate(False)
+        holder.pack(side="left", padx=5)
+        logo = tk.Label(holder, bg=self.bg)
+        logo.pack(expand=True)
+        text = tk.Label(frame, bg=self.bg, fg="white", anchor="w")
+        text.pack(side="left", fill="x", expand=True)
+        for widget in (frame, holder, logo, text):
+            self._bind_wheel(widget)
+        window = self.canvas.create_window(0, 0, window=frame, anchor="nw")
+        return window, logo, text
+
+    def render(self):
+        """Draw the rows currently inside the viewport."""
+        height = self.canvas.winfo_height()
+        first, count = visible_rows(self.canvas.canvasy(0), height, len(self.rows))
+        while len(self.pool) < count:
+            self.pool.append(self._make_row())
+        width = self.canvas.winfo_width()
+        for slot, (window, logo, text) in enumerate(self.pool):
+            index = first + slot
+            if slot >= count:
+                self.canvas.itemconfigure(window, state="hidden")
+                continue
+            kind, label, code = self.rows[index]
+            if kind == "header":
+                logo.configure(image="")
+                text.configure(text=label, font=HEADER_FONT)
+            else:
+                logo.configure(image=self.logos.get(code) or "")
+                text.configure(text=label, font=ROW_FONT)
+            self.canvas.coords(window, 0, index * ROW_HEIGHT)
+            self.canvas.itemconfigure(window, state="normal", width=width)
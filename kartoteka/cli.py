@@ -0,0 +1,198 @@
+"""Command line tools working on scan folders without the Tk editor."""
+
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from . import set_catalogue, storage
+from .core import catalogue, pricing, recognition, registry
+from .core.session import CardSession, write_review
+
+load_dotenv()
+
+BASE_IMAGE_URL = os.getenv("BASE_IMAGE_URL", "https://sklep839679.shoparena.pl/upload/images")
+RECOGNITION_SOURCE = os.getenv("RECOGNITION_SOURCE", "remote").strip().lower()
+RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
+RAPIDAPI_HOST = os.getenv("RAPIDAPI_HOST")
+SHOPER_DELIVERY_ID = int(os.getenv("SHOPER_DELIVERY_ID", "1"))
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# number of scans recognised and priced at the same time
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))
+
+PRICE_DB_PATH = "card_prices.csv"
+SET_LOGO_DIR = "set_logos"
+
+
+def load_price_db(path=PRICE_DB_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def review_reasons(result, price, set_index, min_confidence):
+    """Return why a recognised card should be checked in the editor."""
+    reasons = []
+    for key, label in (("name", "brak nazwy"), ("number", "brak numeru"), ("set", "brak setu")):
+        if not str(result.get(key) or "").strip():
+            reasons.append(label)
+    set_name = str(result.get("set") or "").strip()
+    if set_name and set_index is not None and set_index.code(set_name, fuzzy=False) is None:
+        reasons.append("nieznany set")
+    confidence = result.get("confidence")
+    if confidence is not None and confidence < min_confidence:
+        reasons.append(f"pewność {confidence:.2f}")
+    if result.get("validated") is False:
+        reasons.append("niezgodny z katalogiem")
+    if price is None:
+        reasons.append("brak ceny")
+    return reasons
+
+
+def form_fields(result, lang="ENG"):
+    """Return the editor fields for a recognition result."""
+    return {
+        "język": lang,
+        "nazwa": str(result.get("name") or "").strip(),
+        "numer": str(result.get("number") or "").strip(),
+        "set": str(result.get("set") or "").strip(),
+        "suffix": str(result.get("suffix") or "").strip(),
+        "stan": "NM",
+        "cena": "",
+    }
+
+
+def run_batch(session, workers=BATCH_WORKERS, translate_name=False, set_index=None,
+              min_confidence=0.0, lang="ENG", progress=print, card_catalogue=None):
+    """Recognise, price and store every scan of ``session``.
+
+    Scans are recognised and priced by ``workers`` threads; rows are then
+    stored in scan order so warehouse codes follow the scans.  With a
+    ``card_catalogue`` the results are checked against the cards of their
+    set.  Cards that need a human look get no row and are returned as
+    review entries.
+    """
+
+    def process(index):
+        try:
+            result = session.recognize(index, translate_name=translate_name) or {}
+        except Exception as e:
+            print(f"[ERROR] Recognition of {session.cards[index]} failed: {e}")
+            result = {}
+        code = None
+        if set_index is not None and result.get("set"):
+            code = set_index.code(str(result["set"]).strip(), fuzzy=False)
+        if code and card_catalogue is not None:
+            if not card_catalogue.has_set(code):
+                card_catalogue.sync_set(code)
+            card_catalogue.validate(result, code)
+        fields = form_fields(result, lang)
+        if code:
+            # scans are usually one set, so load it whole on first sight
+            session.pricing.prefetch_set(fields["set"])
+        price = None
+        if fields["nazwa"] and fields["numer"] and fields["set"]:
+            price = session.pricing.price_card(fields["nazwa"], fields["numer"], fields["set"])
+        return result, fields, price
+
+    total = len(session.cards)
+    review = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for index, (result, fields, price) in enumerate(pool.map(process, range(total))):
+            name = os.path.basename(session.cards[index])
+            reasons = review_reasons(result, price, set_index, min_confidence)
+            if reasons:
+                review.append({"file": name, "entries": fields, "reasons": reasons})
+                progress(f"[WARN] {index + 1}/{total} {name}: {', '.join(reasons)}")
+                continue
+            # the price is already cached, so this only builds the row
+            row = session.save_card(index, fields)
+            progress(f"[INFO] {index + 1}/{total} {name} -> {row['warehouse_code']}")
+    return review
+
+
+def batch(args):
+    folder = args.folder
+    if not os.path.isdir(folder):
+        print(f"[ERROR] Folder {folder} does not exist")
+        return 2
+    start = storage.location_index(args.start)
+    if start is None:
+        print(f"[ERROR] Invalid warehouse code {args.start!r}, expected e.g. K01R1P0001")
+        return 2
+
+    set_index = set_catalogue.load_set_index()
+    service = pricing.PricingService(
+        load_price_db(),
+        RAPIDAPI_KEY,
+        RAPIDAPI_HOST,
+        resolve_set_code=lambda name: set_index.code(name, fuzzy=False) or name,
+    )
+    recognizer = recognition.RecognitionService(
+        SET_LOGO_DIR,
+        api_key=OPENAI_API_KEY,
+        source=RECOGNITION_SOURCE,
+        base_url=BASE_IMAGE_URL,
+        set_name=lambda code: set_index.name(code) or code,
+    )
+    session = CardSession.from_folder(
+        folder,
+        starting_idx=start,
+        pricing_service=service,
+        recognition=recognizer,
+        base_image_url=BASE_IMAGE_URL,
+        delivery_id=SHOPER_DELIVERY_ID,
+        product_registry=registry.ProductRegistry(),
+    )
+    if not session.cards:
+        print(f"[WARN] No scans found in {folder}")
+        return 1
+
+    review = run_batch(
+        session,
+        workers=args.workers,
+        translate_name=args.lang == "JP",
+        set_index=set_index,
+        min_confidence=args.min_confidence,
+        lang=args.lang,
+        card_catalogue=catalogue.CardCatalogue(),
+    )
+    output = args.output or f"{os.path.normpath(folder)}.csv"
+    count = session.export(output)
+    print(f"[INFO] Saved {count} products to {output}")
+    written = write_review(folder, review, session.next_free_location())
+    if written:
+        print(f"[WARN] {len(review)} cards need review in the editor: {written}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="kartoteka")
+    commands = parser.add_subparsers(dest="command", required=True)
+    cmd = commands.add_parser("batch", help="process a scan folder into a Shoper CSV")
+    cmd.add_argument("folder", help="folder with card scans")
+    cmd.add_argument("--start", required=True, help="first warehouse code, e.g. K01R1P0001")
+    cmd.add_argument("--output", help="CSV file to write (default: <folder>.csv)")
+    cmd.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    cmd.add_argument("--lang", choices=("ENG", "JP"), default="ENG")
+    cmd.add_argument(
+        "--min-confidence",
+        type=float,
+        default=0.0,
+        help="send local results below this confidence to review",
+    )
+    cmd.set_defaults(func=batch)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
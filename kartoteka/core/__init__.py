@@ -0,0 +1,24 @@
+"""Headless card processing used by the Tk editor and batch tools."""
+
+from .catalogue import CardCatalogue
+from .export import build_card_row, write_shoper_csv
+from .journal import SessionJournal
+from .orders import choose_nearest_locations
+from .pricing import PricingService
+from .record import CardRecord
+from .recognition import RecognitionService
+from .registry import ProductRegistry
+from .session import CardSession
+
+__all__ = [
+    "CardCatalogue",
+    "CardRecord",
+    "CardSession",
+    "PricingService",
+    "ProductRegistry",
+    "RecognitionService",
+    "SessionJournal",
+    "build_card_row",
+    "choose_nearest_locations",
+    "write_shoper_csv",
+]
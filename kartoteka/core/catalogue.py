@@ -0,0 +1,236 @@
+import os
+import sqlite3
+import threading
+import time
+
+from ..lazy import LazyModule
+from .pricing import normalize
+from .recognition import SUFFIXES
+
+requests = LazyModule("requests")
+
+CARD_CATALOGUE_DB = os.getenv("CARD_CATALOGUE_DB", "card_catalogue.db")
+CARDS_API_URL = "https://api.pokemontcg.io/v2/cards"
+PAGE_SIZE = 250
+MAX_PAGES = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    set_code TEXT NOT NULL,
+    number TEXT NOT NULL,
+    name TEXT NOT NULL,
+    suffix TEXT NOT NULL DEFAULT '',
+    name_key TEXT NOT NULL,
+    image TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (set_code, number)
+);
+CREATE INDEX IF NOT EXISTS cards_name ON cards (name_key, set_code);
+CREATE TABLE IF NOT EXISTS sets (
+    set_code TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+def normalize_number(number) -> str:
+    """Return the catalogue form of a card number (``"004/165"`` → ``"4"``)."""
+    text = str(number or "").strip().upper().split("/")[0].strip()
+    if text.isdigit():
+        return str(int(text))
+    return text
+
+
+def split_suffix(name):
+    """Split a trailing ``ex``/``V``/… off a card name."""
+    parts = (name or "").split()
+    if len(parts) > 1 and parts[-1].upper() in SUFFIXES:
+        return " ".join(parts[:-1]), parts[-1].upper()
+    return name or "", ""
+
+
+def card_entry(card):
+    """Return ``(number, name, suffix, image)`` of an API card.
+
+    Both pokemontcg.io cards (``number``, ``images``) and TCGGO cards
+    (``card_number``, ``image``) are understood.
+    """
+    number = normalize_number(card.get("number", card.get("card_number", "")))
+    name, suffix = split_suffix(str(card.get("name", "")).strip())
+    images = card.get("images") or {}
+    image = (
+        images.get("large")
+        or images.get("small")
+        or card.get("image")
+        or card.get("imageUrl")
+        or card.get("image_url")
+        or ""
+    )
+    return number, name, suffix, image
+
+
+class CardCatalogue:
+    """All cards of the known sets in a local SQLite database.
+
+    Cards are indexed by ``(set_code, number)`` and by normalised name, so a
+    set and number resolve to the card's name, suffix and image without a
+    network call, and recognition results can be checked against them.
+    Sets are filled from pokemontcg.io with :meth:`sync_set` or from any
+    card list (e.g. a TCGGO set prefetch) with :meth:`add_cards`.
+    """
+
+    def __init__(self, path=CARD_CATALOGUE_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._syncing = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def add_cards(self, set_code, cards, complete=True):
+        """Store API ``cards`` under ``set_code``; returns how many were stored.
+
+        With ``complete`` the set is recorded as synced; pass ``False`` for
+        one page of a longer download.
+        """
+        rows = []
+        for card in cards:
+            number, name, suffix, image = card_entry(card)
+            if number and name:
+                rows.append((set_code.lower(), number, name, suffix, normalize(name), image))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cards (set_code, number, name, suffix, name_key, image)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            if rows and complete:
+                self._mark_synced(set_code)
+        return len(rows)
+
+    def _mark_synced(self, set_code):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sets (set_code, synced_at) VALUES (?, ?)",
+            (set_code.lower(), time.time()),
+        )
+
+    def has_set(self, set_code):
+        row = self._conn.execute(
+            "SELECT 1 FROM sets WHERE set_code = ?", ((set_code or "").lower(),)
+        ).fetchone()
+        return row is not None
+
+    def _entry(self, row):
+        set_code, number, name, suffix, image = row
+        return {"set_code": set_code, "number": number, "name": name, "suffix": suffix, "image": image}
+
+    def lookup(self, set_code, number):
+        """Return the card ``number`` of ``set_code`` or ``None``."""
+        row = self._conn.execute(
+            "SELECT set_code, number, name, suffix, image FROM cards"
+            " WHERE set_code = ? AND number = ?",
+            ((set_code or "").lower(), normalize_number(number)),
+        ).fetchone()
+        return None if row is None else self._entry(row)
+
+    def find(self, name, set_code=None):
+        """Return the cards called ``name`` (compared normalised)."""
+        query = "SELECT set_code, number, name, suffix, image FROM cards WHERE name_key = ?"
+        args = [normalize(name)]
+        if set_code:
+            query += " AND set_code = ?"
+            args.append(set_code.lower())
+        return [self._entry(row) for row in self._conn.execute(query, args)]
+
+    def sync_set(self, set_code, max_pages=MAX_PAGES):
+        """Download the cards of ``set_code`` from pokemontcg.io.
+
+        Returns the number of stored cards.  When another thread is already
+        downloading the set, this waits for it and returns 0.  Network errors
+        are reported and give 0.  The set counts as synced only once every
+        page has been downloaded.
+        """
+        key = (set_code or "").lower()
+        with self._lock:
+            running = self._syncing.get(key)
+            if key and running is None:
+                self._syncing[key] = threading.Event()
+        if not key:
+            return 0
+        if running is not None:
+            running.wait()
+            return 0
+        try:
+            count = 0
+            failed = False
+            for page in range(1, max_pages + 1):
+                resp = requests.get(
+                    CARDS_API_URL,
+                    params={
+                        "q": f"set.id:{set_code}",
+                        "page": page,
+                        "pageSize": PAGE_SIZE,
+                        "select": "name,number,images",
+                    },
+                    timeout=20,
+                )
+                if resp.status_code != 200:
+                    print(f"[ERROR] Card catalogue API error: {resp.status_code}")
+                    failed = True
+                    break
+                cards = resp.json().get("data", [])
+                count += self.add_cards(set_code, cards, complete=False)
+                if len(cards) < PAGE_SIZE:
+                    break
+            if count and not failed:
+                with self._lock, self._conn:
+                    self._mark_synced(set_code)
+                print(f"[INFO] Katalog kart: {count} kart z setu {set_code}")
+            return count
+        except Exception as e:
+            print(f"[ERROR] Downloading cards of {set_code} failed: {e}")
+            return 0
+        finally:
+            with self._lock:
+                self._syncing.pop(key).set()
+
+    def validate(self, result, set_code):
+        """Check a recognition result against the cards of ``set_code``.
+
+        A missing name or suffix is filled in from the card with the
+        recognised number; a number that does not fit the recognised name
+        is corrected when the name identifies a single card of the set.
+        Values that agree with the catalogue are kept as recognised (e.g.
+        ``"025/198"`` for card 25).  ``result["validated"]`` is then
+        ``True``, or ``False`` when name and number contradict the
+        catalogue (``catalogue_name`` holds the name of the card with that
+        number).  Results for sets that are not in the catalogue are
+        returned unchanged.
+        """
+        if not result or not self.has_set(set_code):
+            return result
+        name = str(result.get("name") or "").strip()
+        entry = self.lookup(set_code, result.get("number", ""))
+        if entry is not None and (not name or normalize(name) == normalize(entry["name"])):
+            self._apply(result, entry)
+            return result
+        matches = self.find(name, set_code) if name else []
+        if len(matches) == 1:
+            self._apply(result, matches[0])
+            result["number"] = matches[0]["number"]
+            return result
+        result["validated"] = False
+        if entry is not None:
+            result["catalogue_name"] = entry["name"]
+        return result
+
+    @staticmethod
+    def _apply(result, entry):
+        if not str(result.get("name") or "").strip():
+            result["name"] = entry["name"]
+        if not result.get("suffix"):
+            result["suffix"] = entry["suffix"]
+        result["validated"] = True
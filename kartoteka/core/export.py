@@ -0,0 +1,147 @@
+import csv
+import os
+import shutil
+
+from .record import CardRecord
+
+SHOPER_FIELDS = [
+    "product_code",
+    "active",
+    "name",
+    "price",
+    "vat",
+    "unit",
+    "category",
+    "producer",
+    "other_price",
+    "pkwiu",
+    "weight",
+    "priority",
+    "short_description",
+    "description",
+    "stock",
+    "stock_warnlevel",
+    "availability",
+    "views",
+    "rank",
+    "rank_votes",
+    "images 1",
+    "warehouse_code",
+]
+
+
+def card_key(data) -> str:
+    return f"{data['nazwa']}|{data['numer']}|{data['set']}"
+
+
+def build_card_row(data, image_url, product_code, warehouse_code, delivery_id=1, price=None):
+    """Return the product row for the form values in ``data``.
+
+    ``data`` holds the editor fields (``nazwa``, ``numer``, ``set``, ``stan``,
+    ``typ`` …).  The row is a :class:`~kartoteka.core.record.CardRecord`; the
+    Shoper columns shared by all cards and the HTML descriptions are provided
+    by it, ``price`` is stored as ``cena`` (``""`` when unknown).
+    """
+    row = CardRecord(data)
+    row["image1"] = image_url
+    row["product_code"] = product_code
+    row["warehouse_code"] = warehouse_code
+    row["delivery"] = delivery_id
+    row["cena"] = "" if price is None else str(price)
+    return row
+
+
+def shoper_row(row, stock=None) -> dict:
+    """Return the Shoper CSV columns for a product row.
+
+    ``stock`` defaults to the row's own ``stock`` column.
+    """
+    suffix = row.get("suffix", "").strip()
+    name_parts = [row["nazwa"]]
+    if suffix:
+        name_parts.append(suffix)
+    name_parts.append(row["numer"])
+    formatted_name = " ".join(name_parts)
+
+    return {
+        "product_code": row["product_code"],
+        "active": row.get("active", 1),
+        "name": formatted_name,
+        "price": row["cena"],
+        "vat": row.get("vat", "23%"),
+        "unit": row.get("unit", "szt."),
+        "category": row["category"],
+        "producer": row["producer"],
+        "other_price": row.get("other_price", ""),
+        "pkwiu": row.get("pkwiu", ""),
+        "weight": row.get("weight", 0.01),
+        "priority": row.get("priority", 0),
+        "short_description": row["short_description"],
+        "description": row["description"],
+        "stock": row["stock"] if stock is None else stock,
+        "stock_warnlevel": row.get("stock_warnlevel", 0),
+        "availability": row.get("availability", 1),
+        "views": row.get("views", ""),
+        "rank": row.get("rank", ""),
+        "rank_votes": row.get("rank_votes", ""),
+        "images 1": row.get("image1", row.get("images", "")),
+        "warehouse_code": row.get("warehouse_code", ""),
+    }
+
+
+def write_shoper_csv(file_path, rows, inventory_path=None):
+    """Write ``rows`` (as collected in ``output_data``) in the Shoper format.
+
+    Each row is formatted once, in a single pass.  Rows of the same card
+    are merged and counted in ``stock``.  When ``inventory_path`` is given,
+    every row is also added to that inventory CSV with ``stock`` 1.  The
+    export is written to a temporary file and renamed over ``file_path``.
+    The inventory lines are appended only after that, so a failed export
+    leaves both files unchanged.  Returns the number of products written.
+    """
+    groups = {}
+    inventory_tmp = None
+    inventory = None
+    try:
+        if inventory_path:
+            inventory_tmp = f"{inventory_path}.tmp"
+            inventory = open(inventory_tmp, "w", encoding="utf-8", newline="")
+            inventory_writer = csv.DictWriter(inventory, fieldnames=SHOPER_FIELDS, delimiter=";")
+            if not os.path.exists(inventory_path):
+                inventory_writer.writeheader()
+        for row in rows:
+            if row is None:
+                continue
+            formatted = shoper_row(row, stock=1)
+            if inventory is not None:
+                inventory_writer.writerow(formatted)
+            group = groups.get(card_key(row))
+            if group is None:
+                groups[card_key(row)] = [formatted, 1]
+            else:
+                group[1] += 1
+
+        tmp = f"{file_path}.tmp"
+        try:
+            with open(tmp, mode="w", encoding="utf-8", newline="") as file:
+                writer = csv.DictWriter(file, fieldnames=SHOPER_FIELDS, delimiter=";")
+                writer.writeheader()
+                for formatted, count in groups.values():
+                    formatted["stock"] = count
+                    writer.writerow(formatted)
+            os.replace(tmp, file_path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+        if inventory is not None:
+            inventory.close()
+            with open(inventory_tmp, encoding="utf-8", newline="") as src, \
+                    open(inventory_path, "a", encoding="utf-8", newline="") as dst:
+                shutil.copyfileobj(src, dst)
+    finally:
+        if inventory is not None:
+            inventory.close()
+            os.remove(inventory_tmp)
+    return len(groups)
@@ -0,0 +1,148 @@
+import json
+import os
+
+from .. import set_catalogue
+from . import export
+from .record import CardRecord
+
+JOURNAL_DIR = ".kartoteka"
+JOURNAL_FILE = "journal.jsonl"
+SNAPSHOT_FILE = "snapshot.json"
+# saved cards after which the journal is folded into the snapshot
+SNAPSHOT_EVERY = int(os.getenv("JOURNAL_SNAPSHOT_EVERY", "50"))
+
+
+def _stored(row):
+    return row.fields() if isinstance(row, CardRecord) else row
+
+
+class SessionJournal:
+    """Append-only record of the cards saved in a scan folder.
+
+    Every saved card is appended as one JSON line to
+    ``<folder>/.kartoteka/journal.jsonl`` and flushed to disk.  Every
+    ``snapshot_every`` cards the whole session is written to
+    ``snapshot.json`` and the journal starts over, so restoring reads one
+    snapshot and at most that many lines.  Rows are stored by file name and
+    matched to the scans present when the session is restored.
+    """
+
+    def __init__(self, folder, snapshot_every=SNAPSHOT_EVERY):
+        self.dir = os.path.join(folder, JOURNAL_DIR)
+        self.journal_path = os.path.join(self.dir, JOURNAL_FILE)
+        self.snapshot_path = os.path.join(self.dir, SNAPSHOT_FILE)
+        self.snapshot_every = snapshot_every
+        self._pending = 0
+
+    def exists(self):
+        return os.path.exists(self.journal_path) or os.path.exists(self.snapshot_path)
+
+    def record(self, state, index):
+        """Append the row of card ``index`` of ``state`` to the journal."""
+        row = state.output_data[index]
+        key = export.card_key(row)
+        entry = {
+            "file": os.path.basename(state.cards[index]),
+            "row": _stored(row),
+            "key": key,
+            "cache": state.card_cache.get(key),
+            "product_code": state.product_code_map.get(key),
+            "next_product_code": state.next_product_code,
+            "starting_idx": state.starting_idx,
+        }
+        os.makedirs(self.dir, exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending += 1
+        if self._pending >= self.snapshot_every:
+            self.snapshot(state)
+
+    def snapshot(self, state):
+        """Write the complete session and empty the journal."""
+        rows = {
+            os.path.basename(path): _stored(row)
+            for path, row in zip(state.cards, state.output_data)
+            if row is not None
+        }
+        data = self._load_snapshot()
+        data["rows"].update(rows)
+        data.update(
+            card_cache=state.card_cache,
+            file_to_key=state.file_to_key,
+            product_code_map=state.product_code_map,
+            next_product_code=state.next_product_code,
+            starting_idx=state.starting_idx,
+        )
+        os.makedirs(self.dir, exist_ok=True)
+        set_catalogue.write_json_atomic(self.snapshot_path, data, ensure_ascii=False)
+        open(self.journal_path, "w").close()
+        self._pending = 0
+
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data.setdefault("rows", {})
+        return data
+
+    def load(self):
+        """Return the saved session as a snapshot dictionary."""
+        data = self._load_snapshot()
+        data.setdefault("card_cache", {})
+        data.setdefault("file_to_key", {})
+        data.setdefault("product_code_map", {})
+        try:
+            with open(self.journal_path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            lines = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # the last line may be cut short by a crash
+                continue
+            key = entry["key"]
+            data["rows"][entry["file"]] = entry["row"]
+            data["file_to_key"][entry["file"]] = key
+            if entry.get("cache") is not None:
+                data["card_cache"][key] = entry["cache"]
+            if entry.get("product_code") is not None:
+                data["product_code_map"][key] = entry["product_code"]
+            data["next_product_code"] = entry["next_product_code"]
+            data["starting_idx"] = entry["starting_idx"]
+        return data
+
+    def restore(self, state):
+        """Fill ``state`` with the saved session; returns the restored row count.
+
+        ``state.cards`` must already list the scans of the folder.
+        """
+        data = self.load()
+        positions = {os.path.basename(path): i for i, path in enumerate(state.cards)}
+        restored = 0
+        for name, row in data["rows"].items():
+            index = positions.get(name)
+            if index is not None:
+                state.output_data[index] = CardRecord(row)
+                restored += 1
+        state.card_cache.update(data["card_cache"])
+        state.file_to_key.update(data["file_to_key"])
+        state.product_code_map.update(data["product_code_map"])
+        if "next_product_code" in data:
+            state.next_product_code = max(state.next_product_code, data["next_product_code"])
+        if "starting_idx" in data:
+            state.starting_idx = data["starting_idx"]
+        return restored
+
+    def clear(self):
+        for path in (self.journal_path, self.snapshot_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._pending = 0
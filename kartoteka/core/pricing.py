@@ -0,0 +1,398 @@
+import os
+import threading
+import time
+import unicodedata
+
+from ..lazy import LazyModule
+
+requests = LazyModule("requests")
+
+PRICE_MULTIPLIER = 1.23
+HOLO_REVERSE_MULTIPLIER = 3.5
+POKEBALL_MULTIPLIER = 5
+MASTERBALL_MULTIPLIER = 10
+DEFAULT_EUR_PLN = 4.265
+EXCHANGE_RATE_URL = "https://api.nbp.pl/api/exchangerates/rates/A/EUR/?format=json"
+TCGGO_URL = "https://www.tcggo.com/api/cards/"
+# how long API search results and the exchange rate are reused, in seconds
+PRICE_CACHE_TTL = float(os.getenv("PRICE_CACHE_TTL", "900"))
+# upper bound of API pages read when prefetching the cards of a set
+SET_PREFETCH_PAGES = int(os.getenv("SET_PREFETCH_PAGES", "20"))
+
+
+def normalize(text: str, keep_spaces: bool = False) -> str:
+    """Normalize text for comparisons and API queries."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = text.lower()
+    for suffix in [
+        " ex",
+        " gx",
+        " v",
+        " vmax",
+        " vstar",
+        " shiny",
+        " promo",
+    ]:
+        text = text.replace(suffix, "")
+    text = text.replace("-", "")
+    if not keep_spaces:
+        text = text.replace(" ", "")
+    return text.strip()
+
+
+def extract_cardmarket_price(card):
+    """Return the best available Cardmarket price for a card.
+
+    The function checks multiple possible fields in the ``cardmarket`` price
+    section and returns the first non-zero value.  If none of the fields are
+    present or they evaluate to zero, ``None`` is returned.
+    """
+
+    cardmarket = card.get("prices", {}).get("cardmarket", {}) or {}
+    for field in ["30d_average", "trendPrice", "trend_price", "lowest_near_mint"]:
+        price = cardmarket.get(field)
+        try:
+            value = float(price)
+        except (TypeError, ValueError):
+            continue
+        if value:
+            print(f"[DEBUG] Using Cardmarket field '{field}' with value {value}")
+            return value
+    return None
+
+
+def apply_variant_multiplier(price, is_reverse=False, is_holo=False, pokeball=False, masterball=False):
+    """Apply holo/reverse or special variant multiplier when needed."""
+    if price is None:
+        return None
+    multiplier = 1
+    if is_reverse or is_holo:
+        multiplier *= HOLO_REVERSE_MULTIPLIER
+    if masterball:
+        multiplier *= MASTERBALL_MULTIPLIER
+    elif pokeball:
+        multiplier *= POKEBALL_MULTIPLIER
+    try:
+        return round(float(price) * multiplier, 2)
+    except (TypeError, ValueError):
+        return price
+
+
+def _matches(card, name_input, number_input, set_input):
+    card_name = normalize(card.get("name", ""))
+    card_number = str(card.get("card_number", "")).lower()
+    card_set = str(card.get("episode", {}).get("name", "")).lower()
+    return (
+        name_input in card_name
+        and number_input == card_number
+        and (set_input in card_set or card_set.startswith(set_input))
+    )
+
+
+class PricingService:
+    """Card prices from the local price database and the TCGGO API.
+
+    ``price_db`` holds the rows of ``card_prices.csv``; they are indexed once
+    so a lookup is a dictionary access.  API searches and the EUR→PLN rate
+    are cached in memory for ``PRICE_CACHE_TTL`` seconds, so the editor, the
+    variants window and batch runs share one request per card.  The cards of
+    a whole set can be loaded ahead with :meth:`prefetch_set`; searches in
+    that set are then answered from memory.
+    ``resolve_set_code`` maps a set name to its API code.
+    """
+
+    def __init__(self, price_db=(), rapidapi_key=None, rapidapi_host=None,
+                 resolve_set_code=None, cache_ttl=PRICE_CACHE_TTL):
+        self.rapidapi_key = rapidapi_key
+        self.rapidapi_host = rapidapi_host
+        self.resolve_set_code = resolve_set_code or (lambda name: name)
+        self.cache_ttl = cache_ttl
+        self._searches = {}
+        self._sets = {}
+        self._prefetching = set()
+        self._lock = threading.Lock()
+        self._rate = None
+        self.set_price_db(price_db)
+
+    def set_price_db(self, rows):
+        self.price_db = list(rows)
+        self._db_index = {}
+        for row in self.price_db:
+            key = (
+                normalize(row.get("name", "")),
+                row.get("number", "").strip().lower(),
+                row.get("set", "").strip().lower(),
+            )
+            self._db_index.setdefault(key, row)
+
+    def price_from_db(self, name, number, set_name):
+        row = self._db_index.get(
+            (normalize(name), number.strip().lower(), set_name.strip().lower())
+        )
+        if row is None:
+            return None
+        try:
+            return float(row.get("price", 0))
+        except (TypeError, ValueError):
+            return None
+
+    def exchange_rate(self):
+        """Return the NBP EUR→PLN rate, falling back to ``DEFAULT_EUR_PLN``."""
+        if self._rate and time.monotonic() - self._rate[1] < self.cache_ttl:
+            return self._rate[0]
+        try:
+            res = requests.get(EXCHANGE_RATE_URL, timeout=10)
+            if res.status_code == 200:
+                rate = res.json()["rates"][0]["mid"]
+                self._rate = (rate, time.monotonic())
+                return rate
+        except requests.Timeout:
+            print("[ERROR] Exchange rate request timed out")
+        except Exception:
+            pass
+        return DEFAULT_EUR_PLN
+
+    def _request_args(self, name, number, set_name):
+        name_api = normalize(name, keep_spaces=True)
+        if set_name.strip().lower() == "prismatic evolutions: additionals":
+            set_code = "xpre"
+        else:
+            set_code = self.resolve_set_code(set_name)
+        if self.rapidapi_key and self.rapidapi_host:
+            url = f"https://{self.rapidapi_host}/cards/search"
+            params = {"search": name_api}
+            headers = {
+                "X-RapidAPI-Key": self.rapidapi_key,
+                "X-RapidAPI-Host": self.rapidapi_host,
+            }
+        else:
+            url = TCGGO_URL
+            params = {
+                "name": name_api,
+                "number": number.strip().lower(),
+                "set": set_code,
+            }
+            headers = {}
+        return url, params, headers
+
+    def _set_request_args(self, set_name, page):
+        url, params, headers = self._request_args("", "", set_name)
+        return url, {"set": params["set"], "page": page}, headers
+
+    @staticmethod
+    def _cards(payload):
+        if isinstance(payload, dict):
+            for key in ("cards", "data"):
+                if key in payload:
+                    return payload[key]
+            return []
+        return payload
+
+    def prefetched_set(self, set_name):
+        """Return the prefetched cards of ``set_name`` by number, or ``None``."""
+        entry = self._sets.get(set_name.strip().lower())
+        if entry and time.monotonic() - entry[1] < self.cache_ttl:
+            return entry[0]
+        return None
+
+    def prefetch_set(self, set_name, max_pages=SET_PREFETCH_PAGES):
+        """Load all cards of ``set_name`` from the API into the search cache.
+
+        The API is read page by page until a page is empty or repeats the
+        previous one.  Returns the number of cards stored; a set that is
+        already cached or being loaded is not requested again.  RapidAPI
+        only searches cards by name, so nothing is prefetched through it.
+        """
+        if self.rapidapi_key and self.rapidapi_host:
+            return 0
+        key = set_name.strip().lower()
+        with self._lock:
+            if not key or key in self._prefetching or self.prefetched_set(set_name) is not None:
+                return 0
+            self._prefetching.add(key)
+        try:
+            by_number = {}
+            count = 0
+            previous = None
+            for page in range(1, max_pages + 1):
+                url, params, headers = self._set_request_args(set_name, page)
+                response = requests.get(url, params=params, headers=headers, timeout=10)
+                if response.status_code != 200:
+                    print(f"[ERROR] API error: {response.status_code}")
+                    break
+                cards = self._cards(response.json())
+                if not cards or cards == previous:
+                    break
+                previous = cards
+                for card in cards:
+                    number = str(card.get("card_number", "")).lower()
+                    by_number.setdefault(number, []).append(card)
+                    count += 1
+            if by_number:
+                self._sets[key] = (by_number, time.monotonic())
+                print(f"[INFO] Pobrano {count} kart z setu {set_name}")
+            return count
+        except Exception as e:
+            print(f"[ERROR] Prefetching set {set_name} failed: {e}")
+            return 0
+        finally:
+            with self._lock:
+                self._prefetching.discard(key)
+
+    def search(self, name, number, set_name):
+        """Return the raw API cards for a query or ``None`` on an API error.
+
+        Cards of a prefetched set are returned from memory when one of them
+        matches.  Network errors are propagated; results are cached.
+        """
+        by_number = self.prefetched_set(set_name)
+        if by_number is not None:
+            cards = by_number.get(number.strip().lower(), [])
+            if self.matching_cards(cards, name, number, set_name):
+                return cards
+        url, params, headers = self._request_args(name, number, set_name)
+        key = (url, tuple(sorted(params.items())))
+        cached = self._searches.get(key)
+        if cached and time.monotonic() - cached[1] < self.cache_ttl:
+            return cached[0]
+        response = requests.get(url, params=params, headers=headers, timeout=10)
+        if response.status_code != 200:
+            print(f"[ERROR] API error: {response.status_code}")
+            return None
+        cards = self._cards(response.json())
+        self._searches[key] = (cards, time.monotonic())
+        return cards
+
+    def matching_cards(self, cards, name, number, set_name):
+        name_input = normalize(name)
+        number_input = number.strip().lower()
+        set_input = set_name.strip().lower()
+        return [c for c in cards if _matches(c, name_input, number_input, set_input)]
+
+    def fetch_price(self, name, number, set_name):
+        """Return the API price in PLN of the first matching card or ``None``."""
+        number_input = number.strip().lower()
+        set_input = set_name.strip().lower()
+        try:
+            cards = self.search(name, number, set_name)
+            if cards is None:
+                return None
+            candidates = self.matching_cards(cards, name, number, set_name)
+            if candidates:
+                best = candidates[0]
+                price_eur = extract_cardmarket_price(best)
+                if price_eur is not None:
+                    eur_pln = self.exchange_rate()
+                    price_pln = round(float(price_eur) * eur_pln * PRICE_MULTIPLIER, 2)
+                    print(
+                        f"[INFO] Cena {best.get('name')} ({number_input}, {set_input}) = {price_pln} PLN"
+                    )
+                    return price_pln
+
+            print("\n[DEBUG] Nie znaleziono dokładnej karty. Zbliżone:")
+            for card in cards:
+                card_number = str(card.get("card_number", "")).lower()
+                card_set = str(card.get("episode", {}).get("name", "")).lower()
+                if number_input == card_number and set_input in card_set:
+                    print(
+                        f"- {card.get('name')} | {card_number} | {card.get('episode', {}).get('name')}"
+                    )
+        except requests.Timeout:
+            print("[ERROR] Request timed out")
+        except Exception as e:
+            print(f"[ERROR] Fetching price from TCGGO failed: {e}")
+        return None
+
+    def fetch_variants(self, name, number, set_name):
+        """Return all matching cards from the API with prices."""
+        try:
+            cards = self.search(name, number, set_name)
+            if cards is None:
+                return []
+            results = []
+            eur_pln = self.exchange_rate()
+            for card in self.matching_cards(cards, name, number, set_name):
+                price_eur = extract_cardmarket_price(card)
+                price_pln = 0
+                if price_eur is not None:
+                    price_pln = round(float(price_eur) * eur_pln * PRICE_MULTIPLIER, 2)
+                results.append(
+                    {
+                        "name": card.get("name"),
+                        "number": str(card.get("card_number", "")).lower(),
+                        "set": card.get("episode", {}).get("name", ""),
+                        "price": price_pln,
+                    }
+                )
+            return results
+        except requests.Timeout:
+            print("[ERROR] Request timed out")
+        except Exception as e:
+            print(f"[ERROR] Fetching variants from TCGGO failed: {e}")
+        return []
+
+    def lookup(self, name, number, set_name, is_holo=False, is_reverse=False):
+        """Return image URL and pricing information for the first matching card."""
+        try:
+            cards = self.search(name, number, set_name)
+            if cards is None:
+                return None
+            for card in self.matching_cards(cards, name, number, set_name):
+                price_eur = extract_cardmarket_price(card) or 0
+                base_rate = self.exchange_rate()
+                eur_pln = base_rate * PRICE_MULTIPLIER
+                price_pln = round(float(price_eur) * eur_pln, 2)
+                if is_holo or is_reverse:
+                    price_pln = round(price_pln * HOLO_REVERSE_MULTIPLIER, 2)
+                set_info = card.get("episode") or card.get("set") or {}
+                images = set_info.get("images", {}) if isinstance(set_info, dict) else {}
+                set_logo = (
+                    images.get("logo")
+                    or images.get("logoUrl")
+                    or images.get("logo_url")
+                    or set_info.get("logo")
+                )
+                image_url = (
+                    card.get("images", {}).get("large")
+                    or card.get("image")
+                    or card.get("imageUrl")
+                    or card.get("image_url")
+                )
+                return {
+                    "image_url": image_url,
+                    "set_logo_url": set_logo,
+                    "price_eur": round(float(price_eur), 2),
+                    "eur_pln_rate": round(base_rate, 4),
+                    "price_pln": price_pln,
+                    "price_pln_80": round(price_pln * 0.8, 2),
+                }
+        except requests.Timeout:
+            print("[ERROR] Request timed out")
+        except Exception as e:
+            print(f"[ERROR] Lookup failed: {e}")
+        return None
+
+    def price_card(self, name, number, set_name, types=None):
+        """Return the final price of a card or ``None``.
+
+        The local database is tried first, then the API.  ``types`` maps the
+        variant names (``Reverse``, ``Holo``, ``Pokeball``, ``Masterball``)
+        to booleans.
+        """
+        price = self.price_from_db(name, number, set_name)
+        if price is None:
+            price = self.fetch_price(name, number, set_name)
+        return variant_price(price, types or {})
+
+
+def variant_price(price, types):
+    """Apply the multipliers for the variant flags in ``types``."""
+    return apply_variant_multiplier(
+        price,
+        is_reverse=bool(types.get("Reverse")),
+        is_holo=bool(types.get("Holo")),
+        pokeball=bool(types.get("Pokeball")),
+        masterball=bool(types.get("Masterball")),
+    )
@@ -0,0 +1,256 @@
+import base64
+import io
+import json
+import os
+import re
+from urllib.parse import urlparse
+
+from .. import derivatives, ocr
+from ..lazy import LazyModule
+
+Image = LazyModule("PIL.Image")
+ImageOps = LazyModule("PIL.ImageOps")
+openai = LazyModule("openai")
+
+RECOGNITION_WIDTH = 512
+# card regions as fractions (left, top, right, bottom) of the scan
+NAME_REGION = (0.0, 0.0, 1.0, 0.16)
+NUMBER_REGION = (0.0, 0.86, 1.0, 1.0)
+SUFFIXES = {"EX", "GX", "V", "VMAX", "VSTAR", "SHINY", "PROMO"}
+PROMPT = (
+    "Extract Pokemon card name, number and suffix (EX, GX, V, VMAX, VSTAR, Shiny, Promo) as JSON {\"name\":\"\",\"number\":\"\",\"suffix\":\"\"}. Return empty suffix when not applicable."
+)
+
+
+def _completion(api_key, **kwargs):
+    module = openai._load()
+    if api_key and not getattr(module, "api_key", None):
+        module.api_key = api_key
+    return openai.chat.completions.create(**kwargs)
+
+
+def empty_result():
+    return {"name": "", "number": "", "suffix": ""}
+
+
+def translate_to_english(text: str, api_key=None) -> str:
+    """Return an English translation of ``text`` using OpenAI."""
+    if not api_key:
+        return text
+
+    try:
+        resp = _completion(
+            api_key,
+            model="gpt-4o",
+            messages=[{"role": "user", "content": f"Translate to English: {text}"}],
+            max_tokens=50,
+        )
+        return resp.choices[0].message.content.strip()
+    except Exception:
+        return text
+
+
+def encode_card_regions(path: str, width: int = RECOGNITION_WIDTH) -> str:
+    """Return a base64 data URL with the name and number strips of a scan.
+
+    The recognition crop from ``derivatives`` is used when available.  Both
+    strips are stacked vertically and scaled to ``width`` pixels so the
+    request stays small.
+    """
+    source = derivatives.recognition_path(path) or path
+    with Image.open(source) as src:
+        img = ImageOps.exif_transpose(src).convert("RGB")
+    w, h = img.size
+    strips = [
+        img.crop((int(l * w), int(t * h), int(r * w), int(b * h)))
+        for l, t, r, b in (NAME_REGION, NUMBER_REGION)
+    ]
+    scale = min(1.0, width / w)
+    strips = [
+        s.resize((max(1, int(s.width * scale)), max(1, int(s.height * scale))))
+        for s in strips
+    ]
+    combined = Image.new("RGB", (strips[0].width, sum(s.height for s in strips)))
+    y = 0
+    for strip in strips:
+        combined.paste(strip, (0, y))
+        y += strip.height
+    buf = io.BytesIO()
+    combined.save(buf, "JPEG", quality=85)
+    encoded = base64.b64encode(buf.getvalue()).decode("ascii")
+    return f"data:image/jpeg;base64,{encoded}"
+
+
+def parse_response(content):
+    """Decode the JSON answer of the model, with or without code fences."""
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        pass
+    # Remove Markdown code fences if present
+    text = content.strip()
+    if text.startswith("```"):
+        lines = text.splitlines()
+        if len(lines) >= 2 and lines[0].startswith("```") and lines[-1].startswith("```"):
+            text = "\n".join(lines[1:-1]).strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        print(f"[ERROR] analyze_card_image failed to decode JSON: {content!r} - {e}")
+        return None
+
+
+def clean_result(data, translate_name=False, api_key=None):
+    """Normalise the card number and split a trailing suffix off the name."""
+    number = data.get("number", "")
+    if isinstance(number, str):
+        m = re.match(r"\D*(\d+)", number)
+        if m:
+            data["number"] = str(int(m.group(1)))
+
+    name = data.get("name", "")
+    suffix = data.get("suffix", "").upper() if isinstance(data.get("suffix"), str) else ""
+    if isinstance(name, str) and not suffix:
+        parts = name.split()
+        if parts and parts[-1].upper() in SUFFIXES:
+            suffix = parts[-1].upper()
+            name = " ".join(parts[:-1])
+    if translate_name and isinstance(name, str) and not name.isascii():
+        name = translate_to_english(name, api_key)
+    data["name"] = name
+    data["suffix"] = suffix
+    return data
+
+
+def analyze_card_image(path: str, api_key=None, source="remote", base_url="", translate_name=False):
+    """Return card details recognized from the image using OpenAI.
+
+    ``path`` may be a public URL or a local scan.  Local scans are sent
+    inline as cropped strips when ``source`` is ``local``, otherwise their
+    uploaded copy under ``base_url`` is referenced.
+    """
+    if not api_key:
+        return empty_result()
+
+    parsed = urlparse(path)
+    prompt = PROMPT
+    if parsed.scheme in ("http", "https"):
+        url = path
+    elif source == "local" and os.path.exists(path):
+        try:
+            url = encode_card_regions(path)
+        except Exception as e:
+            print(f"[ERROR] analyze_card_image failed to read {path}: {e}")
+            return empty_result()
+        prompt += " The image shows the top strip of the card followed by its bottom strip."
+    else:
+        folder = os.path.basename(os.path.dirname(path))
+        filename = os.path.basename(path)
+        url = f"{base_url}/{folder}/{filename}"
+
+    try:
+        resp = _completion(
+            api_key,
+            model="gpt-4o",
+            messages=[
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": prompt},
+                        {"type": "image_url", "image_url": {"url": url}},
+                    ],
+                }
+            ],
+            max_tokens=80,
+        )
+        data = parse_response(resp.choices[0].message.content)
+        if data is None:
+            return empty_result()
+        return clean_result(data, translate_name, api_key)
+    except Exception as e:
+        print(f"[ERROR] analyze_card_image failed: {e}")
+        return empty_result()
+
+
+def scan_source(image_path, base_url, source="remote"):
+    """Return what is sent to OpenAI for a local scan.
+
+    In ``local`` mode this is the scan itself, otherwise the URL of its
+    uploaded recognition copy (or of the scan when there is none).
+    """
+    if source == "local":
+        return image_path
+    folder = os.path.dirname(image_path)
+    remote_name = derivatives.recognition_name(
+        folder, os.path.basename(image_path)
+    ) or os.path.basename(image_path)
+    return f"{base_url}/{os.path.basename(folder)}/{remote_name}"
+
+
+def recognize_card(path, remote, logo_dir, set_name=None, confidence=None, on_partial=None):
+    """Recognise a scan locally and fall back to ``remote`` when unsure.
+
+    ``remote`` is called without arguments and returns the OpenAI result.
+    ``set_name`` maps the set code found by the symbol index to a name.  A
+    local result below ``confidence`` is passed to ``on_partial`` (when it
+    contains anything useful) and merged into the remote result.
+    """
+    if confidence is None:
+        confidence = ocr.OCR_CONFIDENCE
+    local = None
+    if path and (ocr.available() or os.path.isdir(logo_dir)):
+        try:
+            local = ocr.recognize(path, logo_dir)
+        except Exception as e:
+            print(f"[WARN] Local recognition failed: {e}")
+    if local:
+        code = local.get("set_code", "")
+        local["set"] = set_name(code) if set_name else code
+        if local["confidence"] >= confidence:
+            return local
+        if on_partial is not None and (local["number"] or local["set"]):
+            # show the partial result while OpenAI is consulted
+            on_partial(local)
+    result = remote()
+    if local:
+        for key in ("name", "number", "set", "suffix"):
+            if not result.get(key) and local.get(key):
+                result[key] = local[key]
+    return result
+
+
+class RecognitionService:
+    """Card recognition settings bundled for headless use."""
+
+    def __init__(self, logo_dir="set_logos", api_key=None, source="remote",
+                 base_url="", set_name=None, confidence=None):
+        self.logo_dir = logo_dir
+        self.api_key = api_key
+        self.source = source
+        self.base_url = base_url
+        self.set_name = set_name
+        self.confidence = confidence
+
+    def analyze(self, path, translate_name=False):
+        return analyze_card_image(
+            path,
+            api_key=self.api_key,
+            source=self.source,
+            base_url=self.base_url,
+            translate_name=translate_name,
+        )
+
+    def recognize(self, path, url=None, translate_name=False, on_partial=None):
+        """Return the recognition result for the scan at ``path``.
+
+        ``url`` is what OpenAI is shown; by default see :func:`scan_source`.
+        """
+        url = url or scan_source(path, self.base_url, self.source)
+        return recognize_card(
+            path,
+            lambda: self.analyze(url, translate_name),
+            self.logo_dir,
+            set_name=self.set_name,
+            confidence=self.confidence,
+            on_partial=on_partial,
+        )
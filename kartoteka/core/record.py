@@ -0,0 +1,136 @@
+from collections.abc import MutableMapping
+
+from . import templates
+
+# values stored per card
+FIELDS = (
+    "nazwa",
+    "numer",
+    "set",
+    "suffix",
+    "stan",
+    "typ",
+    "rarity",
+    "język",
+    "cena",
+    "ilość",
+    "image1",
+    "product_code",
+    "warehouse_code",
+    "delivery",
+)
+# columns that are the same for every card
+DEFAULTS = {
+    "active": 1,
+    "vat": "23%",
+    "unit": "szt.",
+    "producer": "Pokémon",
+    "other_price": "",
+    "pkwiu": "",
+    "weight": 0.01,
+    "priority": 0,
+    "stock_warnlevel": 0,
+    "availability": 1,
+    "views": "",
+    "rank": "",
+    "rank_votes": "",
+}
+# columns derived from the fields; the descriptions are rendered on first use
+COMPUTED = ("category", "short_description", "description")
+# fields the descriptions may show
+HTML_FIELDS = frozenset(templates.PLACEHOLDERS.values())
+
+_FIELD_SET = frozenset(FIELDS)
+_MISSING = object()
+
+
+class CardRecord(MutableMapping):
+    """A product row of ``output_data``.
+
+    Behaves like the dictionaries used before: every Shoper column can be
+    read and assigned by key.  The card's own values live in slots, the
+    columns shared by all cards come from ``DEFAULTS`` and the HTML
+    descriptions are rendered from :mod:`~kartoteka.core.templates` when
+    first read and cached until one of the fields they show changes.  Any
+    other key is kept in a small overflow dictionary.
+    """
+
+    __slots__ = FIELDS + ("_extra", "_html")
+
+    def __init__(self, data=(), **kwargs):
+        self._extra = None
+        self._html = None
+        self.update(data, **kwargs)
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            value = getattr(self, key, _MISSING)
+            if value is _MISSING:
+                raise KeyError(key)
+            return value
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        if key in DEFAULTS:
+            return DEFAULTS[key]
+        if key == "category":
+            return f"Karty Pokémon > {self.get('set', '')}"
+        if key in ("short_description", "description"):
+            if self._html is None:
+                self._html = templates.render_descriptions(self)
+            return self._html[0 if key == "short_description" else 1]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+            if key in HTML_FIELDS:
+                self._html = None
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _FIELD_SET and hasattr(self, key):
+            delattr(self, key)
+            if key in HTML_FIELDS:
+                self._html = None
+        elif self._extra and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for key in FIELDS:
+            if hasattr(self, key):
+                yield key
+        extra = self._extra or {}
+        for key in DEFAULTS:
+            if key not in extra:
+                yield key
+        for key in COMPUTED:
+            if key not in extra:
+                yield key
+        yield from extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"CardRecord({self.fields()!r})"
+
+    def copy(self):
+        other = CardRecord()
+        for key in FIELDS:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                setattr(other, key, value)
+        other._extra = dict(self._extra) if self._extra else None
+        other._html = self._html
+        return other
+
+    def fields(self):
+        """Return the stored values, without defaults and rendered HTML."""
+        data = {key: getattr(self, key) for key in FIELDS if hasattr(self, key)}
+        data.update(self._extra or {})
+        return data
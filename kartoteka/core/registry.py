@@ -0,0 +1,125 @@
+import os
+import sqlite3
+import threading
+
+PRODUCT_REGISTRY_DB = os.getenv("PRODUCT_REGISTRY_DB", "product_registry.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    key TEXT PRIMARY KEY,
+    product_code INTEGER NOT NULL UNIQUE,
+    pushed INTEGER NOT NULL DEFAULT 0,
+    shoper_id INTEGER
+)
+"""
+
+
+class ProductRegistry:
+    """Product codes of every card ever catalogued, kept in SQLite.
+
+    Cards are identified by the ``nazwa|numer|set`` key used for
+    ``product_code_map``; the variant is not part of it because variants of
+    a card share one product.  Lookups go through the primary key and code
+    indexes, so assigning a code or checking for a duplicate does not depend
+    on the size of the catalogue.  ``pushed`` and ``shoper_id`` record which
+    products were already sent to Shoper.
+    """
+
+    def __init__(self, path=PRODUCT_REGISTRY_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(SCHEMA)
+        row = self._conn.execute("SELECT MAX(product_code) FROM products").fetchone()
+        self.next_code = (row[0] or 0) + 1
+
+    def close(self):
+        self._conn.close()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def get(self, key):
+        """Return the product code registered for ``key`` or ``None``."""
+        row = self._conn.execute(
+            "SELECT product_code FROM products WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def owner(self, code):
+        """Return the key that owns product ``code`` or ``None``."""
+        row = self._conn.execute(
+            "SELECT key FROM products WHERE product_code = ?", (code,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def assign(self, key, preferred=None):
+        """Return the product code of ``key``, registering it when new.
+
+        ``preferred`` (e.g. a code read from an imported CSV) is used when no
+        other card owns it; otherwise the next free code is taken.
+        """
+        with self._lock:
+            code = self.get(key)
+            if code is not None:
+                return code
+            if preferred is not None and self.owner(preferred) is None:
+                code = preferred
+            else:
+                if preferred is not None:
+                    print(f"[WARN] Product code {preferred} already belongs to {self.owner(preferred)}")
+                code = self.next_code
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO products (key, product_code) VALUES (?, ?)", (key, code)
+                )
+            self.next_code = max(self.next_code, code + 1)
+            return code
+
+    def is_pushed(self, key):
+        row = self._conn.execute(
+            "SELECT pushed FROM products WHERE key = ?", (key,)
+        ).fetchone()
+        return bool(row and row[0])
+
+    def shoper_id(self, key):
+        row = self._conn.execute(
+            "SELECT shoper_id FROM products WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def mark_pushed(self, keys, shoper_id=None):
+        """Record that the products of ``keys`` exist in Shoper."""
+        with self._lock, self._conn:
+            for key in keys:
+                self._conn.execute(
+                    "UPDATE products SET pushed = 1, shoper_id = COALESCE(?, shoper_id) WHERE key = ?",
+                    (shoper_id, key),
+                )
+
+
+def product_code(state, key, preferred=None):
+    """Return the product code of ``key`` for ``state``, assigning one if new.
+
+    ``state`` holds ``product_code_map`` and ``next_product_code`` and
+    optionally a ``product_registry``; with a registry the codes continue
+    the whole catalogue instead of restarting at 1 in every session.
+    """
+    code = state.product_code_map.get(key)
+    if code is not None:
+        return code
+    registry = getattr(state, "product_registry", None)
+    if registry is not None:
+        code = registry.assign(key, preferred)
+    elif preferred is not None:
+        code = preferred
+    else:
+        code = state.next_product_code
+    state.product_code_map[key] = code
+    state.next_product_code = max(state.next_product_code, code + 1)
+    return code
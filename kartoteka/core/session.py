@@ -0,0 +1,173 @@
+import json
+import os
+from collections.abc import Mapping
+
+from .. import derivatives, set_catalogue, storage
+from . import export, journal, pricing, registry
+
+SCAN_EXTENSIONS = (".jpg", ".png")
+# scans a batch run could not handle confidently; read by the editor
+REVIEW_FILE = "batch_review.json"
+
+
+def list_scans(folder):
+    """Return the scans in ``folder`` in the order they are processed."""
+    return sorted(
+        os.path.join(folder, f)
+        for f in os.listdir(folder)
+        if f.lower().endswith(SCAN_EXTENSIONS)
+    )
+
+
+def review_path(folder):
+    """Return where the batch review of ``folder`` is kept."""
+    return os.path.join(folder, journal.JOURNAL_DIR, REVIEW_FILE)
+
+
+def write_review(folder, review, next_location):
+    """Store the review entries of ``folder`` for the editor."""
+    path = review_path(folder)
+    if not review:
+        if os.path.exists(path):
+            os.remove(path)
+        return None
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    set_catalogue.write_json_atomic(
+        path, {"next_location": next_location, "cards": review}
+    )
+    return path
+
+
+def load_review(folder):
+    """Return the review file written by a batch run in ``folder`` or ``None``."""
+    path = review_path(folder)
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or not data.get("cards"):
+        return None
+    return data
+
+
+def store_card(state, index, data, types, rarities, base_image_url, delivery_id=1):
+    """Build the product row of card ``index`` and store it in ``state``.
+
+    ``state`` is a :class:`CardSession` or the editor itself; both expose
+    ``cards``, ``output_data``, ``card_cache``, ``file_to_key``,
+    ``product_code_map``, ``next_product_code`` (and optionally a
+    ``product_registry``) and the ``get_price_from_db``, ``fetch_card_price``
+    and ``next_free_location`` methods.  ``data`` holds
+    the form fields, ``types`` and ``rarities`` map checkbox names to
+    booleans.  Returns the row.
+    """
+    data = dict(data)
+    data["typ"] = ",".join(name for name, checked in types.items() if checked)
+    data["rarity"] = ",".join(name for name, checked in rarities.items() if checked)
+    key = export.card_key(data)
+    data["ilość"] = 1
+    state.card_cache[key] = {
+        "entries": dict(data),
+        "types": dict(types),
+        "rarities": dict(rarities),
+    }
+
+    front_file = os.path.basename(state.cards[index])
+    state.file_to_key[front_file] = key
+    web_file = derivatives.web_name(getattr(state, "folder_path", ""), front_file)
+    image_url = f"{base_image_url}/{state.folder_name}/{web_file}"
+
+    product_code = registry.product_code(state, key)
+    prev = None
+    if 0 <= index < len(state.output_data):
+        existing = state.output_data[index]
+        if isinstance(existing, Mapping):
+            prev = existing.get("warehouse_code")
+    warehouse_code = prev or state.next_free_location()
+
+    price = state.get_price_from_db(data["nazwa"], data["numer"], data["set"])
+    if price is None:
+        price = state.fetch_card_price(data["nazwa"], data["numer"], data["set"])
+    price = pricing.variant_price(price, types)
+
+    row = export.build_card_row(
+        data,
+        image_url,
+        product_code,
+        warehouse_code,
+        delivery_id=delivery_id,
+        price=price,
+    )
+    state.output_data[index] = row
+    return row
+
+
+class CardSession:
+    """A scanning session without a GUI.
+
+    Holds the same state as :class:`~kartoteka.ui.CardEditorApp` (scans,
+    collected rows, product codes, starting warehouse slot) together with the
+    pricing and recognition services, so folders can be processed by scripts
+    and worker processes.  An optional :class:`~kartoteka.core.journal.SessionJournal`
+    keeps the saved rows on disk.
+    """
+
+    def __init__(self, cards=(), folder_path="", starting_idx=0, pricing_service=None,
+                 recognition=None, base_image_url="", delivery_id=1, journal=None,
+                 product_registry=None):
+        self.cards = list(cards)
+        self.folder_path = folder_path
+        self.folder_name = os.path.basename(folder_path)
+        self.starting_idx = starting_idx
+        self.pricing = pricing_service or pricing.PricingService()
+        self.recognition = recognition
+        self.base_image_url = base_image_url
+        self.delivery_id = delivery_id
+        self.index = 0
+        self.output_data = [None] * len(self.cards)
+        self.card_cache = {}
+        self.file_to_key = {}
+        self.product_code_map = {}
+        self.next_product_code = 1
+        self.journal = journal
+        self.product_registry = product_registry
+
+    @classmethod
+    def from_folder(cls, folder, **kwargs):
+        return cls(list_scans(folder), folder_path=folder, **kwargs)
+
+    def next_free_location(self):
+        return storage.next_free_location(self)
+
+    def get_price_from_db(self, name, number, set_name):
+        return self.pricing.price_from_db(name, number, set_name)
+
+    def fetch_card_price(self, name, number, set_name):
+        return self.pricing.fetch_price(name, number, set_name)
+
+    def recognize(self, index, translate_name=False):
+        """Return the recognition result for scan ``index``."""
+        return self.recognition.recognize(self.cards[index], translate_name=translate_name)
+
+    def save_card(self, index, data, types=None, rarities=None):
+        """Store the row for scan ``index`` built from the fields in ``data``.
+
+        The row is also appended to ``journal`` when the session has one.
+        """
+        row = store_card(
+            self,
+            index,
+            data,
+            types or {},
+            rarities or {},
+            self.base_image_url,
+            self.delivery_id,
+        )
+        if self.journal is not None:
+            self.journal.record(self, index)
+        return row
+
+    def export(self, file_path):
+        """Write the collected rows as a Shoper CSV; returns the product count."""
+        return export.write_shoper_csv(file_path, self.output_data)
@@ -0,0 +1,145 @@
+import html
+import json
+import os
+import string
+from functools import lru_cache
+
+# JSON file with additional templates, see ``load``
+DESCRIPTION_TEMPLATES = os.getenv("DESCRIPTION_TEMPLATES", "description_templates.json")
+ANY = "*"
+
+# template placeholders and the card fields they show
+PLACEHOLDERS = {
+    "name": "nazwa",
+    "number": "numer",
+    "set": "set",
+    "type": "typ",
+    "condition": "stan",
+    "suffix": "suffix",
+    "rarity": "rarity",
+    "language": "język",
+}
+
+SHORT_DESCRIPTION = (
+    "<p><strong>{name}</strong></p>"
+    "<ul>"
+    "<li>Zestaw: {set}</li>"
+    "<li>Numer karty: {number}</li>"
+    "<li>Typ: {type}</li>"
+    "<li>Stan: {condition}</li>"
+    "</ul>"
+)
+DESCRIPTION = "".join(
+    f"<p>{p}</p>"
+    for p in (
+        "{name} – Pokémon TCG",
+        "Karta pochodzi z zestawu {set} i ma numer {number}. Typ karty: {type}. Stan: {condition}.",
+        "Każda karta jest dokładnie sprawdzana przed wysyłką i odpowiednio zabezpieczana – trafia do Ciebie w idealnym stanie, gotowa do gry lub kolekcji.",
+        "Zdjęcia przedstawiają rzeczywisty produkt lub jego odpowiednik. Jeśli szukasz więcej kart z tego setu – sprawdź pozostałe oferty.",
+    )
+)
+
+
+class Template:
+    """An HTML template with ``{placeholder}`` fields.
+
+    The source is parsed once into literal parts and the card fields they
+    are followed by; rendering escapes only the fields the template uses and
+    joins the parts.  Literal braces are written as ``{{`` and ``}}``.
+    """
+
+    __slots__ = ("source", "_parts")
+
+    def __init__(self, source):
+        self.source = source
+        parts = []
+        for literal, field, _spec, _conv in string.Formatter().parse(source):
+            if field is not None and field not in PLACEHOLDERS:
+                raise ValueError(f"Unknown template field {field!r}")
+            parts.append((literal, PLACEHOLDERS[field] if field is not None else None))
+        self._parts = tuple(parts)
+
+    def render(self, card):
+        out = []
+        for literal, key in self._parts:
+            out.append(literal)
+            if key is not None:
+                out.append(html.escape(str(card.get(key, ""))))
+        return "".join(out)
+
+
+_sources = {}
+
+
+def register(short_description=None, description=None, language=ANY, set_name=ANY):
+    """Use the given templates for cards of ``language`` and ``set_name``.
+
+    ``ANY`` matches every language or set; either template may be left out
+    to keep the more general one.
+    """
+    entry = _sources.setdefault((language, set_name), {})
+    if short_description is not None:
+        entry["short_description"] = Template(short_description)
+    if description is not None:
+        entry["description"] = Template(description)
+    templates_for.cache_clear()
+
+
+def load(path=DESCRIPTION_TEMPLATES):
+    """Register the templates of a JSON file, if it exists.
+
+    The file maps a card language (``ENG``, ``JP`` or ``*``) to set names
+    (or ``*``) to an object with ``short_description`` and/or
+    ``description``.  Returns the number of registered entries.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError) as exc:
+        print(f"[WARN] Cannot read description templates {path}: {exc}")
+        return 0
+    count = 0
+    for language, sets in data.items():
+        for set_name, entry in sets.items():
+            register(
+                entry.get("short_description"),
+                entry.get("description"),
+                language=language,
+                set_name=set_name,
+            )
+            count += 1
+    return count
+
+
+@lru_cache(maxsize=None)
+def templates_for(language, set_name):
+    """Return the ``(short, full)`` templates for a language and set.
+
+    The most specific registered template wins: language and set, then the
+    language alone, then the set alone, then the default.
+    """
+    result = []
+    for kind in ("short_description", "description"):
+        for key in ((language, set_name), (language, ANY), (ANY, set_name), (ANY, ANY)):
+            template = _sources.get(key, {}).get(kind)
+            if template is not None:
+                result.append(template)
+                break
+    return tuple(result)
+
+
+def render_descriptions(card):
+    """Return the short and the full HTML description of ``card``."""
+    short, full = templates_for(card.get("język", ""), card.get("set", ""))
+    return short.render(card), full.render(card)
+
+
+def render_many(cards):
+    """Return the descriptions of many cards, e.g. for a repricing run."""
+    return [render_descriptions(card) for card in cards]
+
+
+register(SHORT_DESCRIPTION, DESCRIPTION)
+load()
@@ -1,13 +1,20 @@
 import os
 import re
 import csv
+import io
+import json
+import shutil
+import time
 from tkinter import filedialog, messagebox
 from ftp_client import FTPClient
 
+from .core import export, registry
+
 FTP_HOST = os.getenv("FTP_HOST")
 FTP_USER = os.getenv("FTP_USER")
 FTP_PASSWORD = os.getenv("FTP_PASSWORD")
 INVENTORY_CSV = os.getenv("INVENTORY_CSV", "magazyn.csv")
+CSV_CHUNK_BYTES = int(os.getenv("CSV_CHUNK_BYTES", str(512 * 1024)))
 
 
 def load_csv_data(app):
@@ -85,16 +92,9 @@ def load_csv_data(app):
             f"{row.get('nazwa', '').strip()}|{row.get('numer', '').strip()}|{row.get('set', '').strip()}"
         )
         code_str = str(row.get("product_code", "")).strip()
-        if map_key not in app.product_code_map:
-            if code_str.isdigit():
-                code_int = int(code_str)
-                app.product_code_map[map_key] = code_int
-                if code_int >= app.next_product_code:
-                    app.next_product_code = code_int + 1
-            else:
-                app.product_code_map[map_key] = app.next_product_code
-                app.next_product_code += 1
-        row["product_code"] = app.product_code_map[map_key]
+        row["product_code"] = registry.product_code(
+            app, map_key, int(code_str) if code_str.isdigit() else None
+        )
 
     if qty_field is None:
         qty_field = "ilość"
@@ -135,165 +135,145 @@ def export_csv(app):
     if not file_path:
         return
 
-    combined = {}
-    for row in app.output_data:
-        if row is None:
-            continue
-        key = f"{row['nazwa']}|{row['numer']}|{row['set']}"
-        if key in combined:
-            combined[key]["stock"] += 1
-        else:
-            combined[key] = row.copy()
-            combined[key]["stock"] = 1
-
-    fieldnames = [
-        "product_code",
-        "active",
-        "name",
-        "price",
-        "vat",
-        "unit",
-        "category",
-        "producer",
-        "other_price",
-        "pkwiu",
-        "weight",
-        "priority",
-        "short_description",
-        "description",
-        "stock",
-        "stock_warnlevel",
-        "availability",
-        "views",
-        "rank",
-        "rank_votes",
-        "images 1",
-    ]
-    fieldnames.append("warehouse_code")
-
-    with open(file_path, mode="w", encoding="utf-8", newline="") as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames, delimiter=";")
-        writer.writeheader()
-        for row in combined.values():
-            suffix = row.get("suffix", "").strip()
-            name_parts = [row["nazwa"]]
-            if suffix:
-                name_parts.append(suffix)
-            name_parts.append(row["numer"])
-            formatted_name = " ".join(name_parts)
-
-            writer.writerow(
-                {
-                    "product_code": row["product_code"],
-                    "active": row.get("active", 1),
-                    "name": formatted_name,
-                    "price": row["cena"],
-                    "vat": row.get("vat", "23%"),
-                    "unit": row.get("unit", "szt."),
-                    "category": row["category"],
-                    "producer": row["producer"],
-                    "other_price": row.get("other_price", ""),
-                    "pkwiu": row.get("pkwiu", ""),
-                    "weight": row.get("weight", 0.01),
-                    "priority": row.get("priority", 0),
-                    "short_description": row["short_description"],
-                    "description": row["description"],
-                    "stock": row["stock"],
-                    "stock_warnlevel": row.get("stock_warnlevel", 0),
-                    "availability": row.get("availability", 1),
-                    "views": row.get("views", ""),
-                    "rank": row.get("rank", ""),
-                    "rank_votes": row.get("rank_votes", ""),
-                    "images 1": row.get("image1", row.get("images", "")),
-                    "warehouse_code": row.get("warehouse_code", ""),
-                }
-            )
-    append_inventory_csv(app)
+    export.write_shoper_csv(file_path, app.output_data, inventory_path=INVENTORY_CSV)
+    session_journal = getattr(app, "journal", None)
+    if session_journal is not None:
+        # the cards are in the CSV and the inventory now, nothing to resume
+        session_journal.clear()
     messagebox.showinfo("Sukces", "Plik CSV został zapisany.")
     if messagebox.askyesno("Wysyłka", "Czy wysłać plik do Shoper?"):
-        send_csv_to_shoper(app, file_path)
+        if send_csv_to_shoper(app, file_path):
+            product_registry = getattr(app, "product_registry", None)
+            if product_registry is not None:
+                product_registry.mark_pushed(
+                    {export.card_key(row) for row in app.output_data if row}
+                )
     app.back_to_welcome()
 
 
-def append_inventory_csv(app, path: str = INVENTORY_CSV):
-    """Append all collected rows to the inventory CSV."""
-    fieldnames = [
-        "product_code",
-        "active",
-        "name",
-        "price",
-        "vat",
-        "unit",
-        "category",
-        "producer",
-        "other_price",
-        "pkwiu",
-        "weight",
-        "priority",
-        "short_description",
-        "description",
-        "stock",
-        "stock_warnlevel",
-        "availability",
-        "views",
-        "rank",
-        "rank_votes",
-        "images 1",
-        "warehouse_code",
-    ]
-
-    file_exists = os.path.exists(path)
-    with open(path, "a", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter=";")
-        if not file_exists:
-            writer.writeheader()
-        for row in app.output_data:
-            if row is None:
-                continue
-            suffix = row.get("suffix", "").strip()
-            name_parts = [row["nazwa"]]
-            if suffix:
-                name_parts.append(suffix)
-            name_parts.append(row["numer"])
-            formatted_name = " ".join(name_parts)
-
-            writer.writerow(
-                {
-                    "product_code": row["product_code"],
-                    "active": row.get("active", 1),
-                    "name": formatted_name,
-                    "price": row["cena"],
-                    "vat": row.get("vat", "23%"),
-                    "unit": row.get("unit", "szt."),
-                    "category": row["category"],
-                    "producer": row["producer"],
-                    "other_price": row.get("other_price", ""),
-                    "pkwiu": row.get("pkwiu", ""),
-                    "weight": row.get("weight", 0.01),
-                    "priority": row.get("priority", 0),
-                    "short_description": row["short_description"],
-                    "description": row["description"],
-                    "stock": 1,
-                    "stock_warnlevel": row.get("stock_warnlevel", 0),
-                    "availability": row.get("availability", 1),
-                    "views": row.get("views", ""),
-                    "rank": row.get("rank", ""),
-                    "rank_votes": row.get("rank_votes", ""),
-                    "images 1": row.get("image1", row.get("images", "")),
-                    "warehouse_code": row.get("warehouse_code", ""),
-                }
-            )
+def split_csv(file_path: str, max_bytes: int = CSV_CHUNK_BYTES, out_dir=None):
+    """Split ``file_path`` into chunk files of at most ``max_bytes``.
+
+    Every chunk repeats the header row so it can be imported on its own.
+    Rows are never split; a single row larger than ``max_bytes`` ends up in
+    a chunk of its own.  Returns the list of created chunk paths.
+    """
+    out_dir = out_dir or f"{file_path}.chunks"
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.splitext(os.path.basename(file_path))[0]
+
+    def encode(row):
+        buf = io.StringIO()
+        csv.writer(buf, delimiter=";").writerow(row)
+        return buf.getvalue().encode("utf-8")
+
+    paths = []
+    with open(file_path, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f, delimiter=";")
+        header = next(reader, None)
+        if header is None:
+            return paths
+        header_bytes = encode(header)
+        out = None
+        size = 0
+        for row in reader:
+            data = encode(row)
+            if out is not None and size + len(data) > max_bytes:
+                out.close()
+                out = None
+            if out is None:
+                path = os.path.join(out_dir, f"{base}.part{len(paths) + 1:03d}.csv")
+                paths.append(path)
+                out = open(path, "wb")
+                out.write(header_bytes)
+                size = len(header_bytes)
+            out.write(data)
+            size += len(data)
+        if out is not None:
+            out.close()
+    return paths
+
+
+def upload_csv_chunks(
+    file_path: str,
+    upload,
+    max_bytes: int = CSV_CHUNK_BYTES,
+    retries: int = 3,
+    progress=None,
+    delay: float = 1.0,
+):
+    """Upload ``file_path`` in chunks using the ``upload(chunk_path)`` callable.
+
+    Finished chunks are recorded in ``<file_path>.upload.json`` so calling the
+    function again after a failure resumes with the first missing chunk.
+    ``progress(done, total)`` is called after every uploaded chunk.  The state
+    file and chunk directory are removed once everything has been sent.
+    """
+    state_path = f"{file_path}.upload.json"
+    out_dir = f"{file_path}.chunks"
+    stat = os.stat(file_path)
+    signature = {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "max_bytes": max_bytes,
+    }
+    done = set()
+    try:
+        with open(state_path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("source") == signature:
+            done = set(state.get("done", []))
+    except (OSError, ValueError):
+        pass
+    if not done and os.path.isdir(out_dir):
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+    chunks = split_csv(file_path, max_bytes, out_dir)
+    total = len(chunks)
+    for idx, chunk in enumerate(chunks):
+        name = os.path.basename(chunk)
+        if name in done:
+            continue
+        for attempt in range(1, retries + 1):
+            try:
+                upload(chunk)
+                break
+            except Exception as exc:
+                print(f"[WARN] Upload of {name} failed ({attempt}/{retries}): {exc}")
+                if attempt == retries:
+                    raise
+                time.sleep(delay * attempt)
+        done.add(name)
+        with open(state_path, "w", encoding="utf-8") as f:
+            json.dump({"source": signature, "done": sorted(done)}, f)
+        if progress:
+            progress(len(done), total)
+
+    if os.path.exists(state_path):
+        os.remove(state_path)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    return chunks
 
 
 def send_csv_to_shoper(app, file_path: str):
-    """Send a CSV file using the Shoper API or FTP fallback."""
+    """Send a CSV file using the Shoper API or FTP fallback.
+
+    The file is uploaded in chunks; an interrupted upload resumes from the
+    last successful chunk the next time the same file is sent.
+    """
+
+    def progress(done, total):
+        if hasattr(app, "log"):
+            app.log(f"Wysłano część {done}/{total}")
+
     try:
         if getattr(app, "shoper_client", None):
-            app.shoper_client.import_csv(file_path)
+            upload_csv_chunks(file_path, app.shoper_client.import_csv, progress=progress)
         else:
             with FTPClient(app.FTP_HOST, app.FTP_USER, app.FTP_PASSWORD) as ftp:
-                ftp.upload_file(file_path)
+                upload_csv_chunks(file_path, ftp.upload_file, progress=progress)
         messagebox.showinfo("Sukces", "Plik CSV został wysłany.")
+        return True
     except Exception as exc:  # pragma: no cover - network failure
         messagebox.showerror("Błąd", f"Nie udało się wysłać pliku: {exc}")
-
+        return False
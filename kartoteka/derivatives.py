@@ -0,0 +1,170 @@
+import os
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from .lazy import LazyModule
+
+Image = LazyModule("PIL.Image")
+ImageChops = LazyModule("PIL.ImageChops")
+ImageOps = LazyModule("PIL.ImageOps")
+
+DERIVATIVES_DIR = "_derivatives"
+MANIFEST_NAME = "manifest.json"
+WEB_IMAGE_SIZE = int(os.getenv("WEB_IMAGE_SIZE", "1200"))
+WEB_IMAGE_FORMAT = os.getenv("WEB_IMAGE_FORMAT", "JPEG").upper()
+RECOGNITION_SIZE = (512, 716)
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "0")) or os.cpu_count() or 1
+
+_manifest_cache = {}
+
+
+def derivatives_dir(folder: str) -> str:
+    return os.path.join(folder, DERIVATIVES_DIR)
+
+
+def _trim_margins(img, tolerance=24):
+    """Crop the uniform scanner background around the card."""
+    bg = Image.new(img.mode, img.size, img.getpixel((0, 0)))
+    diff = ImageChops.difference(img, bg).convert("L")
+    bbox = diff.point(lambda p: 255 if p > tolerance else 0).getbbox()
+    return img.crop(bbox) if bbox else img
+
+
+def make_derivatives(path: str, out_dir: str) -> dict:
+    """Write the web-sized image and recognition crop for ``path``.
+
+    Returns the manifest entry with paths relative to ``out_dir``.
+    """
+    filename = os.path.basename(path)
+    stem = os.path.splitext(filename)[0]
+    ext = ".webp" if WEB_IMAGE_FORMAT == "WEBP" else ".jpg"
+    web_rel = f"web/{stem}{ext}"
+    rec_rel = f"rec/{stem}.jpg"
+    os.makedirs(os.path.join(out_dir, "web"), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, "rec"), exist_ok=True)
+
+    with Image.open(path) as src:
+        img = ImageOps.exif_transpose(src).convert("RGB")
+    web = img.copy()
+    web.thumbnail((WEB_IMAGE_SIZE, WEB_IMAGE_SIZE))
+    web.save(os.path.join(out_dir, web_rel), WEB_IMAGE_FORMAT, quality=85)
+
+    rec = _trim_margins(img)
+    rec.thumbnail(RECOGNITION_SIZE)
+    rec.save(os.path.join(out_dir, rec_rel), "JPEG", quality=80)
+    return {
+        "mtime": os.path.getmtime(path),
+        "web": web_rel,
+        "rec": rec_rel,
+        "size": list(web.size),
+    }
+
+
+def load_manifest(folder: str) -> dict:
+    """Return the derivative manifest of ``folder`` or an empty dict."""
+    path = os.path.join(derivatives_dir(folder), MANIFEST_NAME)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    cached = _manifest_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    _manifest_cache[path] = (mtime, data)
+    return data
+
+
+def build_derivatives(folder: str, workers: int = IMAGE_WORKERS, progress=None) -> dict:
+    """Create derivatives for every scan in ``folder`` using a process pool.
+
+    Scans already listed in the manifest with an unchanged modification time
+    are skipped.  ``progress(done, total)`` is called after each scan.
+    """
+    out_dir = derivatives_dir(folder)
+    manifest = dict(load_manifest(folder))
+    todo = []
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if not os.path.isfile(path) or not name.lower().endswith((".jpg", ".jpeg", ".png")):
+            continue
+        entry = manifest.get(name)
+        if entry and entry.get("mtime") == os.path.getmtime(path):
+            continue
+        todo.append((name, path))
+
+    total = len(todo)
+    if todo:
+        if workers > 1 and total > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(
+                    make_derivatives, [p for _, p in todo], [out_dir] * total
+                )
+                for done, ((name, _), entry) in enumerate(zip(todo, results), start=1):
+                    manifest[name] = entry
+                    if progress:
+                        progress(done, total)
+        else:
+            for done, (name, path) in enumerate(todo, start=1):
+                manifest[name] = make_derivatives(path, out_dir)
+                if progress:
+                    progress(done, total)
+        _save_manifest(folder, manifest)
+    return manifest
+
+
+def _save_manifest(folder: str, manifest: dict) -> None:
+    out_dir = derivatives_dir(folder)
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+    _manifest_cache.pop(path, None)
+
+
+def mark_recognition_uploaded(folder: str) -> None:
+    """Record that the recognition crops of ``folder`` are on the server.
+
+    Entries written again by ``build_derivatives`` lose the mark until the
+    next upload.
+    """
+    manifest = load_manifest(folder)
+    if manifest:
+        _save_manifest(
+            folder, {name: dict(entry, rec_uploaded=True) for name, entry in manifest.items()}
+        )
+
+
+def web_name(folder: str, filename: str) -> str:
+    """Return the file name under which the web image of ``filename`` is published."""
+    entry = load_manifest(folder).get(filename) if folder else None
+    if entry:
+        return os.path.basename(entry["web"])
+    return filename
+
+
+def recognition_name(folder: str, filename: str):
+    """Return the remote path of the recognition crop relative to the scan folder.
+
+    ``None`` until the crop has been uploaded.
+    """
+    entry = load_manifest(folder).get(filename) if folder else None
+    return entry["rec"] if entry and entry.get("rec_uploaded") else None
+
+
+def recognition_path(image_path: str):
+    """Return the local recognition crop for ``image_path`` when available."""
+    folder = os.path.dirname(image_path)
+    entry = load_manifest(folder).get(os.path.basename(image_path)) if folder else None
+    rel = entry["rec"] if entry else None
+    if rel:
+        path = os.path.join(derivatives_dir(folder), rel)
+        if os.path.exists(path):
+            return path
+    return None
@@ -0,0 +1,115 @@
+import os
+import threading
+
+from .core.session import SCAN_EXTENSIONS
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - optional dependency
+    FileSystemEventHandler = object
+    Observer = None
+
+# seconds between directory checks when no file system events are available
+HOT_FOLDER_INTERVAL = float(os.getenv("HOT_FOLDER_INTERVAL", "1.0"))
+# delay before a growing file is checked again
+SETTLE_INTERVAL = 0.25
+
+
+class _WakeHandler(FileSystemEventHandler):
+    def __init__(self, event):
+        self.event = event
+
+    def on_any_event(self, event):
+        self.event.set()
+
+
+class FolderWatcher:
+    """Report scans that appear in ``folder`` while it is being worked on.
+
+    With ``watchdog`` installed the folder is watched through inotify (or
+    the platform equivalent); otherwise it is listed every ``interval``
+    seconds.  A new file is reported once its size stops changing, so scans
+    still being written by the scanner are not picked up half-finished.
+    ``on_new`` receives a sorted list of paths and is called from the
+    watcher thread.
+    """
+
+    def __init__(self, folder, on_new, known=(), interval=HOT_FOLDER_INTERVAL, use_events=True):
+        self.folder = folder
+        self.on_new = on_new
+        self.interval = interval
+        self.use_events = use_events and Observer is not None
+        self.known = {os.path.basename(p) for p in known}
+        self._pending = {}
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._observer = None
+
+    @property
+    def mode(self):
+        return "events" if self._observer is not None else "polling"
+
+    @property
+    def running(self):
+        return self._thread is not None and not self._stopped.is_set()
+
+    def poll(self):
+        """Return the new scans whose size did not change since the last call."""
+        try:
+            names = os.listdir(self.folder)
+        except OSError:
+            return []
+        ready = []
+        for name in names:
+            if name in self.known or not name.lower().endswith(SCAN_EXTENSIONS):
+                continue
+            try:
+                size = os.path.getsize(os.path.join(self.folder, name))
+            except OSError:
+                continue
+            if size and self._pending.get(name) == size:
+                del self._pending[name]
+                self.known.add(name)
+                ready.append(name)
+            else:
+                self._pending[name] = size
+        return [os.path.join(self.folder, name) for name in sorted(ready)]
+
+    def start(self):
+        if self._thread is not None:
+            return
+        if self.use_events:
+            try:
+                self._observer = Observer()
+                self._observer.schedule(_WakeHandler(self._wake), self.folder)
+                self._observer.start()
+            except Exception as exc:
+                print(f"[WARN] Watching {self.folder} failed, polling instead: {exc}")
+                self._observer = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(SETTLE_INTERVAL if self._pending else self.interval)
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+            ready = self.poll()
+            if ready:
+                try:
+                    self.on_new(ready)
+                except Exception as exc:
+                    print(f"[ERROR] Handling new scans failed: {exc}")
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+            except Exception:
+                pass
+            self._observer = None
@@ -0,0 +1,35 @@
+import importlib
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access.
+
+    ``openai``, ``requests``, ``PIL`` and ``customtkinter`` together take
+    about a second to import; with this proxy ``import kartoteka`` only pays
+    for them when they are used.  Modules already present in
+    ``sys.modules`` (e.g. test stubs) are returned as they are.  Attributes
+    assigned on the proxy shadow the real module, which is what
+    ``unittest.mock.patch.object`` relies on.  ``on_load`` is called once
+    with the imported module.
+    """
+
+    def __init__(self, name, on_load=None):
+        self.__dict__["_name"] = name
+        self.__dict__["_on_load"] = on_load
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self._name)
+            self.__dict__["_module"] = module
+            if self._on_load is not None:
+                self._on_load(module)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
@@ -0,0 +1,76 @@
+import os
+
+from .lazy import LazyModule
+
+Image = LazyModule("PIL.Image")
+ImageTk = LazyModule("PIL.ImageTk")
+
+THUMBS_DIR = ".thumbs"
+LOGO_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif")
+LOGO_SIZE = (40, 40)
+
+
+class LogoCache:
+    """Set logos decoded on first use.
+
+    ``get`` returns a ``PhotoImage`` for a set code or ``None`` when there is
+    no logo.  Resized copies are kept as PNG files in
+    ``<logo_dir>/.thumbs`` and reused until the original logo changes, so
+    only the first run pays for the resize.
+    """
+
+    def __init__(self, logo_dir, size=LOGO_SIZE):
+        self.logo_dir = logo_dir
+        self.size = tuple(size)
+        self.thumbs_dir = os.path.join(logo_dir, THUMBS_DIR)
+        self._photos = {}
+
+    def source_path(self, code):
+        for ext in LOGO_EXTENSIONS:
+            path = os.path.join(self.logo_dir, f"{code}{ext}")
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def thumbnail(self, code):
+        """Return the resized logo of ``code`` as a PIL image or ``None``."""
+        source = self.source_path(code)
+        if source is None:
+            return None
+        thumb = os.path.join(self.thumbs_dir, f"{code}.png")
+        try:
+            if os.path.getmtime(thumb) >= os.path.getmtime(source):
+                with Image.open(thumb) as img:
+                    img.load()
+                    return img
+        except OSError:
+            pass
+        try:
+            with Image.open(source) as img:
+                img.thumbnail(self.size)
+                img = img.convert("RGBA")
+        except Exception:
+            return None
+        try:
+            os.makedirs(self.thumbs_dir, exist_ok=True)
+            tmp = f"{thumb}.tmp"
+            img.save(tmp, format="PNG")
+            os.replace(tmp, thumb)
+        except OSError as exc:
+            print(f"[WARN] Cannot cache logo {code}: {exc}")
+        return img
+
+    def get(self, code):
+        if code in self._photos:
+            return self._photos[code]
+        img = self.thumbnail(code)
+        photo = ImageTk.PhotoImage(img) if img is not None else None
+        self._photos[code] = photo
+        return photo
+
+    def clear(self):
+        """Forget decoded logos so new or changed files are picked up."""
+        self._photos.clear()
+
+    def __len__(self):
+        return len(self._photos)
@@ -0,0 +1,130 @@
+import os
+import re
+import shutil
+from functools import lru_cache
+
+from . import symbol_index
+from .lazy import LazyModule
+
+Image = LazyModule("PIL.Image")
+ImageOps = LazyModule("PIL.ImageOps")
+
+try:
+    import pytesseract
+except ImportError:  # pragma: no cover - optional dependency
+    pytesseract = None
+
+OCR_CONFIDENCE = float(os.getenv("OCR_CONFIDENCE", "0.75"))
+
+# card regions as fractions (left, top, right, bottom) of the scan
+NAME_REGION = (0.05, 0.02, 0.72, 0.10)
+NUMBER_REGION = (0.0, 0.88, 1.0, 0.98)
+SYMBOL_REGION = (0.02, 0.88, 0.22, 0.97)
+
+SUFFIXES = {"EX", "GX", "V", "VMAX", "VSTAR"}
+NAME_NOISE = {"BASIC", "STAGE", "STAGE1", "STAGE2", "HP", "EVOLVES", "FROM"}
+NUMBER_RE = re.compile(r"(\d{1,3})\s*/\s*([A-Z]{0,2}\d{1,3})")
+
+
+@lru_cache(maxsize=1)
+def available() -> bool:
+    """Return True when pytesseract and the tesseract binary can be used."""
+    if pytesseract is None:
+        return False
+    cmd = getattr(pytesseract.pytesseract, "tesseract_cmd", "tesseract")
+    return bool(shutil.which(cmd) or os.path.exists(cmd))
+
+
+def crop_region(img, region):
+    w, h = img.size
+    l, t, r, b = region
+    return img.crop((int(l * w), int(t * h), int(r * w), int(b * h)))
+
+
+def _prepare(img):
+    """Grayscale, upscale and stretch contrast for tesseract."""
+    gray = ImageOps.autocontrast(img.convert("L"))
+    return gray.resize((gray.width * 2, gray.height * 2))
+
+
+def _words(img, config):
+    data = pytesseract.image_to_data(
+        _prepare(img), config=config, output_type=pytesseract.Output.DICT
+    )
+    words = []
+    for text, conf in zip(data.get("text", []), data.get("conf", [])):
+        text = str(text).strip()
+        try:
+            conf = float(conf)
+        except (TypeError, ValueError):
+            continue
+        if text and conf >= 0:
+            words.append((text, conf / 100))
+    return words
+
+
+def parse_number(words):
+    """Return ``(number, confidence)`` from OCR words of the bottom strip."""
+    text = " ".join(w for w, _ in words).upper()
+    m = NUMBER_RE.search(text)
+    if not m:
+        return "", 0.0
+    confs = [c for w, c in words if m.group(1) in w or "/" in w]
+    conf = min(confs) if confs else 0.0
+    return str(int(m.group(1))), conf
+
+
+def parse_name(words):
+    """Return ``(name, suffix, confidence)`` from OCR words of the title bar."""
+    parts = []
+    confs = []
+    for word, conf in words:
+        clean = re.sub(r"[^A-Za-zÀ-ž'.-]", "", word)
+        if not clean or clean.upper() in NAME_NOISE:
+            continue
+        parts.append(clean)
+        confs.append(conf)
+    suffix = ""
+    if parts and parts[-1].upper() in SUFFIXES:
+        suffix = parts.pop().upper()
+        confs.pop()
+    if not parts:
+        return "", suffix, 0.0
+    return " ".join(parts), suffix, min(confs)
+
+
+def match_set_symbol(img, logo_dir="set_logos", k=1):
+    """Return ``(code, confidence)`` of the logo closest to ``img``."""
+    matches = symbol_index.get_index(logo_dir).query(img, k)
+    if not matches:
+        return "", 0.0
+    code, dist = matches[0]
+    return code, max(0.0, 1 - dist / (symbol_index.HASH_BITS / 2))
+
+
+def recognize(path, logo_dir="set_logos"):
+    """Recognise name, number and set code of a scan on the CPU.
+
+    The result has the same keys as ``analyze_card_image`` plus ``set_code``
+    and ``confidence`` (the lowest confidence of name and number).
+    """
+    with Image.open(path) as src:
+        img = ImageOps.exif_transpose(src).convert("RGB")
+    result = {"name": "", "number": "", "suffix": "", "set_code": "", "confidence": 0.0}
+    if available():
+        number, number_conf = parse_number(
+            _words(crop_region(img, NUMBER_REGION), "--psm 11")
+        )
+        name, suffix, name_conf = parse_name(
+            _words(crop_region(img, NAME_REGION), "--psm 7")
+        )
+        result.update(
+            name=name,
+            number=number,
+            suffix=suffix,
+            confidence=min(number_conf, name_conf),
+        )
+    code, code_conf = match_set_symbol(crop_region(img, SYMBOL_REGION), logo_dir)
+    if code_conf >= OCR_CONFIDENCE:
+        result["set_code"] = code
+    return result
@@ -0,0 +1,121 @@
+import os
+import threading
+
+from .lazy import LazyModule
+
+Image = LazyModule("PIL.Image")
+ImageFilter = LazyModule("PIL.ImageFilter")
+ImageSequence = LazyModule("PIL.ImageSequence")
+
+SCAN_GIF = os.path.join(os.path.dirname(__file__), "scan.gif")
+BLUR_RADIUS = 2
+DEFAULT_DURATION = 100
+
+_overlays = {}
+_overlays_lock = threading.Lock()
+
+
+def overlay_frames(size, path=SCAN_GIF):
+    """Return the overlay GIF as ``(RGBA frame, duration)`` pairs at ``size``.
+
+    The GIF is decoded once per size and shared by every card.
+    """
+    key = (path, tuple(size))
+    with _overlays_lock:
+        frames = _overlays.get(key)
+        if frames is None:
+            frames = []
+            try:
+                with Image.open(path) as gif:
+                    for frame in ImageSequence.Iterator(gif):
+                        frames.append(
+                            (
+                                frame.convert("RGBA").resize(key[1]),
+                                frame.info.get("duration", DEFAULT_DURATION),
+                            )
+                        )
+            except (OSError, ValueError) as exc:
+                print(f"[WARN] Cannot load scan animation: {exc}")
+            _overlays[key] = frames
+    return frames
+
+
+def compose_frames(card_image, size, path=SCAN_GIF):
+    """Return the overlay frames composited over the blurred ``card_image``."""
+    overlays = overlay_frames(size, path)
+    if not overlays:
+        return []
+    base = (
+        card_image.convert("RGBA")
+        .resize(tuple(size))
+        .filter(ImageFilter.GaussianBlur(radius=BLUR_RADIUS))
+    )
+    return [(Image.alpha_composite(base, overlay), duration) for overlay, duration in overlays]
+
+
+class ScanAnimation:
+    """Scanning overlay played on an image label while a card is recognised.
+
+    The frames are composited in a background thread and handed to the UI
+    thread with ``after``; until they are ready the plain card stays
+    visible, so switching cards never waits for the animation.
+    ``make_image`` turns a PIL image into something the label can show and
+    is only called on the UI thread, once per frame.
+    """
+
+    def __init__(self, label, make_image, path=SCAN_GIF):
+        self.label = label
+        self.make_image = make_image
+        self.path = path
+        self.running = False
+        self._generation = 0
+        self._after_id = None
+        self._frames = []
+
+    def start(self, card_image, size):
+        self.stop()
+        self.running = True
+        generation = self._generation
+
+        def compose():
+            try:
+                frames = compose_frames(card_image, size, self.path)
+            except Exception as exc:
+                print(f"[WARN] Scan animation failed: {exc}")
+                return
+            if frames:
+                try:
+                    self.label.after(0, self._play, generation, frames)
+                except RuntimeError:
+                    pass
+
+        threading.Thread(target=compose, daemon=True).start()
+
+    def _play(self, generation, frames):
+        if not self.running or generation != self._generation:
+            return
+        self._frames = [[image, duration, None] for image, duration in frames]
+        self._show(generation, 0)
+
+    def _show(self, generation, index):
+        if not self.running or generation != self._generation:
+            return
+        frame = self._frames[index]
+        if frame[2] is None:
+            frame[2] = self.make_image(frame[0])
+        self.label.configure(image=frame[2])
+        self._after_id = self.label.after(
+            frame[1], self._show, generation, (index + 1) % len(self._frames)
+        )
+
+    def stop(self):
+        """Stop the animation; frames still being composed are discarded."""
+        self.running = False
+        self._generation += 1
+        self._frames = []
+        if self._after_id is not None:
+            try:
+                self.label.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
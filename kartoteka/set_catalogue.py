@@ -0,0 +1,137 @@
+import os
+import json
+import time
+
+from .lazy import LazyModule
+from .set_search import SetSearchIndex
+
+requests = LazyModule("requests")
+
+SETS_API_URL = "https://api.pokemontcg.io/v2/sets"
+SET_FILES = ("tcg_sets.json", "tcg_sets_jp.json")
+CACHE_DIR = os.getenv("SETS_CACHE_DIR", ".cache")
+SETS_REFRESH_HOURS = float(os.getenv("SETS_REFRESH_HOURS", "24"))
+
+
+def load_set_index(files=SET_FILES):
+    """Return a :class:`SetSearchIndex` over the local set catalogues."""
+    eras = []
+    for path in files:
+        try:
+            with open(path, encoding="utf-8") as f:
+                eras.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return SetSearchIndex.from_eras(*eras)
+
+
+def _cache_path(name):
+    return os.path.join(CACHE_DIR, name)
+
+
+def write_json_atomic(path, data, **kwargs):
+    """Write ``data`` as JSON to a temporary file and rename it over ``path``."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, **kwargs)
+    os.replace(tmp, path)
+
+
+def load_meta() -> dict:
+    try:
+        with open(_cache_path("sets_meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_meta(meta: dict):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    write_json_atomic(_cache_path("sets_meta.json"), meta)
+
+
+def is_due(meta: dict, now=None) -> bool:
+    """Return True when the last check is older than ``SETS_REFRESH_HOURS``."""
+    now = time.time() if now is None else now
+    return now - meta.get("checked_at", 0) >= SETS_REFRESH_HOURS * 3600
+
+
+def fetch_sets(meta: dict):
+    """Fetch the set list unless it is unchanged since the cached response.
+
+    Returns ``(sets, meta)`` where ``sets`` is ``None`` when the server
+    answered ``304 Not Modified``.  Network errors are propagated.
+    """
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    resp = requests.get(SETS_API_URL, headers=headers, timeout=10)
+    meta = dict(meta, checked_at=time.time())
+    if resp.status_code == 304:
+        return None, meta
+    resp.raise_for_status()
+    sets = resp.json().get("data", [])
+    resp_headers = getattr(resp, "headers", None) or {}
+    meta["etag"] = resp_headers.get("ETag", "")
+    meta["last_modified"] = resp_headers.get("Last-Modified", "")
+    return sets, meta
+
+
+def merge_sets(current: dict, remote) -> list:
+    """Add sets from ``remote`` missing in ``current`` grouped by series.
+
+    ``current`` is modified in place; the list of added items is returned.
+    """
+    existing_codes = {
+        s.get("code", "").strip().lower()
+        for sets in current.values()
+        for s in sets
+    }
+    new_items = []
+    for item in remote:
+        series = item.get("series") or "Other"
+        code = item.get("id")
+        name = item.get("name")
+        if not code or not name:
+            continue
+        code_key = code.strip().lower()
+        if code_key in existing_codes:
+            continue
+        current.setdefault(series, []).append({"name": name, "code": code})
+        existing_codes.add(code_key)
+        new_items.append({"name": name, "code": code})
+    return new_items
+
+
+def merge_into_files(remote, files=None) -> list:
+    """Add the sets of ``remote`` missing from the first catalogue of ``files``.
+
+    The API lists the English sets, so the first file decides what is new;
+    the new sets are then added to the other files that exist.  Missing
+    files other than the first, and files that cannot be read, are skipped
+    rather than created or overwritten.  Returns the added sets.
+    """
+    files = files or SET_FILES
+    catalogues = {}
+    for i, path in enumerate(files):
+        try:
+            with open(path, encoding="utf-8") as f:
+                catalogues[path] = json.load(f)
+        except FileNotFoundError:
+            if i == 0:
+                catalogues[path] = {}
+        except (OSError, ValueError) as exc:
+            print(f"[WARN] Cannot read {path}: {exc}")
+    if files[0] not in catalogues:
+        return []
+    new_items = merge_sets(catalogues[files[0]], remote)
+    if not new_items:
+        return []
+    new_codes = {item["code"] for item in new_items}
+    fresh = [item for item in remote if item.get("id") in new_codes]
+    for path, current in catalogues.items():
+        if path == files[0] or merge_sets(current, fresh):
+            write_json_atomic(path, current, indent=2, ensure_ascii=False)
+    return new_items
@@ -0,0 +1,122 @@
+import difflib
+
+GRAM_SIZE = 3
+FUZZY_CUTOFF = 0.6
+RESOLVE_CUTOFF = 0.85
+
+
+def _grams(text, size):
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class SetSearchIndex:
+    """Lookup structure for set names and codes.
+
+    Built once from ``(name, code)`` pairs.  Names and codes are resolved
+    through lowercase dictionaries, substring search goes through an n-gram
+    index (all grams up to three characters) so only names sharing the
+    typed grams are checked, and queries without a substring match fall
+    back to fuzzy matching.
+    """
+
+    def __init__(self, items=()):
+        self.names = []
+        self.codes = []
+        self.by_name = {}
+        self.by_code = {}
+        self._lower = []
+        self._grams = {}
+        for name, code in items:
+            self.add(name, code)
+
+    @classmethod
+    def from_eras(cls, *sets_by_era):
+        return cls(
+            (item["name"], item["code"])
+            for by_era in sets_by_era
+            for sets in by_era.values()
+            for item in sets
+        )
+
+    def add(self, name, code):
+        key = name.strip().lower()
+        pos = len(self.names)
+        self.by_name.setdefault(key, pos)
+        self.by_code.setdefault(code.strip().lower(), pos)
+        self.names.append(name)
+        self.codes.append(code)
+        self._lower.append(key)
+        for size in range(1, GRAM_SIZE + 1):
+            for gram in _grams(key, size):
+                self._grams.setdefault(gram, set()).add(pos)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _candidates(self, query):
+        if len(query) <= GRAM_SIZE:
+            return self._grams.get(query, set())
+        postings = [self._grams.get(g) for g in _grams(query, GRAM_SIZE)]
+        if not all(postings):
+            return set()
+        postings.sort(key=len)
+        found = set(postings[0])
+        for other in postings[1:]:
+            found &= other
+        return {pos for pos in found if query in self._lower[pos]}
+
+    def _rank(self, query, pos):
+        name = self._lower[pos]
+        if name == query:
+            return 0
+        if name.startswith(query):
+            return 1
+        if f" {query}" in name:
+            return 2
+        return 3
+
+    def _fuzzy(self, query, limit):
+        scored = []
+        for pos, name in enumerate(self._lower):
+            # compare against the whole name and against its beginning, so a
+            # mistyped prefix ("prismtic") still finds the full name
+            score = max(
+                difflib.SequenceMatcher(None, query, name).ratio(),
+                difflib.SequenceMatcher(None, query, name[: len(query)]).ratio(),
+            )
+            if score >= FUZZY_CUTOFF:
+                scored.append((-score, pos))
+        scored.sort()
+        return [pos for _score, pos in scored[:limit]]
+
+    def search(self, text, limit=None):
+        """Return set names matching ``text`` with the best matches first.
+
+        Exact names come first, then prefix matches, names with a word
+        starting with ``text`` and other substring matches, each in catalogue
+        order.  When nothing contains ``text`` the closest names are returned.
+        """
+        query = text.strip().lower()
+        if not query:
+            return list(self.names[:limit] if limit else self.names)
+        found = sorted(self._candidates(query), key=lambda p: (self._rank(query, p), p))
+        if not found:
+            found = self._fuzzy(query, limit or len(self.names))
+        if limit:
+            found = found[:limit]
+        return [self.names[pos] for pos in found]
+
+    def code(self, text, fuzzy=True):
+        """Return the code for a set name or code, or ``None``."""
+        key = text.strip().lower()
+        pos = self.by_name.get(key, self.by_code.get(key))
+        if pos is None and fuzzy and key:
+            close = difflib.get_close_matches(key, self._lower, n=1, cutoff=RESOLVE_CUTOFF)
+            if close:
+                pos = self.by_name[close[0]]
+        return None if pos is None else self.codes[pos]
+
+    def name(self, code):
+        """Return the set name for ``code`` or ``None``."""
+        pos = self.by_code.get(code.strip().lower())
+        return None if pos is None else self.names[pos]
@@ -0,0 +1,119 @@
+import os
+import re
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .lazy import LazyModule
+
+requests = LazyModule("requests")
+
+SYMBOL_URL = "https://images.pokemontcg.io/{code}/symbol.png"
+META_FILE = ".symbols_meta.json"
+SYMBOL_WORKERS = int(os.getenv("SYMBOL_WORKERS", "8"))
+
+
+def make_session(pool_size: int = SYMBOL_WORKERS):
+    """Return a session whose connection pool fits ``pool_size`` workers."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def load_meta(dest: str) -> dict:
+    try:
+        with open(os.path.join(dest, META_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_meta(dest: str, meta: dict):
+    path = os.path.join(dest, META_FILE)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, path)
+
+
+def download_symbol(session, code: str, dest: str, cached=None):
+    """Download the symbol of ``code`` into ``dest``.
+
+    ``cached`` is the metadata stored for the previous download; when the
+    file still exists its ``ETag``/``Last-Modified`` are sent so an unchanged
+    symbol costs a single ``304`` response.  Returns ``(status, meta)`` where
+    status is ``saved``, ``unchanged``, ``missing`` or ``error``.
+    """
+    safe = code.replace("/", "_")
+    headers = {}
+    if cached and os.path.exists(os.path.join(dest, cached.get("file", ""))):
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    url = SYMBOL_URL.format(code=code)
+    res = session.get(url, headers=headers, timeout=10)
+    if res.status_code == 404:
+        alt = re.sub(r"(^sv)0(\d$)", r"\1\2", code)
+        if alt != code:
+            url = SYMBOL_URL.format(code=alt)
+            res = session.get(url, headers=headers, timeout=10)
+    if res.status_code == 304:
+        return "unchanged", cached
+    if res.status_code == 404:
+        print(f"[WARN] Symbol not found for {code}: {url}")
+        return "missing", None
+    if res.status_code != 200:
+        print(f"[ERROR] Failed to download symbol for {code} from {url}: {res.status_code}")
+        return "error", None
+
+    file = f"{safe}.png"
+    path = os.path.join(dest, file)
+    tmp = f"{path}.part"
+    with open(tmp, "wb") as fh:
+        fh.write(res.content)
+    os.replace(tmp, path)
+    return "saved", {
+        "file": file,
+        "etag": res.headers.get("ETag", ""),
+        "last_modified": res.headers.get("Last-Modified", ""),
+    }
+
+
+def download_symbols(sets, dest="set_logos", workers=SYMBOL_WORKERS, progress_queue=None, session=None):
+    """Download symbols for ``sets`` (dicts with ``name`` and ``code``).
+
+    At most ``workers`` requests run at the same time over one pooled
+    session.  After every finished set ``(done, total, name)`` is put on
+    ``progress_queue`` when given.  Returns a count of each status.
+    """
+    os.makedirs(dest, exist_ok=True)
+    items = [item for item in sets if item.get("code")]
+    meta = load_meta(dest)
+    previous = dict(meta)
+    session = session or make_session(workers)
+    summary = {"saved": 0, "unchanged": 0, "missing": 0, "error": 0}
+
+    def work(item):
+        code = item["code"]
+        try:
+            return item, download_symbol(session, code, dest, previous.get(code))
+        except requests.RequestException as exc:
+            print(f"[ERROR] {item.get('name')}: {exc}")
+            return item, ("error", None)
+
+    total = len(items)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(work, item) for item in items]
+        for done, future in enumerate(as_completed(futures), start=1):
+            item, (status, entry) = future.result()
+            summary[status] += 1
+            if entry:
+                meta[item["code"]] = entry
+            if progress_queue is not None:
+                progress_queue.put((done, total, item.get("name") or item["code"]))
+
+    save_meta(dest, meta)
+    return summary
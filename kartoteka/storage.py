@@ -16,6 +16,17 @@ def generate_location(idx):
     return f"K{box:02d}R{column}P{pos:04d}"
 
 
+def location_index(code: str):
+    """Return the slot index of a warehouse code or ``None`` when invalid."""
+    match = re.fullmatch(r"K(\d+)R(\d)P(\d+)", (code or "").strip().upper())
+    if not match:
+        return None
+    box, column, pos = map(int, match.groups())
+    if box < 1 or not 1 <= column <= 4 or not 1 <= pos <= 1000:
+        return None
+    return (box - 1) * 4000 + (column - 1) * 1000 + (pos - 1)
+
+
 def next_free_location(app):
     used = set()
     pattern = re.compile(r"K(\d+)R(\d)P(\d+)")
@@ -0,0 +1,152 @@
+import os
+import json
+import heapq
+
+from .lazy import LazyModule
+
+Image = LazyModule("PIL.Image")
+
+INDEX_FILE = ".symbol_index.json"
+LOGO_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif")
+HASH_BITS = 128
+
+_indexes = {}
+
+
+def _flatten(img):
+    """Return ``img`` as RGB with transparency replaced by white."""
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        bg = Image.new("RGBA", img.size, "white")
+        img = Image.alpha_composite(bg, img)
+    return img.convert("RGB")
+
+
+def symbol_hash(img, size=8):
+    """Return a 128-bit perceptual hash (difference + average hash) of ``img``."""
+    gray = _flatten(img).convert("L")
+    diff = gray.resize((size + 1, size)).tobytes()
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            pos = row * (size + 1) + col
+            value = (value << 1) | (diff[pos] > diff[pos + 1])
+    avg = gray.resize((size, size)).tobytes()
+    mean = sum(avg) / len(avg)
+    for pixel in avg:
+        value = (value << 1) | (pixel > mean)
+    return value
+
+
+class SymbolIndex:
+    """Perceptual hash index over the set logos in ``logo_dir``.
+
+    The hashes are stored in ``<logo_dir>/.symbol_index.json`` together with
+    the size and modification time of every logo, so only new or changed
+    files are decoded when the index is refreshed.
+    """
+
+    def __init__(self, logo_dir):
+        self.logo_dir = logo_dir
+        self.path = os.path.join(logo_dir, INDEX_FILE)
+        self.entries = {}
+        self.dir_mtime = None
+        self._codes = []
+        self._hashes = []
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.entries = {
+                code: dict(entry, hash=int(entry["hash"], 16))
+                for code, entry in data.items()
+            }
+        except (OSError, ValueError, KeyError):
+            self.entries = {}
+        self._rebuild_arrays()
+        return self
+
+    def save(self):
+        data = {
+            code: dict(entry, hash=f"{entry['hash']:032x}")
+            for code, entry in self.entries.items()
+        }
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def _rebuild_arrays(self):
+        self._codes = list(self.entries)
+        self._hashes = [self.entries[c]["hash"] for c in self._codes]
+
+    def refresh(self) -> bool:
+        """Hash new or modified logos and drop deleted ones.
+
+        Returns True when the index changed.
+        """
+        if not os.path.isdir(self.logo_dir):
+            return False
+        seen = set()
+        changed = False
+        for file in os.listdir(self.logo_dir):
+            if not file.lower().endswith(LOGO_EXTENSIONS):
+                continue
+            path = os.path.join(self.logo_dir, file)
+            code = os.path.splitext(file)[0]
+            stat = os.stat(path)
+            seen.add(code)
+            entry = self.entries.get(code)
+            if (
+                entry
+                and entry.get("file") == file
+                and entry.get("mtime") == stat.st_mtime
+                and entry.get("size") == stat.st_size
+            ):
+                continue
+            try:
+                with Image.open(path) as img:
+                    value = symbol_hash(img)
+            except Exception:
+                continue
+            self.entries[code] = {
+                "file": file,
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "hash": value,
+            }
+            changed = True
+        for code in set(self.entries) - seen:
+            del self.entries[code]
+            changed = True
+        if changed:
+            self._rebuild_arrays()
+            self.save()
+        self.dir_mtime = os.path.getmtime(self.logo_dir)
+        return changed
+
+    def query(self, img, k=3):
+        """Return up to ``k`` ``(code, distance)`` pairs closest to ``img``.
+
+        ``img`` may be a PIL image or a precomputed hash.
+        """
+        target = img if isinstance(img, int) else symbol_hash(img)
+        return heapq.nsmallest(
+            k,
+            ((code, (target ^ value).bit_count()) for code, value in zip(self._codes, self._hashes)),
+            key=lambda item: item[1],
+        )
+
+    def __len__(self):
+        return len(self._codes)
+
+
+def get_index(logo_dir) -> SymbolIndex:
+    """Return the shared index for ``logo_dir``, refreshed when the folder changes."""
+    index = _indexes.get(logo_dir)
+    if index is None:
+        index = _indexes[logo_dir] = SymbolIndex(logo_dir).load()
+    if os.path.isdir(logo_dir) and os.path.getmtime(logo_dir) != index.dir_mtime:
+        index.refresh()
+    return index
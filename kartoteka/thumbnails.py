@@ -0,0 +1,69 @@
+import hashlib
+import os
+
+from .lazy import LazyModule
+
+Image = LazyModule("PIL.Image")
+ImageOps = LazyModule("PIL.ImageOps")
+
+THUMBNAIL_CACHE_DIR = os.getenv("THUMBNAIL_CACHE_DIR", os.path.join(".cache", "thumbs"))
+CARD_SIZE = (400, 560)
+# EXIF orientations that swap width and height
+_ROTATED = {5, 6, 7, 8}
+
+
+def scaled(source, size):
+    """Return the image at ``source`` (a path or file) reduced to fit ``size``.
+
+    JPEG files are decoded at the smallest DCT scale that still covers
+    ``size`` instead of at full resolution; the EXIF orientation is applied.
+    """
+    with Image.open(source) as img:
+        if img.format == "JPEG":
+            w, h = size
+            try:
+                orientation = img.getexif().get(0x0112)
+            except Exception:
+                orientation = None
+            if orientation in _ROTATED:
+                w, h = h, w
+            img.draft("RGB", (w, h))
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail(size)
+        return img.convert("RGB")
+
+
+def cache_path(path, size, cache_dir=None):
+    """Return the cache file for ``path`` at ``size``; it changes with the mtime."""
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{size[0]}x{size[1]}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir or THUMBNAIL_CACHE_DIR, f"{digest}.jpg")
+
+
+def load(path, size=CARD_SIZE, cache_dir=None):
+    """Return a thumbnail of the scan at ``path``, using the disk cache.
+
+    The first call decodes the scan with :func:`scaled` and stores the result;
+    later calls for the same file, size and modification time only read the
+    small cached copy.
+    """
+    try:
+        cached = cache_path(path, size, cache_dir)
+    except OSError:
+        return scaled(path, size)
+    try:
+        with Image.open(cached) as img:
+            img.load()
+            return img
+    except OSError:
+        pass
+    img = scaled(path, size)
+    try:
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        tmp = f"{cached}.tmp"
+        img.save(tmp, format="JPEG", quality=90)
+        os.replace(tmp, cached)
+    except OSError as exc:
+        print(f"[WARN] Cannot cache thumbnail of {path}: {exc}")
+    return img
@@ -1,36 +1,60 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog
-import customtkinter as ctk
 import tkinter.ttk as ttk
-from PIL import Image, ImageTk, ImageFilter
 import os
 import csv
 import json
-import requests
-import openai
 import re
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-import unicodedata
-from itertools import combinations
-import html
+import sqlite3
 import sys
-
-from shoper_client import ShoperClient
+
 from ftp_client import FTPClient
-from . import csv_utils, storage
+from . import (
+    cheat_sheet,
+    csv_utils,
+    derivatives,
+    hot_folder,
+    logo_cache,
+    scan_animation,
+    set_catalogue,
+    set_search,
+    set_symbols,
+    storage,
+    symbol_index,
+    thumbnails,
+)
+from .core import catalogue, export, journal, pricing, recognition, registry
+from .core.orders import choose_nearest_locations
+from .core.pricing import (
+    HOLO_REVERSE_MULTIPLIER,
+    MASTERBALL_MULTIPLIER,
+    POKEBALL_MULTIPLIER,
+    PRICE_MULTIPLIER,
+    extract_cardmarket_price,
+    normalize,
+)
+from .core.recognition import RECOGNITION_WIDTH
+from .core.session import load_review, store_card
+from .lazy import LazyModule
 import threading
-import webbrowser
-from urllib.parse import urlencode, urlparse
-import io
-
+import queue
+import time
+import webbrowser
+from urllib.parse import urlencode
+import io
+
 load_dotenv()
 
 BASE_IMAGE_URL = os.getenv("BASE_IMAGE_URL", "https://sklep839679.shoparena.pl/upload/images")
-
-RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
-RAPIDAPI_HOST = os.getenv("RAPIDAPI_HOST")
-
+# "remote" sends public URLs of uploaded scans, "local" sends inline crops
+RECOGNITION_SOURCE = os.getenv("RECOGNITION_SOURCE", "remote").strip().lower()
+
+RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
+RAPIDAPI_HOST = os.getenv("RAPIDAPI_HOST")
+
 SHOPER_API_URL = os.getenv("SHOPER_API_URL", "").strip()
 SHOPER_API_TOKEN = os.getenv("SHOPER_API_TOKEN", "").strip()
 FTP_HOST = os.getenv("FTP_HOST")
@@ -38,14 +62,16 @@ FTP_USER = os.getenv("FTP_USER")
 FTP_PASSWORD = os.getenv("FTP_PASSWORD")
 SHOPER_DELIVERY_ID = int(os.getenv("SHOPER_DELIVERY_ID", "1"))
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if OPENAI_API_KEY:
-    openai.api_key = OPENAI_API_KEY
-
-PRICE_DB_PATH = "card_prices.csv"
-PRICE_MULTIPLIER = 1.23
-HOLO_REVERSE_MULTIPLIER = 3.5
-POKEBALL_MULTIPLIER = 5
-MASTERBALL_MULTIPLIER = 10
+
+# heavy dependencies are imported on first use to keep startup fast
+ctk = LazyModule("customtkinter")
+Image = LazyModule("PIL.Image")
+ImageTk = LazyModule("PIL.ImageTk")
+ImageOps = LazyModule("PIL.ImageOps")
+requests = LazyModule("requests")
+openai = recognition.openai
+
+PRICE_DB_PATH = "card_prices.csv"
 SET_LOGO_DIR = "set_logos"
 
 # custom theme colors in grayscale
@@ -57,35 +83,25 @@ BORDER_COLOR = "#444444"
 
 
 
-def normalize(text: str, keep_spaces: bool = False) -> str:
-    """Normalize text for comparisons and API queries."""
-    if not text:
-        return ""
-    text = unicodedata.normalize("NFKD", text)
-    text = text.lower()
-    for suffix in [
-        " ex",
-        " gx",
-        " v",
-        " vmax",
-        " vstar",
-        " shiny",
-        " promo",
-    ]:
-        text = text.replace(suffix, "")
-    text = text.replace("-", "")
-    if not keep_spaces:
-        text = text.replace(" ", "")
-    return text.strip()
-
-
-
-
 # Wczytanie danych setów
+SET_GLOBALS = (
+    "tcg_sets_eng_by_era",
+    "tcg_sets_eng_map",
+    "tcg_sets_eng",
+    "tcg_sets_jp_by_era",
+    "tcg_sets_jp_map",
+    "tcg_sets_jp",
+    "set_index",
+    "set_indexes",
+)
+_sets_loaded = False
+
+
 def reload_sets():
     """Load set definitions from the JSON files."""
     global tcg_sets_eng_by_era, tcg_sets_eng_map, tcg_sets_eng
     global tcg_sets_jp_by_era, tcg_sets_jp_map, tcg_sets_jp
+    global set_index, set_indexes, _sets_loaded
 
     try:
         with open("tcg_sets.json", encoding="utf-8") as f:
@@ -115,217 +131,129 @@ def reload_sets():
         item["name"] for sets in tcg_sets_jp_by_era.values() for item in sets
     ]
 
+    # search indexes used by autocomplete and name/code resolution
+    set_indexes = {
+        "ENG": set_search.SetSearchIndex.from_eras(tcg_sets_eng_by_era),
+        "JP": set_search.SetSearchIndex.from_eras(tcg_sets_jp_by_era),
+    }
+    set_index = set_search.SetSearchIndex.from_eras(
+        tcg_sets_eng_by_era, tcg_sets_jp_by_era
+    )
+    _sets_loaded = True
 
-reload_sets()
 
+def ensure_sets():
+    """Load the set catalogue unless it has been loaded already."""
+    if not _sets_loaded:
+        reload_sets()
 
 
+def __getattr__(name):
+    # the set catalogue is read on first access instead of at import
+    if name in SET_GLOBALS:
+        ensure_sets()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-def get_set_code(name: str) -> str:
-    """Return the API code for a set name if available."""
-    if not name:
-        return ""
-    search = name.strip().lower()
-    for mapping in (tcg_sets_eng_map, tcg_sets_jp_map):
-        for key, code in mapping.items():
-            if key.lower() == search:
-                return code
-    return name
 
 
-def choose_nearest_locations(order_list, output_data):
-    """Assign the nearest warehouse codes to order items.
+def get_set_code(name: str) -> str:
+    """Return the API code for a set name if available.
 
-    The function modifies the provided ``order_list`` in place, attaching a
-    ``warehouse_code`` to each product when possible.  When multiple codes are
-    available for the same ``product_code`` the combination with the smallest
-    total Manhattan distance is chosen.
+    Set codes, e.g. returned by the symbol index, are accepted as well.  The
+    name must match exactly; an unknown name is returned unchanged rather
+    than resolved to a similar set.
     """
+    if not name:
+        return ""
+    ensure_sets()
+    return set_index.code(name, fuzzy=False) or name
 
-    pattern = re.compile(r"K(\d+)R(\d)P(\d+)")
-    available = defaultdict(list)
-
-    # Collect available locations grouped by product_code
-    for row in output_data:
-        if not row:
-            continue
-        prod = str(row.get("product_code", ""))
-        codes = str(row.get("warehouse_code") or "").split(";")
-        for code in codes:
-            code = code.strip()
-            m = pattern.match(code)
-            if not m:
-                continue
-            box, col, pos = map(int, m.groups())
-            available[prod].append(((box, col, pos), code))
-
-    def manhattan(a, b):
-        return abs(a[0] - b[0]) + abs(a[1] - b[1]) + abs(a[2] - b[2])
-
-    def best_codes(options, qty):
-        if qty <= 1:
-            return [options[0][1]]
-
-        best = None
-        best_cost = None
-        for combo in combinations(options, min(qty, len(options))):
-            coords = [c[0] for c in combo]
-            cost = 0
-            for i in range(len(coords)):
-                for j in range(i + 1, len(coords)):
-                    cost += manhattan(coords[i], coords[j])
-            if best_cost is None or cost < best_cost:
-                best_cost = cost
-                best = [c[1] for c in combo]
-        return best or []
-
-    for order in order_list:
-        for item in order.get("products", []):
-            prod = str(item.get("product_code") or item.get("code") or "")
-            qty = int(item.get("quantity", 1))
-            options = available.get(prod)
-            if not options:
-                continue
-            options.sort(key=lambda x: x[1])
-            chosen = best_codes(options, qty)
-            # remove used ones
-            remaining = [o for o in options if o[1] not in chosen]
-            available[prod] = remaining
-            if chosen:
-                item["warehouse_code"] = ";".join(chosen)
 
-    return order_list
+def post_status(app, message):
+    """Queue a status message for the loading screen from any thread."""
+    progress_queue = getattr(app, "progress_queue", None)
+    if progress_queue is not None:
+        progress_queue.put(message)
 
 
-def extract_cardmarket_price(card):
-    """Return the best available Cardmarket price for a card.
+def get_pricing(app):
+    """Return the pricing service of ``app``, creating it on first use."""
+    service = getattr(app, "pricing", None)
+    if service is None:
+        service = app.pricing = pricing.PricingService(
+            getattr(app, "price_db", []),
+            RAPIDAPI_KEY,
+            RAPIDAPI_HOST,
+            resolve_set_code=get_set_code,
+        )
+    return service
 
-    The function checks multiple possible fields in the ``cardmarket`` price
-    section and returns the first non-zero value.  If none of the fields are
-    present or they evaluate to zero, ``None`` is returned.
-    """
 
-    cardmarket = card.get("prices", {}).get("cardmarket", {}) or {}
-    for field in ["30d_average", "trendPrice", "trend_price", "lowest_near_mint"]:
-        price = cardmarket.get(field)
-        try:
-            value = float(price)
-        except (TypeError, ValueError):
-            continue
-        if value:
-            print(f"[DEBUG] Using Cardmarket field '{field}' with value {value}")
-            return value
-    return None
+def get_set_name(code: str) -> str:
+    """Return the set name for an API code or an empty string."""
+    if not code:
+        return ""
+    ensure_sets()
+    return set_index.name(code) or ""
 
 
 def translate_to_english(text: str) -> str:
     """Return an English translation of ``text`` using OpenAI."""
-    if not OPENAI_API_KEY:
-        return text
+    return recognition.translate_to_english(text, OPENAI_API_KEY)
 
-    try:
-        resp = openai.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": f"Translate to English: {text}"}],
-            max_tokens=50,
-        )
-        return resp.choices[0].message.content.strip()
-    except Exception:
-        return text
 
+def encode_card_regions(path: str) -> str:
+    """Return a base64 data URL with the name and number strips of a scan."""
+    return recognition.encode_card_regions(path, RECOGNITION_WIDTH)
 
-def analyze_card_image(path: str, translate_name: bool = False):
-    """Return card details recognized from the image using OpenAI."""
-    if not OPENAI_API_KEY:
-        return {"name": "", "number": "", "suffix": ""}
 
-    parsed = urlparse(path)
-    if parsed.scheme in ("http", "https"):
-        url = path
-    else:
-        folder = os.path.basename(os.path.dirname(path))
-        filename = os.path.basename(path)
-        url = f"{BASE_IMAGE_URL}/{folder}/{filename}"
+def analyze_card_image(path: str, translate_name: bool = False, source=None):
+    """Return card details recognized from the image using OpenAI.
 
-    try:
-        resp = openai.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": (
-                                "Extract Pokemon card name, number and suffix (EX, GX, V, VMAX, VSTAR, Shiny, Promo) as JSON {\"name\":\"\",\"number\":\"\",\"suffix\":\"\"}. Return empty suffix when not applicable."
-                            ),
-                        },
-                        {"type": "image_url", "image_url": {"url": url}},
-                    ],
-                }
-            ],
-            max_tokens=80,
-        )
-        content = resp.choices[0].message.content
-        try:
-            data = json.loads(content)
-        except json.JSONDecodeError:
-            data = None
-
-        if data is None:
-            # Remove Markdown code fences if present
-            text = content.strip()
-            if text.startswith("```"):
-                lines = text.splitlines()
-                if len(lines) >= 2 and lines[0].startswith("```") and lines[-1].startswith("```"):
-                    text = "\n".join(lines[1:-1]).strip()
-            try:
-                data = json.loads(text)
-            except json.JSONDecodeError as e:
-                print(f"[ERROR] analyze_card_image failed to decode JSON: {content!r} - {e}")
-                return {"name": "", "number": "", "suffix": ""}
-
-        number = data.get("number", "")
-        if isinstance(number, str):
-            m = re.match(r"\D*(\d+)", number)
-            if m:
-                data["number"] = str(int(m.group(1)))
-
-        name = data.get("name", "")
-        suffix = data.get("suffix", "").upper() if isinstance(data.get("suffix"), str) else ""
-        if isinstance(name, str) and not suffix:
-            parts = name.split()
-            if parts and parts[-1].upper() in {"EX", "GX", "V", "VMAX", "VSTAR", "SHINY", "PROMO"}:
-                suffix = parts[-1].upper()
-                name = " ".join(parts[:-1])
-        if translate_name and isinstance(name, str) and not name.isascii():
-            name = translate_to_english(name)
-        data["name"] = name
-        data["suffix"] = suffix
-        return data
-    except Exception as e:
-        print(f"[ERROR] analyze_card_image failed: {e}")
-        return {"name": "", "number": "", "suffix": ""}
-
-
-class CardEditorApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("KARTOTEKA")
-        # improve default font for all widgets
+    See :func:`kartoteka.core.recognition.analyze_card_image`; the API key,
+    ``BASE_IMAGE_URL`` and, unless ``source`` is given, ``RECOGNITION_SOURCE``
+    come from the environment.
+    """
+    return recognition.analyze_card_image(
+        path,
+        api_key=OPENAI_API_KEY,
+        source=source or RECOGNITION_SOURCE,
+        base_url=BASE_IMAGE_URL,
+        translate_name=translate_name,
+    )
+
+
+class CardEditorApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("KARTOTEKA")
+        # improve default font for all widgets
         self.root.configure(bg=BG_COLOR, fg_color=BG_COLOR)
         self.root.option_add("*Font", ("Segoe UI", 12))
         self.root.option_add("*Foreground", TEXT_COLOR)
-        self.index = 0
-        self.cards = []
-        self.image_objects = []
-        self.output_data = []
-        self.card_counts = defaultdict(int)
+        self.index = 0
+        self.cards = []
+        self.image_objects = []
+        self.output_data = []
+        self.card_counts = defaultdict(int)
         self.card_cache = {}
         self.file_to_key = {}
         self.product_code_map = {}
         self.next_product_code = 1
+        try:
+            self.product_registry = registry.ProductRegistry()
+        except sqlite3.Error as e:
+            print(f"[WARN] Product registry unavailable: {e}")
+            self.product_registry = None
+        try:
+            self.card_catalogue = catalogue.CardCatalogue()
+        except sqlite3.Error as e:
+            print(f"[WARN] Card catalogue unavailable: {e}")
+            self.card_catalogue = None
         self.price_db = self.load_price_db()
+        self.pricing = get_pricing(self)
         self.folder_name = ""
         self.folder_path = ""
         self.sets_file = "tcg_sets.json"
@@ -334,6 +262,7 @@ class CardEditorApp:
         self.start_col_var = tk.StringVar(value="1")
         self.start_pos_var = tk.StringVar(value="1")
         self.scan_folder_var = tk.StringVar()
+        self.watch_folder_var = tk.BooleanVar(value=False)
         self.starting_idx = 0
         self.start_frame = None
         self.shoper_frame = None
@@ -344,36 +273,43 @@ class CardEditorApp:
         self.mag_box_photo = None
         self.log_widget = None
         self.cheat_frame = None
-        self.set_logos = {}
-        self.loading_frame = None
-        self.loading_label = None
+        self.set_logos = logo_cache.LogoCache(SET_LOGO_DIR)
+        self.progress_queue = queue.Queue()
         self.price_pool_total = 0.0
         self.pool_total_label = None
         self.in_scan = False
-        self.show_loading_screen()
+        self.startup_started = time.perf_counter()
+        # status bar for background jobs, packed first so it stays at the bottom
+        self.status_label = ctk.CTkLabel(
+            self.root, text="", text_color="#CCCCCC", font=("Segoe UI", 10)
+        )
+        self.status_label.pack(side="bottom", fill="x")
+        # build the UI from local data, then synchronise sets in the background
+        self.finish_startup()
+        self.poll_progress_queue()
         threading.Thread(target=self.startup_tasks, daemon=True).start()
-
-    def setup_welcome_screen(self):
-        """Display a simple welcome screen before loading scans."""
-        # Allow resizing but provide a sensible minimum size
-        self.root.minsize(1000, 700)
+
+    def setup_welcome_screen(self):
+        """Display a simple welcome screen before loading scans."""
+        # Allow resizing but provide a sensible minimum size
+        self.root.minsize(1000, 700)
         self.start_frame = ctk.CTkFrame(
             self.root, fg_color=BG_COLOR, corner_radius=10
         )
-        self.start_frame.pack(expand=True, fill="both")
-
+        self.start_frame.pack(expand=True, fill="both")
+
         logo_path = os.path.join(os.path.dirname(__file__), "banner22.png")
-        if os.path.exists(logo_path):
-            logo_img = Image.open(logo_path)
-            logo_img.thumbnail((140, 140))
-            self.logo_photo = ImageTk.PhotoImage(logo_img)
+        if os.path.exists(logo_path):
+            logo_img = Image.open(logo_path)
+            logo_img.thumbnail((140, 140))
+            self.logo_photo = ImageTk.PhotoImage(logo_img)
             logo_label = tk.Label(
                 self.start_frame,
                 image=self.logo_photo,
                 bg=self.root.cget("background"),
             )
-            logo_label.pack(pady=(10, 10))
-
+            logo_label.pack(pady=(10, 10))
+
         greeting = ctk.CTkLabel(
             self.start_frame,
             text="Witaj w aplikacji KARTOTEKA",
@@ -402,13 +338,13 @@ class CardEditorApp:
             text_color="#CCCCCC",
         )
         author.pack(side="bottom", pady=5)
-
+
         button_frame = tk.Frame(
             self.start_frame, bg=self.root.cget("background")
         )
-        # Keep the buttons centered without stretching across the entire window
+        # Keep the buttons centered without stretching across the entire window
         button_frame.pack(pady=10)
-
+
         scan_btn = self.create_button(
             button_frame,
             text="\U0001f50d Skanuj",
@@ -442,17 +378,17 @@ class CardEditorApp:
         ).pack(side="left", padx=5)
 
 
-
-        # Display store statistics when Shoper credentials are available
+
+        # Display store statistics when Shoper credentials are available
         stats_frame = tk.Frame(
             self.start_frame, bg=self.root.cget("background")
         )
-        # Keep the dashboard centered within the window
-        stats_frame.pack(pady=10, anchor="center")
-        stats_frame.grid_anchor("center")
-        for i in range(3):
-            stats_frame.columnconfigure(i, weight=1)
-
+        # Keep the dashboard centered within the window
+        stats_frame.pack(pady=10, anchor="center")
+        stats_frame.grid_anchor("center")
+        for i in range(3):
+            stats_frame.columnconfigure(i, weight=1)
+
         self.dashboard_stats = {}
 
         stats = self.load_store_stats()
@@ -469,73 +405,73 @@ class CardEditorApp:
             "Średnia wartość": "avg_order_value",
             "Aktywne karty": "active_cards",
         }
-
-        stats_map = [
-            (
-                "Nowe dzisiaj",
-                stats.get("new_orders_today", 0),
-                "🆕",
-                "Liczba nowych zamówień dzisiaj",
-                None,
-            ),
-            (
-                "Oczekujące wysyłki",
-                stats.get("pending_shipments", 0),
-                "📦",
-                "Zamówienia gotowe do wysyłki",
-                progress_ship,
-            ),
-            (
-                "Oczekujące płatności",
-                stats.get("pending_payments", 0),
-                "💸",
-                "Zamówienia bez opłaty",
-                None,
-            ),
-            (
-                "Otwarte zwroty",
-                stats.get("open_returns", 0),
-                "↩️",
-                "Zwroty w toku",
-                None,
-            ),
-            (
-                "Sprzedaż dzisiaj",
-                stats.get("sales_today", 0),
-                "💰",
-                "Łączna dzisiejsza sprzedaż",
-                None,
-            ),
-            (
-                "Sprzedaż tydzień",
-                stats.get("sales_week", 0),
-                "📈",
-                "Łączna sprzedaż z ostatniego tygodnia",
-                None,
-            ),
-            (
-                "Sprzedaż miesiąc",
-                stats.get("sales_month", 0),
-                "📊",
-                "Łączna sprzedaż z miesiąca",
-                None,
-            ),
-            (
-                "Średnia wartość",
-                stats.get("avg_order_value", 0),
-                "💵",
-                "Średnia wartość zamówienia",
-                None,
-            ),
-            (
-                "Aktywne karty",
-                stats.get("active_cards", 0),
-                "🃏",
-                "Produkty aktywne w sklepie",
-                None,
-            ),
-        ]
-
+
+        stats_map = [
+            (
+                "Nowe dzisiaj",
+                stats.get("new_orders_today", 0),
+                "🆕",
+                "Liczba nowych zamówień dzisiaj",
+                None,
+            ),
+            (
+                "Oczekujące wysyłki",
+                stats.get("pending_shipments", 0),
+                "📦",
+                "Zamówienia gotowe do wysyłki",
+                progress_ship,
+            ),
+            (
+                "Oczekujące płatności",
+                stats.get("pending_payments", 0),
+                "💸",
+                "Zamówienia bez opłaty",
+                None,
+            ),
+            (
+                "Otwarte zwroty",
+                stats.get("open_returns", 0),
+                "↩️",
+                "Zwroty w toku",
+                None,
+            ),
+            (
+                "Sprzedaż dzisiaj",
+                stats.get("sales_today", 0),
+                "💰",
+                "Łączna dzisiejsza sprzedaż",
+                None,
+            ),
+            (
+                "Sprzedaż tydzień",
+                stats.get("sales_week", 0),
+                "📈",
+                "Łączna sprzedaż z ostatniego tygodnia",
+                None,
+            ),
+            (
+                "Sprzedaż miesiąc",
+                stats.get("sales_month", 0),
+                "📊",
+                "Łączna sprzedaż z miesiąca",
+                None,
+            ),
+            (
+                "Średnia wartość",
+                stats.get("avg_order_value", 0),
+                "💵",
+                "Średnia wartość zamówienia",
+                None,
+            ),
+            (
+                "Aktywne karty",
+                stats.get("active_cards", 0),
+                "🃏",
+                "Produkty aktywne w sklepie",
+                None,
+            ),
+        ]
+
         # Generate subtle variations of the background color so that the
         # white text on the dashboard cards remains readable while the
         # overall theme stays consistent.
@@ -550,12 +486,12 @@ class CardEditorApp:
             return f"#{r:02x}{g:02x}{b:02x}"
 
         colors = [lighten(BG_COLOR, 0.08 + 0.02 * i) for i in range(9)]
-
-        # Ensure rows expand evenly when the window is resized
-        rows = (len(stats_map) + 2) // 3
-        for r in range(rows):
-            stats_frame.rowconfigure(r, weight=1)
-
+
+        # Ensure rows expand evenly when the window is resized
+        rows = (len(stats_map) + 2) // 3
+        for r in range(rows):
+            stats_frame.rowconfigure(r, weight=1)
+
         for i, (label, value, icon, info, prog) in enumerate(stats_map):
             row = i // 3
             col = i % 3
@@ -570,7 +506,7 @@ class CardEditorApp:
             )
             self.dashboard_stats[key_map.get(label, label)] = var
             card.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
-
+
         self.create_button(
             stats_frame,
             text="Pokaż szczegóły",
@@ -582,7 +518,7 @@ class CardEditorApp:
             text="Odśwież statystyki",
             command=self.refresh_store_stats,
         ).grid(row=len(stats_map) // 3 + 2, column=0, columnspan=3, pady=5)
-
+
     def placeholder_btn(self, text: str, master=None):
         if master is None:
             master = self.start_frame
@@ -648,6 +584,12 @@ class CardEditorApp:
         ctk.CTkEntry(folder_frame, textvariable=self.scan_folder_var, width=200).grid(row=0, column=1, padx=5)
         self.create_button(folder_frame, text="Wybierz", command=self.select_scan_folder).grid(row=0, column=2, padx=5)
 
+        ctk.CTkCheckBox(
+            frame,
+            text="Obserwuj folder (dodawaj nowe skany)",
+            variable=self.watch_folder_var,
+        ).pack(pady=5)
+
         self.create_button(frame, text="Dalej", command=self.start_browse_scans).pack(pady=5)
 
     def select_scan_folder(self):
@@ -666,7 +608,7 @@ class CardEditorApp:
             corner_radius=10,
             **kwargs,
         )
-
+
     def create_stat_card(self, parent, title, value, icon, color, info, progress=None):
         """Create a dashboard card with optional progress bar."""
         frame = tk.Frame(parent, width=200, height=100, bg=color, bd=1, relief="ridge")
@@ -685,17 +627,17 @@ class CardEditorApp:
             bar.pack(fill="x", padx=5, pady=(0, 5))
         # Tooltip removed for cleaner display
         return frame, var
-
+
     def load_store_stats(self):
         """Retrieve various store statistics from Shoper.
 
         Numeric fields returned by the API are converted to integers when
         possible so they can be used safely in calculations.
         """
-        if not self.shoper_client:
-            return {}
-        from datetime import date
-
+        if not self.shoper_client:
+            return {}
+        from datetime import date
+
         stats = {}
         try:
             today = date.today().isoformat()
@@ -704,11 +646,11 @@ class CardEditorApp:
                 filters={"filters[add_date][from]": today},
             )
             stats["new_orders_today"] = len(orders_today.get("list", orders_today))
-
+
             pending_ship = self.shoper_client.get_orders(status="pending_shipment")
             stats["pending_shipments"] = len(pending_ship.get("list", pending_ship))
-
-            # Attempt to retrieve total order count for progress calculations
+
+            # Attempt to retrieve total order count for progress calculations
             try:
                 all_orders = self.shoper_client.get_orders()
                 total = (
@@ -727,13 +669,13 @@ class CardEditorApp:
                     ) / float(total)
             except Exception:
                 pass
-
-            pending_pay = self.shoper_client.get_orders(status="pending_payment")
-            stats["pending_payments"] = len(pending_pay.get("list", pending_pay))
-
-            open_ret = self.shoper_client.get_orders(status="return")
-            stats["open_returns"] = len(open_ret.get("list", open_ret))
-
+
+            pending_pay = self.shoper_client.get_orders(status="pending_payment")
+            stats["pending_payments"] = len(pending_pay.get("list", pending_pay))
+
+            open_ret = self.shoper_client.get_orders(status="return")
+            stats["open_returns"] = len(open_ret.get("list", open_ret))
+
             sales = self.shoper_client.get_sales_stats()
             if sales:
                 for key, default in {
@@ -791,10 +733,10 @@ class CardEditorApp:
             self.load_inventory_csv(self.inventory_tree)
 
     def open_shoper_window(self):
-        if not self.shoper_client:
-            messagebox.showerror("Błąd", "Brak konfiguracji Shoper API")
-            return
-        # Quick connection test to provide clearer error messages
+        if not self.shoper_client:
+            messagebox.showerror("Błąd", "Brak konfiguracji Shoper API")
+            return
+        # Quick connection test to provide clearer error messages
         try:
             # use a known endpoint to verify the connection
             resp = self.shoper_client.get_inventory()
@@ -821,16 +763,16 @@ class CardEditorApp:
         if getattr(self, "location_frame", None):
             self.location_frame.destroy()
             self.location_frame = None
-        # Ensure the window has a reasonable minimum size
-        self.root.minsize(1000, 700)
-
+        # Ensure the window has a reasonable minimum size
+        self.root.minsize(1000, 700)
+
         self.shoper_frame = tk.Frame(
             self.root, bg=self.root.cget("background")
         )
-        self.shoper_frame.pack(expand=True, fill="both", padx=10, pady=10)
+        self.shoper_frame.pack(expand=True, fill="both", padx=10, pady=10)
         self.shoper_frame.columnconfigure(0, weight=1)
         self.shoper_frame.rowconfigure(1, weight=1)
-
+
         logo_path = os.path.join(os.path.dirname(__file__), "banner22.png")
         if os.path.exists(logo_path):
             logo_img = Image.open(logo_path)
@@ -868,18 +810,18 @@ class CardEditorApp:
         search_frame.columnconfigure(3, weight=1)
         search_frame.columnconfigure(5, weight=1)
         search_frame.columnconfigure(7, weight=1)
-
+
         tk.Label(
             search_frame, text="Szukaj", bg=self.root.cget("background")
         ).grid(row=0, column=0, sticky="e")
-        self.shoper_search_var = tk.StringVar()
+        self.shoper_search_var = tk.StringVar()
         ctk.CTkEntry(search_frame, textvariable=self.shoper_search_var, placeholder_text="Nazwa produktu").grid(
             row=0, column=1, sticky="ew"
         )
         tk.Label(
             search_frame, text="Numer", bg=self.root.cget("background")
         ).grid(row=0, column=2, sticky="e")
-        self.shoper_number_var = tk.StringVar()
+        self.shoper_number_var = tk.StringVar()
         ctk.CTkEntry(search_frame, textvariable=self.shoper_number_var, placeholder_text="Kod").grid(
             row=0, column=3, sticky="ew"
         )
@@ -914,7 +856,7 @@ class CardEditorApp:
             text="Wyszukaj",
             command=lambda: self.search_products(output),
         ).grid(row=0, column=10, padx=5)
-
+
         columns = ("code", "name", "stock", "warehouse")
         output = ttk.Treeview(inventory_tab, columns=columns, show="headings")
         output.heading("code", text="Kod")
@@ -959,13 +901,13 @@ class CardEditorApp:
             text="Zamówienia",
             command=lambda: self.show_orders(orders_output),
         ).grid(row=1, column=0, pady=5)
-
+
         self.create_button(
             self.shoper_frame,
             text="Powrót",
             command=self.back_to_welcome,
         ).grid(row=2, column=0, pady=5)
-
+
     def push_product(self, widget):
         """Send the currently selected card to Shoper."""
         try:
@@ -983,8 +925,20 @@ class CardEditorApp:
                 messagebox.showerror("Błąd", "Brak danych karty do wysłania")
                 return
 
+            product_registry = getattr(self, "product_registry", None)
+            key = export.card_key(card)
+            if product_registry is not None and product_registry.is_pushed(key):
+                if not messagebox.askyesno(
+                    "Duplikat",
+                    f"Produkt {card.get('product_code')} jest już w Shoper. Wysłać ponownie?",
+                ):
+                    return
+
             payload = self._build_shoper_payload(card)
             data = self.shoper_client.add_product(payload)
+            if product_registry is not None:
+                shoper_id = data.get("product_id") if isinstance(data, dict) else None
+                product_registry.mark_pushed([key], shoper_id)
             if isinstance(widget, tk.Text):
                 widget.delete("1.0", tk.END)
                 widget.insert(tk.END, json.dumps(data, indent=2, ensure_ascii=False))
@@ -1055,7 +1009,7 @@ class CardEditorApp:
         if card.get("image1"):
             payload["images"] = card["image1"]
         return payload
-
+
     def load_products_from_shoper(self, widget):
         try:
             all_products = []
@@ -1139,10 +1093,10 @@ class CardEditorApp:
             messagebox.showerror("Błąd", f"Nie znaleziono pliku {path}")
         except Exception as e:
             messagebox.showerror("Błąd", str(e))
-
-    def search_products(self, widget):
-        """Search products using the Shoper API."""
-        try:
+
+    def search_products(self, widget):
+        """Search products using the Shoper API."""
+        try:
             filters = {}
             term = self.shoper_search_var.get().strip()
             number = self.shoper_number_var.get().strip()
@@ -1156,7 +1110,7 @@ class CardEditorApp:
                 filters["filters[set][like]"] = set_name
             if category:
                 filters["filters[category]"] = category
-            sort = self.shoper_sort_var.get().strip()
+            sort = self.shoper_sort_var.get().strip()
             data = self.shoper_client.search_products(filters=filters, sort=sort)
             if isinstance(widget, tk.Text):
                 widget.delete("1.0", tk.END)
@@ -1171,7 +1125,7 @@ class CardEditorApp:
                 self.create_button(top, text="Zamknij", command=top.destroy).pack(pady=5)
         except Exception as e:
             messagebox.showerror("Błąd", str(e))
-
+
     def show_orders(self, widget):
         """Display new orders with storage location hints."""
         try:
@@ -1233,7 +1187,7 @@ class CardEditorApp:
                 widget.insert(tk.END, json.dumps(data, indent=2, ensure_ascii=False))
         except Exception as e:
             messagebox.showerror("Błąd", str(e))
-
+
     @staticmethod
     def location_from_code(code: str) -> str:
         return storage.location_from_code(code)
@@ -1380,50 +1334,50 @@ class CardEditorApp:
                     text=f"C{c}: {free_percent:.0f}%",
                     tags="stats",
                 )
-
-    def setup_pricing_ui(self):
-        """UI for quick card price lookup."""
-        if self.start_frame is not None:
-            self.start_frame.destroy()
-            self.start_frame = None
-        if getattr(self, "pricing_frame", None):
-            self.pricing_frame.destroy()
-        # Set a sensible minimum size and allow resizing
-        self.root.minsize(1000, 700)
+
+    def setup_pricing_ui(self):
+        """UI for quick card price lookup."""
+        if self.start_frame is not None:
+            self.start_frame.destroy()
+            self.start_frame = None
+        if getattr(self, "pricing_frame", None):
+            self.pricing_frame.destroy()
+        # Set a sensible minimum size and allow resizing
+        self.root.minsize(1000, 700)
         self.pricing_frame = tk.Frame(
             self.root, bg=self.root.cget("background")
         )
-        self.pricing_frame.pack(expand=True, fill="both", padx=10, pady=10)
-
-        self.pricing_frame.columnconfigure(0, weight=1)
-        self.pricing_frame.columnconfigure(1, weight=1)
-        self.pricing_frame.rowconfigure(1, weight=1)
-
+        self.pricing_frame.pack(expand=True, fill="both", padx=10, pady=10)
+
+        self.pricing_frame.columnconfigure(0, weight=1)
+        self.pricing_frame.columnconfigure(1, weight=1)
+        self.pricing_frame.rowconfigure(1, weight=1)
+
         logo_path = os.path.join(os.path.dirname(__file__), "banner22.png")
-        if os.path.exists(logo_path):
-            logo_img = Image.open(logo_path)
-            logo_img.thumbnail((200, 80))
-            self.pricing_logo_photo = ImageTk.PhotoImage(logo_img)
+        if os.path.exists(logo_path):
+            logo_img = Image.open(logo_path)
+            logo_img.thumbnail((200, 80))
+            self.pricing_logo_photo = ImageTk.PhotoImage(logo_img)
             tk.Label(
                 self.pricing_frame,
                 image=self.pricing_logo_photo,
                 bg=self.root.cget("background"),
             ).grid(row=0, column=0, columnspan=2, pady=(0, 10))
-
+
         self.input_frame = tk.Frame(
             self.pricing_frame, bg=self.root.cget("background")
         )
-        self.input_frame.grid(row=1, column=0, sticky="nsew")
-
+        self.input_frame.grid(row=1, column=0, sticky="nsew")
+
         self.image_frame = tk.Frame(
             self.pricing_frame, bg=self.root.cget("background")
         )
-        self.image_frame.grid(row=1, column=1, sticky="nsew")
-
-        self.input_frame.columnconfigure(0, weight=1)
-        self.input_frame.columnconfigure(1, weight=1)
-        self.input_frame.rowconfigure(5, weight=1)
-
+        self.image_frame.grid(row=1, column=1, sticky="nsew")
+
+        self.input_frame.columnconfigure(0, weight=1)
+        self.input_frame.columnconfigure(1, weight=1)
+        self.input_frame.rowconfigure(5, weight=1)
+
         tk.Label(
             self.input_frame, text="Nazwa", bg=self.root.cget("background")
         ).grid(row=0, column=0, sticky="e")
@@ -1431,7 +1385,7 @@ class CardEditorApp:
             self.input_frame, width=200, placeholder_text="Nazwa karty"
         )
         self.price_name_entry.grid(row=0, column=1, sticky="ew")
-
+
         tk.Label(
             self.input_frame, text="Numer", bg=self.root.cget("background")
         ).grid(row=1, column=0, sticky="e")
@@ -1439,7 +1393,7 @@ class CardEditorApp:
             self.input_frame, width=200, placeholder_text="Numer"
         )
         self.price_number_entry.grid(row=1, column=1, sticky="ew")
-
+
         tk.Label(
             self.input_frame, text="Set", bg=self.root.cget("background")
         ).grid(row=2, column=0, sticky="e")
@@ -1447,16 +1401,16 @@ class CardEditorApp:
             self.input_frame, width=200, placeholder_text="Set"
         )
         self.price_set_entry.grid(row=2, column=1, sticky="ew")
-
-        self.price_reverse_var = tk.BooleanVar()
+
+        self.price_reverse_var = tk.BooleanVar()
         ctk.CTkCheckBox(
             self.input_frame,
             text="Reverse",
             variable=self.price_reverse_var,
         ).grid(row=3, column=0, columnspan=2, pady=5)
-
-        self.price_reverse_var.trace_add("write", lambda *a: self.on_reverse_toggle())
-
+
+        self.price_reverse_var.trace_add("write", lambda *a: self.on_reverse_toggle())
+
         btn_frame = tk.Frame(
             self.input_frame, bg=self.root.cget("background")
         )
@@ -1500,14 +1454,14 @@ class CardEditorApp:
             command=self.clear_price_pool,
             width=120,
         ).pack(side="left", padx=5)
-
-    def run_pricing_search(self):
-        """Fetch and display pricing information."""
-        name = self.price_name_entry.get()
-        number = self.price_number_entry.get()
-        set_name = self.price_set_entry.get()
-        is_reverse = self.price_reverse_var.get()
-
+
+    def run_pricing_search(self):
+        """Fetch and display pricing information."""
+        name = self.price_name_entry.get()
+        number = self.price_number_entry.get()
+        set_name = self.price_set_entry.get()
+        is_reverse = self.price_reverse_var.get()
+
         info = self.lookup_card_info(name, number, set_name)
         for w in self.result_frame.winfo_children():
             w.destroy()
@@ -1519,47 +1473,45 @@ class CardEditorApp:
             messagebox.showinfo("Brak wyników", "Nie znaleziono karty.")
             return
         self.current_price_info = info
-
-        if info.get("image_url"):
-            try:
-                res = requests.get(info["image_url"], timeout=10)
-                if res.status_code == 200:
-                    img = Image.open(io.BytesIO(res.content))
-                    img.thumbnail((240, 340))
-                    self.pricing_photo = ImageTk.PhotoImage(img)
+
+        if info.get("image_url"):
+            try:
+                res = requests.get(info["image_url"], timeout=10)
+                if res.status_code == 200:
+                    img = thumbnails.scaled(io.BytesIO(res.content), (240, 340))
+                    self.pricing_photo = ImageTk.PhotoImage(img)
                     self.result_image_label = tk.Label(
                         self.result_frame,
                         image=self.pricing_photo,
                         bg=self.root.cget("background"),
                     )
-                    self.result_image_label.pack(pady=5)
-            except Exception as e:
-                print(f"[ERROR] Loading image failed: {e}")
-
-        if info.get("set_logo_url"):
-            try:
-                res = requests.get(info["set_logo_url"], timeout=10)
-                if res.status_code == 200:
-                    img = Image.open(io.BytesIO(res.content))
-                    img.thumbnail((180, 60))
-                    self.set_logo_photo = ImageTk.PhotoImage(img)
+                    self.result_image_label.pack(pady=5)
+            except Exception as e:
+                print(f"[ERROR] Loading image failed: {e}")
+
+        if info.get("set_logo_url"):
+            try:
+                res = requests.get(info["set_logo_url"], timeout=10)
+                if res.status_code == 200:
+                    img = thumbnails.scaled(io.BytesIO(res.content), (180, 60))
+                    self.set_logo_photo = ImageTk.PhotoImage(img)
                     self.set_logo_label = tk.Label(
                         self.result_frame,
                         image=self.set_logo_photo,
                         bg=self.root.cget("background"),
                     )
-                    self.set_logo_label.pack(pady=5)
-            except Exception as e:
-                print(f"[ERROR] Loading set logo failed: {e}")
-        self.display_price_info(info, is_reverse)
-
-    def display_price_info(self, info, is_reverse):
-        """Show pricing data with optional reverse multiplier."""
-        price_pln = self.apply_variant_multiplier(
-            info["price_pln"], is_reverse=is_reverse
-        )
-        price_80 = round(price_pln * 0.8, 2)
-        if not getattr(self, "price_labels", None):
+                    self.set_logo_label.pack(pady=5)
+            except Exception as e:
+                print(f"[ERROR] Loading set logo failed: {e}")
+        self.display_price_info(info, is_reverse)
+
+    def display_price_info(self, info, is_reverse):
+        """Show pricing data with optional reverse multiplier."""
+        price_pln = self.apply_variant_multiplier(
+            info["price_pln"], is_reverse=is_reverse
+        )
+        price_80 = round(price_pln * 0.8, 2)
+        if not getattr(self, "price_labels", None):
             eur = tk.Label(
                 self.result_frame,
                 text=f"Cena EUR: {info['price_eur']}",
@@ -1593,13 +1545,13 @@ class CardEditorApp:
             )
             self.add_pool_button.pack(pady=5)
             self.price_labels = [eur, rate, pln, pln80]
-        else:
-            eur, rate, pln, pln80 = self.price_labels
-            eur.config(text=f"Cena EUR: {info['price_eur']}")
-            rate.config(text=f"Kurs EUR→PLN: {info['eur_pln_rate']}")
-            pln.config(text=f"Cena PLN: {price_pln}")
-            pln80.config(text=f"80% ceny PLN: {price_80}")
-
+        else:
+            eur, rate, pln, pln80 = self.price_labels
+            eur.config(text=f"Cena EUR: {info['price_eur']}")
+            rate.config(text=f"Kurs EUR→PLN: {info['eur_pln_rate']}")
+            pln.config(text=f"Cena PLN: {price_pln}")
+            pln80.config(text=f"80% ceny PLN: {price_80}")
+
     def on_reverse_toggle(self, *args):
         if getattr(self, "current_price_info", None):
             self.display_price_info(
@@ -1626,7 +1578,7 @@ class CardEditorApp:
         self.price_pool_total = 0.0
         if self.pool_total_label:
             self.pool_total_label.config(text="Suma puli: 0.00")
-
+
     def back_to_welcome(self):
         if getattr(self, "in_scan", False):
             if not messagebox.askyesno(
@@ -1634,6 +1586,7 @@ class CardEditorApp:
             ):
                 return
         self.in_scan = False
+        self.stop_watching()
         if getattr(self, "pricing_frame", None):
             self.pricing_frame.destroy()
             self.pricing_frame = None
@@ -1650,23 +1603,23 @@ class CardEditorApp:
             self.location_frame.destroy()
             self.location_frame = None
         self.setup_welcome_screen()
-
-    def setup_editor_ui(self):
-        # Provide a minimum size and allow the editor to expand
-        self.root.minsize(1000, 700)
+
+    def setup_editor_ui(self):
+        # Provide a minimum size and allow the editor to expand
+        self.root.minsize(1000, 700)
         self.frame = tk.Frame(
             self.root, bg=self.root.cget("background")
         )
-        self.frame.pack(expand=True, fill="both", padx=10, pady=10)
-        # Allow widgets inside the frame to expand properly
+        self.frame.pack(expand=True, fill="both", padx=10, pady=10)
+        # Allow widgets inside the frame to expand properly
         for i in range(6):
             self.frame.columnconfigure(i, weight=1)
-        self.frame.rowconfigure(2, weight=1)
-
+        self.frame.rowconfigure(2, weight=1)
+
         logo_path = os.path.join(os.path.dirname(__file__), "banner22.png")
-        if os.path.exists(logo_path):
-            logo_img = Image.open(logo_path)
-            logo_img.thumbnail((200, 80))
+        if os.path.exists(logo_path):
+            logo_img = Image.open(logo_path)
+            logo_img.thumbnail((200, 80))
         self.logo_photo = ImageTk.PhotoImage(logo_img)
         self.logo_label = tk.Label(
             self.frame,
@@ -1678,15 +1631,15 @@ class CardEditorApp:
         # label for the upcoming warehouse code
         self.location_label = ctk.CTkLabel(self.frame, text="", text_color=TEXT_COLOR)
         self.location_label.grid(row=1, column=0, columnspan=6, pady=(0, 10))
-
-
-        # Bottom frame for action buttons
+
+
+        # Bottom frame for action buttons
         self.button_frame = tk.Frame(
             self.frame, bg=self.root.cget("background")
         )
-        # Do not stretch the button frame so that buttons remain centered
+        # Do not stretch the button frame so that buttons remain centered
         self.button_frame.grid(row=15, column=0, columnspan=6, pady=10)
-
+
         self.load_button = self.create_button(
             self.button_frame,
             text="Import",
@@ -1729,7 +1682,7 @@ class CardEditorApp:
             command=self.toggle_cheatsheet,
         )
         self.cheat_button.pack(side="left", padx=5)
-
+
         # Keep a constant label size so the window does not resize when
         # scans of different dimensions are displayed
         self.image_label = ctk.CTkLabel(self.frame, width=400, height=560)
@@ -1748,24 +1701,24 @@ class CardEditorApp:
         start_row = 1
         for i in range(8):
             self.info_frame.columnconfigure(i, weight=1)
-
-        self.entries = {}
-
-        grid_opts = {"padx": 5, "pady": 2}
-
+
+        self.entries = {}
+
+        grid_opts = {"padx": 5, "pady": 2}
+
         tk.Label(
             self.info_frame, text="Język", bg=self.root.cget("background")
         ).grid(
             row=start_row, column=0, sticky="w", **grid_opts
         )
-        self.lang_var = tk.StringVar(value="ENG")
-        self.entries["język"] = self.lang_var
+        self.lang_var = tk.StringVar(value="ENG")
+        self.entries["język"] = self.lang_var
         lang_dropdown = ctk.CTkComboBox(
             self.info_frame, values=["ENG", "JP"], variable=self.lang_var, width=200
         )
         lang_dropdown.grid(row=start_row, column=1, sticky="ew", **grid_opts)
-        lang_dropdown.bind("<<ComboboxSelected>>", self.update_set_options)
-
+        lang_dropdown.bind("<<ComboboxSelected>>", self.update_set_options)
+
         tk.Label(
             self.info_frame, text="Nazwa", bg=self.root.cget("background")
         ).grid(
@@ -1775,7 +1728,7 @@ class CardEditorApp:
             self.info_frame, width=200, placeholder_text="Nazwa"
         )
         self.entries["nazwa"].grid(row=start_row + 1, column=1, sticky="ew", **grid_opts)
-
+
         tk.Label(
             self.info_frame, text="Numer", bg=self.root.cget("background")
         ).grid(
@@ -1785,27 +1738,31 @@ class CardEditorApp:
             self.info_frame, width=200, placeholder_text="Numer"
         )
         self.entries["numer"].grid(row=start_row + 2, column=1, sticky="ew", **grid_opts)
-
+        self.entries["numer"].bind("<FocusOut>", self.fill_from_catalogue)
+
         tk.Label(
             self.info_frame, text="Set", bg=self.root.cget("background")
         ).grid(
             row=start_row + 3, column=0, sticky="w", **grid_opts
         )
-        self.set_var = tk.StringVar()
+        self.set_var = tk.StringVar()
         self.set_dropdown = ctk.CTkComboBox(
             self.info_frame, variable=self.set_var, width=20
         )
         self.set_dropdown.grid(row=start_row + 3, column=1, sticky="ew", **grid_opts)
-        self.set_dropdown.bind("<KeyRelease>", self.filter_sets)
-        self.set_dropdown.bind("<Tab>", self.autocomplete_set)
-        self.entries["set"] = self.set_var
-
+        self.set_dropdown.bind("<KeyRelease>", self.filter_sets)
+        self.set_dropdown.bind("<Tab>", self.autocomplete_set)
+        self.entries["set"] = self.set_var
+        self.set_var.trace_add(
+            "write", lambda *a: self.prefetch_set_prices(self.set_var.get())
+        )
+
         tk.Label(
             self.info_frame, text="Typ", bg=self.root.cget("background")
         ).grid(
             row=start_row + 4, column=0, sticky="w", **grid_opts
         )
-        self.type_vars = {}
+        self.type_vars = {}
         self.type_frame = ctk.CTkFrame(self.info_frame)
         self.type_frame.grid(row=start_row + 4, column=1, columnspan=7, sticky="w", **grid_opts)
         types = ["Common", "Holo", "Reverse", "Pokeball", "Masterball", "Stamp"]
@@ -1817,32 +1774,32 @@ class CardEditorApp:
                 text=t,
                 variable=var,
             ).pack(side="left", padx=2)
-
+
         tk.Label(
             self.info_frame, text="Rarity", bg=self.root.cget("background")
         ).grid(
             row=start_row + 5, column=0, sticky="w", **grid_opts
         )
-        self.rarity_vars = {}
+        self.rarity_vars = {}
         self.rarity_frame = ctk.CTkFrame(self.info_frame)
         self.rarity_frame.grid(row=start_row + 5, column=1, columnspan=7, sticky="w", **grid_opts)
-        rarities = ["RR", "AR", "SR", "SAR", "UR", "ACE", "PROMO"]
-        for r in rarities:
-            var = tk.BooleanVar()
-            self.rarity_vars[r] = var
+        rarities = ["RR", "AR", "SR", "SAR", "UR", "ACE", "PROMO"]
+        for r in rarities:
+            var = tk.BooleanVar()
+            self.rarity_vars[r] = var
             ctk.CTkCheckBox(
                 self.rarity_frame,
                 text=r,
                 variable=var,
             ).pack(side="left", padx=2)
-
+
         tk.Label(
             self.info_frame, text="Suffix", bg=self.root.cget("background")
         ).grid(
             row=start_row + 6, column=0, sticky="w", **grid_opts
         )
-        self.suffix_var = tk.StringVar(value="")
-        self.entries["suffix"] = self.suffix_var
+        self.suffix_var = tk.StringVar(value="")
+        self.entries["suffix"] = self.suffix_var
         suffix_dropdown = ctk.CTkComboBox(
             self.info_frame,
             variable=self.suffix_var,
@@ -1850,14 +1807,14 @@ class CardEditorApp:
             width=20,
         )
         suffix_dropdown.grid(row=start_row + 6, column=1, sticky="ew", **grid_opts)
-
+
         tk.Label(
             self.info_frame, text="Stan", bg=self.root.cget("background")
         ).grid(
             row=start_row + 7, column=0, sticky="w", **grid_opts
         )
-        self.stan_var = tk.StringVar(value="NM")
-        self.entries["stan"] = self.stan_var
+        self.stan_var = tk.StringVar(value="NM")
+        self.entries["stan"] = self.stan_var
         stan_dropdown = ctk.CTkComboBox(
             self.info_frame,
             variable=self.stan_var,
@@ -1865,7 +1822,7 @@ class CardEditorApp:
             width=20,
         )
         stan_dropdown.grid(row=start_row + 7, column=1, sticky="ew", **grid_opts)
-
+
         tk.Label(
             self.info_frame, text="Cena", bg=self.root.cget("background")
         ).grid(
@@ -1875,14 +1832,14 @@ class CardEditorApp:
             self.info_frame, width=200, placeholder_text="Cena"
         )
         self.entries["cena"].grid(row=start_row + 8, column=1, sticky="ew", **grid_opts)
-
+
         self.api_button = self.create_button(
             self.info_frame,
             text="Pobierz cenę z bazy",
             command=self.fetch_card_data,
         )
         self.api_button.grid(row=start_row + 9, column=0, columnspan=2, sticky="ew", **grid_opts)
-
+
         self.variants_button = self.create_button(
             self.info_frame,
             text="Inne warianty",
@@ -1891,7 +1848,7 @@ class CardEditorApp:
         self.variants_button.grid(
             row=start_row + 9, column=2, columnspan=2, sticky="ew", **grid_opts
         )
-
+
         self.cardmarket_button = self.create_button(
             self.info_frame,
             text="Cardmarket",
@@ -1900,21 +1857,21 @@ class CardEditorApp:
         self.cardmarket_button.grid(
             row=start_row + 9, column=4, columnspan=2, sticky="ew", **grid_opts
         )
-
+
         self.save_button = self.create_button(
             self.info_frame,
             text="Zapisz i dalej",
             command=self.save_and_next,
         )
         self.save_button.grid(row=start_row + 10, column=0, columnspan=2, sticky="ew", **grid_opts)
-
-        for entry in self.entries.values():
+
+        for entry in self.entries.values():
             if isinstance(entry, (tk.Entry, ctk.CTkEntry)):
-                entry.bind("<Return>", lambda e: self.save_and_next())
-
-        self.root.bind("<Return>", lambda e: self.save_and_next())
-        self.update_set_options()
-
+                entry.bind("<Return>", lambda e: self.save_and_next())
+
+        self.root.bind("<Return>", lambda e: self.save_and_next())
+        self.update_set_options()
+
         self.log_widget = tk.Text(
             self.frame,
             height=4,
@@ -1923,8 +1880,9 @@ class CardEditorApp:
             fg="white",
         )
         self.log_widget.grid(row=16, column=0, columnspan=6, sticky="ew")
-
+
     def update_set_options(self, event=None):
+        ensure_sets()
         lang = self.lang_var.get().strip().upper()
         if lang == "JP":
             self.sets_file = "tcg_sets_jp.json"
@@ -1934,77 +1892,105 @@ class CardEditorApp:
             self.set_dropdown.configure(values=tcg_sets_eng)
         if getattr(self, "cheat_frame", None) is not None:
             self.create_cheat_frame()
-
-    def filter_sets(self, event=None):
-        typed = self.set_var.get().lower()
-        lang = self.lang_var.get().strip().upper()
-        all_sets = tcg_sets_jp if lang == "JP" else tcg_sets_eng
-        if typed:
-            filtered = [s for s in all_sets if typed in s.lower()]
-        else:
-            filtered = all_sets
-        self.set_dropdown.configure(values=filtered)
-
+
+    def prefetch_set_prices(self, set_name):
+        """Load the cards of a known set with prices and into the catalogue.
+
+        Both downloads run in the background.
+        """
+        ensure_sets()
+        code = set_index.code(set_name, fuzzy=False) if set_name else None
+        if code is None:
+            return
+        service = get_pricing(self)
+        if service.prefetched_set(set_name) is None:
+            threading.Thread(
+                target=service.prefetch_set, args=(set_name,), daemon=True
+            ).start()
+        card_catalogue = getattr(self, "card_catalogue", None)
+        if card_catalogue is not None and not card_catalogue.has_set(code):
+            threading.Thread(
+                target=card_catalogue.sync_set, args=(code,), daemon=True
+            ).start()
+
+    def fill_from_catalogue(self, event=None):
+        """Fill in the name and suffix of the entered set and number.
+
+        The card comes from the local catalogue, so nothing is downloaded;
+        a name that was already typed is left alone.
+        """
+        card_catalogue = getattr(self, "card_catalogue", None)
+        number = self.entries["numer"].get().strip()
+        set_name = self.set_var.get().strip()
+        if card_catalogue is None or not number or not set_name:
+            return None
+        ensure_sets()
+        code = set_index.code(set_name, fuzzy=False)
+        card = card_catalogue.lookup(code, number) if code else None
+        if card is None:
+            return None
+        if not self.entries["nazwa"].get().strip():
+            self.entries["nazwa"].insert(0, card["name"])
+            if not self.suffix_var.get():
+                self.suffix_var.set(card["suffix"])
+        return card
+
+    def filter_sets(self, event=None):
+        ensure_sets()
+        typed = self.set_var.get()
+        lang = self.lang_var.get().strip().upper()
+        index = set_indexes["JP" if lang == "JP" else "ENG"]
+        self.set_dropdown.configure(values=index.search(typed))
+
     def autocomplete_set(self, event=None):
-        typed = self.set_var.get().lower()
+        ensure_sets()
+        typed = self.set_var.get()
         lang = self.lang_var.get().strip().upper()
-        all_sets = tcg_sets_jp if lang == "JP" else tcg_sets_eng
-        if typed:
-            filtered = [s for s in all_sets if typed in s.lower()]
-        else:
-            filtered = all_sets
+        index = set_indexes["JP" if lang == "JP" else "ENG"]
+        filtered = index.search(typed, limit=1)
         if filtered:
             self.set_var.set(filtered[0])
         event.widget.tk_focusNext().focus()
         return "break"
 
     def create_cheat_frame(self, show_headers: bool = True):
-        """Create or refresh the cheatsheet frame with set logos."""
-        if self.cheat_frame is not None:
-            self.cheat_frame.destroy()
-        self.cheat_frame = ctk.CTkScrollableFrame(
-            self.frame,
-            fg_color=self.root.cget("background"),
-            width=240,
-        )
-        self.cheat_frame.grid(row=2, column=5, rowspan=12, sticky="nsew")
+        """Show the cheatsheet for the current language.
 
+        One :class:`CheatSheet` is kept per language and reused, so switching
+        languages or toggling the sheet does not rebuild any widgets.
+        """
+        ensure_sets()
         lang = self.lang_var.get().strip().upper()
         sets_by_era = (
             tcg_sets_jp_by_era if lang == "JP" else tcg_sets_eng_by_era
         )
-
-        row = 0
-        for era, sets in sets_by_era.items():
-            if show_headers:
-                ctk.CTkLabel(
-                    self.cheat_frame,
-                    text=era,
-                    font=("Segoe UI", 12, "bold"),
-                ).grid(row=row, column=0, columnspan=2, sticky="w", padx=5, pady=4)
-                row += 1
-            for item in sets:
-                name = item["name"]
-                code = item["code"]
-                img = self.set_logos.get(code)
-                if img:
-                    tk.Label(
-                        self.cheat_frame,
-                        image=img,
-                        bg=self.root.cget("background"),
-                    ).grid(row=row, column=0, sticky="w", padx=5, pady=2)
-                else:
-                    tk.Label(
-                        self.cheat_frame,
-                        text="",
-                        width=2,
-                        bg=self.root.cget("background"),
-                    ).grid(row=row, column=0, sticky="w", padx=5, pady=2)
-                ctk.CTkLabel(
-                    self.cheat_frame,
-                    text=f"{name} ({code})",
-                ).grid(row=row, column=1, sticky="w", padx=5, pady=2)
-                row += 1
+        sheets = getattr(self, "cheat_sheets", None)
+        if sheets is None:
+            sheets = self.cheat_sheets = {}
+        key = (lang, show_headers)
+        sheet = sheets.get(key)
+        if sheet is not None and (
+            sheet.master is not self.frame or not sheet.winfo_exists()
+        ):
+            sheet = None
+        if sheet is None:
+            sheet = cheat_sheet.CheatSheet(
+                self.frame,
+                cheat_sheet.flatten_sets(sets_by_era, show_headers),
+                self.set_logos,
+                bg=self.root.cget("background"),
+            )
+            sheet.source = sets_by_era
+            sheets[key] = sheet
+        elif sheet.source is not sets_by_era:
+            # the catalogue was reloaded after a set sync
+            sheet.set_rows(cheat_sheet.flatten_sets(sets_by_era, show_headers))
+            sheet.source = sets_by_era
+        previous = self.cheat_frame
+        if previous is not None and previous is not sheet and previous.winfo_exists():
+            previous.grid_remove()
+        self.cheat_frame = sheet
+        sheet.grid(row=2, column=5, rowspan=12, sticky="nsew")
 
     def toggle_cheatsheet(self):
         """Show or hide the cheatsheet with set logos."""
@@ -2051,40 +2037,156 @@ class CardEditorApp:
 
     def load_images(self, folder):
         self.in_scan = True
+        self.stop_watching()
         if self.start_frame is not None:
             self.start_frame.destroy()
             self.start_frame = None
         if getattr(self, "frame", None) is None:
             self.setup_editor_ui()
-        self.folder_path = folder
-        self.folder_name = os.path.basename(folder)
-        self.cards = [
-            os.path.join(folder, f)
-            for f in os.listdir(folder)
-            if f.lower().endswith((".jpg", ".png"))
-        ]
-        self.cards.sort()
+        self.folder_path = folder
+        self.folder_name = os.path.basename(folder)
+        self.cards = [
+            os.path.join(folder, f)
+            for f in os.listdir(folder)
+            if f.lower().endswith((".jpg", ".png"))
+        ]
+        self.cards.sort()
+        self.load_batch_review(folder)
         self.index = 0
         self.output_data = [None] * len(self.cards)
-        self.card_counts = defaultdict(int)
-        self.progress_var.set(f"0/{len(self.cards)}")
-        self.log(f"Loaded {len(self.cards)} cards")
-        self.show_card()
-
-    def show_card(self):
-        if self.index >= len(self.cards):
-            messagebox.showinfo("Koniec", "Wszystkie karty zostały zapisane.")
-            self.export_csv()
-            return
-
-        self.progress_var.set(f"{self.index + 1}/{len(self.cards)}")
-
-        image_path = self.cards[self.index]
-        cache_key = self.file_to_key.get(os.path.basename(image_path))
-        if not cache_key:
-            cache_key = self._guess_key_from_filename(image_path)
-        image = Image.open(image_path)
-        image.thumbnail((400, 560))
+        self.card_counts = defaultdict(int)
+        self.resume_session(folder)
+        self.progress_var.set(f"{self.index}/{len(self.cards)}")
+        self.log(f"Loaded {len(self.cards)} cards")
+        watch_var = getattr(self, "watch_folder_var", None)
+        if watch_var is not None and watch_var.get():
+            self.start_watching(folder)
+        self.show_card()
+
+    def start_watching(self, folder):
+        """Append scans written to ``folder`` while the session is open."""
+        self.prefetched = {}
+        self.watched_scans = set()
+        self.folder_watcher = hot_folder.FolderWatcher(
+            folder,
+            lambda paths: self.root.after(0, self.add_scans, paths),
+            known=os.listdir(folder),
+        )
+        self.folder_watcher.start()
+        self.log(f"Obserwuję folder {folder} ({self.folder_watcher.mode})")
+
+    def stop_watching(self):
+        watcher = getattr(self, "folder_watcher", None)
+        if watcher is not None:
+            watcher.stop()
+            self.folder_watcher = None
+        pool = getattr(self, "prefetch_pool", None)
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+            self.prefetch_pool = None
+        self.prefetched = {}
+
+    def add_scans(self, paths):
+        """Append new scans to the session and start recognising them."""
+        paths = [p for p in paths if p not in self.cards]
+        if not paths:
+            return
+        waiting = self.index >= len(self.cards)
+        self.cards.extend(paths)
+        self.output_data.extend([None] * len(paths))
+        self.watched_scans.update(paths)
+        for path in paths:
+            self.prefetch_scan(path)
+        self.log(f"Nowe skany: {len(paths)}")
+        if waiting:
+            self.show_card()
+        else:
+            self.progress_var.set(f"{self.index + 1}/{len(self.cards)}")
+
+    def prefetch_scan(self, path):
+        """Prepare the preview and recognition of ``path`` in the background.
+
+        A scan that just appeared has not been uploaded yet, so OpenAI gets
+        the local file rather than its URL.  The result is kept together
+        with the language setting it was made for.
+        """
+        pool = getattr(self, "prefetch_pool", None)
+        if pool is None:
+            pool = self.prefetch_pool = ThreadPoolExecutor(max_workers=2)
+        translate = self._translate_names()
+
+        def work():
+            try:
+                thumbnails.load(path, thumbnails.CARD_SIZE)
+            except Exception as e:
+                print(f"[WARN] Preview of {path} failed: {e}")
+            return self._recognize_scan(path, path, translate, source="local")
+
+        self.prefetched[path] = (pool.submit(work), translate)
+
+    def resume_session(self, folder):
+        """Offer to restore the cards saved in ``folder`` by an earlier session."""
+        self.journal = journal.SessionJournal(folder)
+        if not self.journal.exists():
+            return 0
+        if not messagebox.askyesno(
+            "Wznów sesję",
+            "W tym folderze jest zapisana sesja. Wczytać zapisane karty?",
+        ):
+            self.journal.clear()
+            return 0
+        restored = self.journal.restore(self)
+        self.index = next(
+            (i for i, row in enumerate(self.output_data) if row is None),
+            len(self.output_data),
+        )
+        self.log(f"Wznowiono sesję: {restored} kart")
+        return restored
+
+    def load_batch_review(self, folder):
+        """Offer to load only the scans flagged by ``kartoteka batch``.
+
+        The flagged scans are pre-filled with the batch results and numbered
+        from the first warehouse slot the batch left free.
+        """
+        review = load_review(folder)
+        if review is None:
+            return False
+        flagged = {card["file"]: card for card in review["cards"]}
+        if not messagebox.askyesno(
+            "Przegląd",
+            f"{len(flagged)} kart wymaga sprawdzenia po przetwarzaniu wsadowym. "
+            "Wczytać tylko te karty?",
+        ):
+            return False
+        self.cards = [c for c in self.cards if os.path.basename(c) in flagged]
+        for path in self.cards:
+            card = flagged[os.path.basename(path)]
+            key = f"{path}|review"
+            self.card_cache[key] = {"entries": card.get("entries", {})}
+            self.file_to_key[os.path.basename(path)] = key
+        start = storage.location_index(review.get("next_location", ""))
+        if start is not None:
+            self.starting_idx = start
+        self.log(f"Do sprawdzenia: {len(self.cards)} kart")
+        return True
+
+    def show_card(self):
+        if self.index >= len(self.cards) and getattr(self, "folder_watcher", None):
+            self.progress_var.set(f"{len(self.cards)}/{len(self.cards)} – czekam na skany")
+            return
+        if self.index >= len(self.cards):
+            messagebox.showinfo("Koniec", "Wszystkie karty zostały zapisane.")
+            self.export_csv()
+            return
+
+        self.progress_var.set(f"{self.index + 1}/{len(self.cards)}")
+
+        image_path = self.cards[self.index]
+        cache_key = self.file_to_key.get(os.path.basename(image_path))
+        if not cache_key:
+            cache_key = self._guess_key_from_filename(image_path)
+        image = thumbnails.load(image_path, thumbnails.CARD_SIZE)
         self.current_card_image = image.copy()
         if hasattr(ctk, "CTkImage"):
             img = ctk.CTkImage(light_image=image, size=image.size)
@@ -2096,54 +2198,53 @@ class CardEditorApp:
         self.image_label.configure(image=img)
         if hasattr(self, "location_label"):
             self.location_label.configure(text=self.next_free_location())
-
+
         for key, entry in self.entries.items():
             if isinstance(entry, (tk.Entry, ctk.CTkEntry)):
-                entry.delete(0, tk.END)
-            elif isinstance(entry, tk.StringVar):
-                if key == "język":
-                    entry.set("ENG")
-                elif key == "stan":
-                    entry.set("NM")
-                else:
-                    entry.set("")
-            elif isinstance(entry, tk.BooleanVar):
-                entry.set(False)
-
-        for var in self.rarity_vars.values():
-            var.set(False)
-
-        for var in self.type_vars.values():
-            var.set(False)
-
+                entry.delete(0, tk.END)
+            elif isinstance(entry, tk.StringVar):
+                if key == "język":
+                    entry.set("ENG")
+                elif key == "stan":
+                    entry.set("NM")
+                else:
+                    entry.set("")
+            elif isinstance(entry, tk.BooleanVar):
+                entry.set(False)
+
+        for var in self.rarity_vars.values():
+            var.set(False)
+
+        for var in self.type_vars.values():
+            var.set(False)
+
         if cache_key and cache_key in self.card_cache:
             cached = self.card_cache[cache_key]
-            for field, value in cached.get("entries", {}).items():
+            for field, value in cached.get("entries", {}).items():
                 entry = self.entries.get(field)
                 if isinstance(entry, (tk.Entry, ctk.CTkEntry)):
-                    entry.insert(0, value)
-                elif isinstance(entry, tk.StringVar):
-                    entry.set(value)
-            for name, val in cached.get("types", {}).items():
-                if name in self.type_vars:
-                    self.type_vars[name].set(val)
-            for name, val in cached.get("rarities", {}).items():
-                if name in self.rarity_vars:
-                    self.rarity_vars[name].set(val)
+                    entry.insert(0, value)
+                elif isinstance(entry, tk.StringVar):
+                    entry.set(value)
+            for name, val in cached.get("types", {}).items():
+                if name in self.type_vars:
+                    self.type_vars[name].set(val)
+            for name, val in cached.get("rarities", {}).items():
+                if name in self.rarity_vars:
+                    self.rarity_vars[name].set(val)
             self.update_set_options()
 
-        folder = os.path.basename(os.path.dirname(image_path))
-        remote_url = f"{BASE_IMAGE_URL}/{folder}/{os.path.basename(image_path)}"
+        source = recognition.scan_source(image_path, BASE_IMAGE_URL, RECOGNITION_SOURCE)
         self.start_scan_animation()
         threading.Thread(
             target=self._analyze_and_fill,
-            args=(remote_url, self.index),
+            args=(source, self.index),
             daemon=True,
         ).start()
 
         # focus the name entry so the user can start typing immediately
         self.entries["nazwa"].focus_set()
-
+
     def _guess_key_from_filename(self, path: str):
         base = os.path.splitext(os.path.basename(path))[0]
         parts = re.split(r"[|_-]", base)
@@ -2154,70 +2255,91 @@ class CardEditorApp:
             return f"{name}|{number}|{set_name}"
         return None
 
-    def start_scan_animation(self, index=0):
-        """Show the scanning GIF on top of the image label."""
-        path = os.path.join(os.path.dirname(__file__), "scan.gif")
+    def start_scan_animation(self):
+        """Show the scanning GIF over the current card while it is analysed."""
+        if not hasattr(self, "current_card_image"):
+            return
+        animation = getattr(self, "scan_animation", None)
+        if animation is None or animation.label is not self.image_label:
+            animation = self.scan_animation = scan_animation.ScanAnimation(
+                self.image_label, self._scan_frame_image
+            )
         w = self.image_label.winfo_width() or 400
         h = self.image_label.winfo_height() or 560
-        if os.path.exists(path) and hasattr(self, "current_card_image"):
-            from PIL import ImageSequence
-
-            img = Image.open(path)
-            frames = []
-            durations = []
-            base = (
-                self.current_card_image.convert("RGBA")
-                .resize((w, h))
-                .filter(ImageFilter.GaussianBlur(radius=2))
-            )
-            for frame in ImageSequence.Iterator(img):
-                overlay = frame.convert("RGBA").resize((w, h))
-                composed = Image.alpha_composite(base, overlay)
-                if hasattr(ctk, "CTkImage"):
-                    frames.append(ctk.CTkImage(light_image=composed, size=(w, h)))
-                else:
-                    frames.append(ImageTk.PhotoImage(composed))
-                durations.append(frame.info.get("duration", 100))
-            self.scan_gif_frames = frames
-            self.scan_gif_durations = durations
-            self.scan_gif_size = (w, h)
-        else:
-            self.scan_gif_frames = []
-        if not self.scan_gif_frames:
-            return
-        self.scan_animation_running = True
-        self._animate_scan_gif(index)
+        animation.start(self.current_card_image, (w, h))
 
-    def _animate_scan_gif(self, index=0):
-        if not getattr(self, "scan_animation_running", False):
-            return
-        frame = self.scan_gif_frames[index]
-        self.image_label.configure(image=frame)
-        next_index = (index + 1) % len(self.scan_gif_frames)
-        delay = self.scan_gif_durations[index] if hasattr(self, "scan_gif_durations") else 100
-        self.scan_after_id = self.image_label.after(delay, self._animate_scan_gif, next_index)
+    def _scan_frame_image(self, image):
+        if hasattr(ctk, "CTkImage"):
+            return ctk.CTkImage(light_image=image, size=image.size)
+        return ImageTk.PhotoImage(image)
 
     def stop_scan_animation(self):
         """Hide the scanning GIF."""
-        self.scan_animation_running = False
-        if hasattr(self, "scan_after_id"):
-            try:
-                self.image_label.after_cancel(self.scan_after_id)
-            except Exception:
-                pass
+        animation = getattr(self, "scan_animation", None)
+        if animation is None:
+            return
+        animation.stop()
         if hasattr(self, "current_card_photo"):
             self.image_label.configure(image=self.current_card_photo)
 
-    def _analyze_and_fill(self, url, idx):
+    def _translate_names(self):
+        """Return whether recognised names are translated (Japanese cards)."""
         lang_var = getattr(self, "lang_var", None)
-        translate = False
-        if lang_var is not None:
-            try:
-                translate = lang_var.get() == "JP"
-            except Exception:
-                translate = False
-        result = analyze_card_image(url, translate_name=translate)
-        self.root.after(0, lambda: self._apply_analysis_result(result, idx))
+        if lang_var is None:
+            return False
+        try:
+            return lang_var.get() == "JP"
+        except Exception:
+            return False
+
+    def _analyze_and_fill(self, url, idx):
+        translate = self._translate_names()
+
+        def show(result):
+            self.root.after(0, lambda: self._apply_analysis_result(result, idx))
+
+        cards = getattr(self, "cards", [])
+        path = cards[idx] if 0 <= idx < len(cards) else None
+        prefetched = getattr(self, "prefetched", {}).pop(path, None)
+        result = None
+        if prefetched is not None:
+            future, prefetched_translate = prefetched
+            if prefetched_translate == translate:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[WARN] Prefetched recognition failed: {e}")
+        source = None
+        if path in getattr(self, "watched_scans", ()):
+            # a watched scan is not uploaded yet
+            url, source = path, "local"
+        if result is None:
+            result = self._recognize_scan(
+                path, url, translate, on_partial=show, source=source
+            )
+        show(result)
+
+    def _recognize_scan(self, path, url, translate=False, on_partial=None, source=None):
+        result = recognition.recognize_card(
+            path,
+            lambda: analyze_card_image(url, translate_name=translate, source=source),
+            SET_LOGO_DIR,
+            set_name=get_set_name,
+            on_partial=on_partial,
+        )
+        card_catalogue = getattr(self, "card_catalogue", None)
+        code = None
+        if card_catalogue is not None and result and result.get("set"):
+            ensure_sets()
+            code = set_index.code(str(result["set"]).strip(), fuzzy=False)
+        if code:
+            card_catalogue.validate(result, code)
+            if result.get("validated") is False:
+                print(
+                    f"[WARN] {result.get('name')} {result.get('number')} does not match "
+                    f"the catalogue ({result.get('catalogue_name', 'no card')})"
+                )
+        return result
 
     def _apply_analysis_result(self, result, idx):
         if idx != self.index:
@@ -2235,14 +2357,14 @@ class CardEditorApp:
             self.entries["set"].set(set_name)
             self.entries.get("suffix").set(suffix_val)
             self.update_set_options()
-
+
     def generate_location(self, idx):
         return storage.generate_location(idx)
 
     def next_free_location(self):
         """Return the next unused warehouse_code."""
         return storage.next_free_location(self)
-
+
     def load_price_db(self):
         if not os.path.exists(PRICE_DB_PATH):
             return []
@@ -2251,93 +2373,57 @@ class CardEditorApp:
             return list(reader)
 
     def load_set_logos(self):
-        """Load set logos from SET_LOGO_DIR into self.set_logos."""
+        """Drop decoded set logos; they are loaded again on first use."""
         self.set_logos.clear()
-        if not os.path.isdir(SET_LOGO_DIR):
-            return
-        for file in os.listdir(SET_LOGO_DIR):
-            path = os.path.join(SET_LOGO_DIR, file)
-            if not os.path.isfile(path):
-                continue
-            if not file.lower().endswith((".png", ".jpg", ".jpeg", ".gif")):
-                continue
-            code = os.path.splitext(file)[0]
-            try:
-                img = Image.open(path)
-                img.thumbnail((40, 40))
-                self.set_logos[code] = ImageTk.PhotoImage(img)
-            except Exception:
-                continue
-
-    def show_loading_screen(self):
-        """Display a temporary loading screen during startup."""
-        self.root.minsize(1000, 700)
-        self.loading_frame = ctk.CTkFrame(self.root, fg_color=BG_COLOR)
-        self.loading_frame.pack(expand=True, fill="both")
-        logo_path = os.path.join(os.path.dirname(__file__), "banner22.png")
-        if os.path.exists(logo_path):
-            img = Image.open(logo_path)
-            img.thumbnail((300, 150))
-            self.loading_logo = ImageTk.PhotoImage(img)
-            tk.Label(
-                self.loading_frame,
-                image=self.loading_logo,
-                bg=self.loading_frame.cget("fg_color"),
-            ).pack(pady=10)
-
-        gif_path = os.path.join(os.path.dirname(__file__), "simple_pokeball.gif")
-        if os.path.exists(gif_path):
-            from PIL import ImageSequence
-
-            img = Image.open(gif_path)
-            self.gif_frames = []
-            self.gif_durations = []
-            for frame in ImageSequence.Iterator(img):
-                self.gif_frames.append(ImageTk.PhotoImage(frame.copy()))
-                self.gif_durations.append(frame.info.get("duration", 100))
-
-            self.gif_label = tk.Label(
-                self.loading_frame, bg=self.loading_frame.cget("fg_color")
-            )
-            self.gif_label.pack()
-            self.animate_loading_gif(0)
-        self.loading_label = ctk.CTkLabel(
-            self.loading_frame,
-            text="Ładowanie...",
-            text_color=TEXT_COLOR,
-            font=("Segoe UI", 16),
-        )
-        self.loading_label.pack(pady=10)
-        self.root.update()
 
-    def animate_loading_gif(self, index=0):
-        """Cycle through frames of the loading GIF."""
-        if not hasattr(self, "gif_frames"):
+    def poll_progress_queue(self):
+        """Show status messages posted by background tasks in the status bar."""
+        if not self.root.winfo_exists():
             return
-        frame = self.gif_frames[index]
-        self.gif_label.configure(image=frame)
-        next_index = (index + 1) % len(self.gif_frames)
-        delay = 100
-        if hasattr(self, "gif_durations"):
+        text = None
+        while True:
             try:
-                delay = self.gif_durations[index]
-            except IndexError:
-                pass
-        self.gif_label.after(delay, self.animate_loading_gif, next_index)
+                message = self.progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(message, tuple):
+                done, total, name = message
+                text = f"Pobieram {done}/{total}: {name}"
+            else:
+                text = message
+        if text is not None:
+            self.status_label.configure(text=text)
+        self.root.after(100, self.poll_progress_queue)
 
     def startup_tasks(self):
-        """Run initial setup tasks in the background."""
-        self.update_sets()
-        self.load_set_logos()
-        self.root.after(0, self.finish_startup)
+        """Synchronise the set catalogue and logos in the background."""
+        started = time.perf_counter()
+        added = self.update_sets()
+        symbol_index.get_index(SET_LOGO_DIR)
+        elapsed = time.perf_counter() - started
+        self.root.after(0, lambda: self.finish_set_sync(added, elapsed))
+
+    def finish_set_sync(self, added, elapsed):
+        """Hot-reload sets and logos once the background sync is done."""
+        if added:
+            self.load_set_logos()
+            if getattr(self, "set_dropdown", None) is not None:
+                self.update_set_options()
+            post_status(self, f"Dodano nowe sety: {added}")
+        elif added is None:
+            post_status(self, "Brak połączenia – używam lokalnej listy setów")
+        else:
+            post_status(self, "Lista setów aktualna")
+        self.sets_synced_at = time.perf_counter() - self.startup_started
+        print(f"[INFO] Set sync finished in {elapsed:.2f} s")
 
     def finish_startup(self):
-        """Finalize initialization after background tasks complete."""
-        if self.loading_frame is not None:
-            self.loading_frame.destroy()
+        """Finalize initialization and show the welcome screen."""
         try:
             if not SHOPER_API_URL or not SHOPER_API_TOKEN:
                 raise ValueError("Brak konfiguracji Shoper API")
+            from shoper_client import ShoperClient
+
             self.shoper_client = ShoperClient(SHOPER_API_URL, SHOPER_API_TOKEN)
         except Exception as e:
             print(f"[ERROR] ShoperClient init failed: {e}")
@@ -2347,589 +2433,204 @@ class CardEditorApp:
                 "Błąd", "Nie można połączyć się z API Shoper. Sprawdź dane w pliku .env."
             )
         self.setup_welcome_screen()
+        self.ui_ready_at = time.perf_counter() - self.startup_started
+        print(f"[INFO] UI ready in {self.ui_ready_at:.2f} s")
+        post_status(self, "Synchronizacja setów...")
 
     def download_set_symbols(self, sets):
         """Download logos for the provided set definitions."""
-        os.makedirs(SET_LOGO_DIR, exist_ok=True)
-        total = len(sets)
-        for idx, item in enumerate(sets, start=1):
-            name = item.get("name")
-            code = item.get("code")
-            if self.loading_label is not None:
-                self.loading_label.configure(
-                    text=f"Pobieram {idx}/{total}: {name}"
-                )
-                self.root.update()
-            if not code:
-                continue
-            symbol_url = f"https://images.pokemontcg.io/{code}/symbol.png"
-            try:
-                res = requests.get(symbol_url, timeout=10)
-                if res.status_code == 404:
-                    alt = re.sub(r"(^sv)0(\d$)", r"\1\2", code)
-                    if alt != code:
-                        alt_url = f"https://images.pokemontcg.io/{alt}/symbol.png"
-                        res = requests.get(alt_url, timeout=10)
-                        if res.status_code == 200:
-                            symbol_url = alt_url
-                if res.status_code == 200:
-                    parsed_path = urlparse(symbol_url).path
-                    ext = os.path.splitext(parsed_path)[1] or ".png"
-                    safe = code.replace("/", "_")
-                    path = os.path.join(SET_LOGO_DIR, f"{safe}{ext}")
-                    with open(path, "wb") as fh:
-                        fh.write(res.content)
-                else:
-                    if res.status_code == 404:
-                        print(f"[WARN] Symbol not found for {name}: {symbol_url}")
-                    else:
-                        print(
-                            f"[ERROR] Failed to download symbol for {name} from {symbol_url}: {res.status_code}"
-                        )
-            except requests.RequestException as exc:
-                print(f"[ERROR] {name}: {exc}")
+        set_symbols.download_symbols(
+            sets,
+            SET_LOGO_DIR,
+            progress_queue=getattr(self, "progress_queue", None),
+        )
 
-    def update_sets(self):
-        """Check remote API for new sets and update local files."""
-        try:
-            self.loading_label.configure(text="Sprawdzanie nowych setów...")
-            self.root.update()
-            with open(self.sets_file, encoding="utf-8") as f:
-                current_sets = json.load(f)
-        except Exception:
-            current_sets = {}
+    def update_sets(self, force: bool = False):
+        """Check remote API for new sets and update both local set files.
 
+        The API is asked at most once per ``SETS_REFRESH_HOURS`` using a
+        conditional request, so most calls make no request or get a ``304``.
+        Returns the number of added sets or ``None`` when the API could not
+        be reached.
+        """
+        meta = set_catalogue.load_meta()
+        if not force and not set_catalogue.is_due(meta):
+            return 0
+        post_status(self, "Sprawdzanie nowych setów...")
         try:
-            resp = requests.get("https://api.pokemontcg.io/v2/sets", timeout=10)
-            resp.raise_for_status()
-            remote = resp.json().get("data", [])
+            remote, meta = set_catalogue.fetch_sets(meta)
         except Exception as exc:
             print(f"[WARN] Unable to fetch sets: {exc}")
-            return
-
-        added = 0
-        new_items = []
-        existing_codes = {
-            s.get("code", "").strip().lower()
-            for sets in current_sets.values()
-            for s in sets
-        }
+            return None
+        if remote is None:
+            set_catalogue.save_meta(meta)
+            return 0
 
-        for item in remote:
-            series = item.get("series") or "Other"
-            code = item.get("id")
-            name = item.get("name")
-            if not code or not name:
-                continue
-            code_key = code.strip().lower()
-            if code_key in existing_codes:
-                continue
-            group = current_sets.setdefault(series, [])
-            group.append({"name": name, "code": code})
-            existing_codes.add(code_key)
-            added += 1
-            new_items.append({"name": name, "code": code})
+        new_items = set_catalogue.merge_into_files(remote)
+        set_catalogue.save_meta(meta)
 
+        added = len(new_items)
         if added:
-            with open(self.sets_file, "w", encoding="utf-8") as f:
-                json.dump(current_sets, f, indent=2, ensure_ascii=False)
             reload_sets()
             names = ", ".join(item["name"] for item in new_items)
-            self.loading_label.configure(
-                text=f"Pobieram symbole setów 0/{added}..."
-            )
-            self.root.update()
+            post_status(self, f"Pobieram symbole setów 0/{added}...")
             self.download_set_symbols(new_items)
             print(f"[INFO] Dodano {added} setów: {names}")
-
-    def log(self, message: str):
-        if self.log_widget:
-            self.log_widget.configure(state="normal")
-            self.log_widget.insert(tk.END, message + "\n")
-            self.log_widget.see(tk.END)
-            self.log_widget.configure(state="disabled")
-        print(message)
-
+        return added
+
+    def log(self, message: str):
+        if self.log_widget:
+            self.log_widget.configure(state="normal")
+            self.log_widget.insert(tk.END, message + "\n")
+            self.log_widget.see(tk.END)
+            self.log_widget.configure(state="disabled")
+        print(message)
+
     def get_price_from_db(self, name, number, set_name):
-        name_input = normalize(name)
-        number_input = number.strip().lower()
-        set_input = set_name.strip().lower()
-
-        for row in self.price_db:
-            if (
-                normalize(row.get("name", "")) == name_input
-                and row.get("number", "").strip().lower() == number_input
-                and row.get("set", "").strip().lower() == set_input
-            ):
-                try:
-                    return float(row.get("price", 0))
-                except (TypeError, ValueError):
-                    return None
-        return None
-
+        return get_pricing(self).price_from_db(name, number, set_name)
+
     def fetch_card_price(self, name, number, set_name, is_reverse=False, is_holo=False):
-        name_api = normalize(name, keep_spaces=True)
-        name_input = normalize(name)
-        number_input = number.strip().lower()
-        set_input = set_name.strip().lower()
-        if set_input == "prismatic evolutions: additionals":
-            set_code = "xpre"
-        else:
-            set_code = get_set_code(set_name)
+        return get_pricing(self).fetch_price(name, number, set_name)
 
-        try:
-            headers = {}
-            if RAPIDAPI_KEY and RAPIDAPI_HOST:
-                url = f"https://{RAPIDAPI_HOST}/cards/search"
-                params = {"search": name_api}
-                headers = {
-                    "X-RapidAPI-Key": RAPIDAPI_KEY,
-                    "X-RapidAPI-Host": RAPIDAPI_HOST,
-                }
-            else:
-                url = "https://www.tcggo.com/api/cards/"
-                params = {
-                    "name": name_api,
-                    "number": number_input,
-                    "set": set_code,
-                }
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-            if response.status_code != 200:
-                print(f"[ERROR] API error: {response.status_code}")
-                return None
-
-            cards = response.json()
-            if isinstance(cards, dict):
-                if "cards" in cards:
-                    cards = cards["cards"]
-                elif "data" in cards:
-                    cards = cards["data"]
-                else:
-                    cards = []
-            candidates = []
-
-            for card in cards:
-                card_name = normalize(card.get("name", ""))
-                card_number = str(card.get("card_number", "")).lower()
-                card_set = str(card.get("episode", {}).get("name", "")).lower()
-
-                name_match = name_input in card_name
-                number_match = number_input == card_number
-                set_match = set_input in card_set or card_set.startswith(set_input)
-
-                if name_match and number_match and set_match:
-                    candidates.append(card)
-
-            if candidates:
-                best = candidates[0]
-                price_eur = extract_cardmarket_price(best)
-                if price_eur is not None:
-                    eur_pln = self.get_exchange_rate()
-                    price_pln = round(float(price_eur) * eur_pln * PRICE_MULTIPLIER, 2)
-                    print(
-                        f"[INFO] Cena {best.get('name')} ({number_input}, {set_input}) = {price_pln} PLN"
-                    )
-                    return price_pln
-
-            print("\n[DEBUG] Nie znaleziono dokładnej karty. Zbliżone:")
-            for card in cards:
-                card_number = str(card.get("card_number", "")).lower()
-                card_set = str(card.get("episode", {}).get("name", "")).lower()
-                if number_input == card_number and set_input in card_set:
-                    print(
-                        f"- {card.get('name')} | {card_number} | {card.get('episode', {}).get('name')}"
-                    )
-
-        except requests.Timeout:
-            print("[ERROR] Request timed out")
-        except Exception as e:
-            print(f"[ERROR] Fetching price from TCGGO failed: {e}")
-        return None
-
     def fetch_card_variants(self, name, number, set_name):
         """Return all matching cards from the API with prices."""
-        name_api = normalize(name, keep_spaces=True)
-        name_input = normalize(name)
-        number_input = number.strip().lower()
-        set_input = set_name.strip().lower()
-        if set_input == "prismatic evolutions: additionals":
-            set_code = "xpre"
-        else:
-            set_code = get_set_code(set_name)
-
-        try:
-            headers = {}
-            if RAPIDAPI_KEY and RAPIDAPI_HOST:
-                url = f"https://{RAPIDAPI_HOST}/cards/search"
-                params = {"search": name_api}
-                headers = {
-                    "X-RapidAPI-Key": RAPIDAPI_KEY,
-                    "X-RapidAPI-Host": RAPIDAPI_HOST,
-                }
-            else:
-                url = "https://www.tcggo.com/api/cards/"
-                params = {
-                    "name": name_api,
-                    "number": number_input,
-                    "set": set_code,
-                }
-
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-            if response.status_code != 200:
-                print(f"[ERROR] API error: {response.status_code}")
-                return []
-
-            cards = response.json()
-            if isinstance(cards, dict):
-                if "cards" in cards:
-                    cards = cards["cards"]
-                elif "data" in cards:
-                    cards = cards["data"]
-                else:
-                    cards = []
-
-            results = []
-            eur_pln = self.get_exchange_rate()
-            for card in cards:
-                card_name = normalize(card.get("name", ""))
-                card_number = str(card.get("card_number", "")).lower()
-                card_set = str(card.get("episode", {}).get("name", "")).lower()
-
-                name_match = name_input in card_name
-                number_match = number_input == card_number
-                set_match = set_input in card_set or card_set.startswith(set_input)
-
-                if name_match and number_match and set_match:
-                    price_eur = extract_cardmarket_price(card)
-                    price_pln = 0
-                    if price_eur is not None:
-                        price_pln = round(
-                            float(price_eur) * eur_pln * PRICE_MULTIPLIER, 2
-                        )
-                    results.append(
-                        {
-                            "name": card.get("name"),
-                            "number": card_number,
-                            "set": card.get("episode", {}).get("name", ""),
-                            "price": price_pln,
-                        }
-                    )
-            return results
-        except requests.Timeout:
-            print("[ERROR] Request timed out")
-        except Exception as e:
-            print(f"[ERROR] Fetching variants from TCGGO failed: {e}")
-        return []
-
+        return get_pricing(self).fetch_variants(name, number, set_name)
+
     def lookup_card_info(self, name, number, set_name, is_holo=False, is_reverse=False):
         """Return image URL and pricing information for the first matching card."""
-        name_api = normalize(name, keep_spaces=True)
-        name_input = normalize(name)
-        number_input = number.strip().lower()
-        set_input = set_name.strip().lower()
-        if set_input == "prismatic evolutions: additionals":
-            set_code = "xpre"
-        else:
-            set_code = get_set_code(set_name)
+        return get_pricing(self).lookup(
+            name, number, set_name, is_holo=is_holo, is_reverse=is_reverse
+        )
 
-        try:
-            headers = {}
-            if RAPIDAPI_KEY and RAPIDAPI_HOST:
-                url = f"https://{RAPIDAPI_HOST}/cards/search"
-                params = {"search": name_api}
-                headers = {
-                    "X-RapidAPI-Key": RAPIDAPI_KEY,
-                    "X-RapidAPI-Host": RAPIDAPI_HOST,
-                }
+    def fetch_card_data(self):
+        name = self.entries["nazwa"].get()
+        number = self.entries["numer"].get()
+        set_name = self.entries["set"].get()
+
+        is_reverse = self.type_vars["Reverse"].get()
+        is_holo = self.type_vars["Holo"].get()
+
+        cena = self.get_price_from_db(name, number, set_name)
+        if cena is not None:
+            cena = self.apply_variant_multiplier(
+                cena, is_reverse=is_reverse, is_holo=is_holo
+            )
+            self.entries["cena"].delete(0, tk.END)
+            self.entries["cena"].insert(0, str(cena))
+            self.log(f"Price for {name} {number}: {cena} zł")
+        else:
+            fetched = self.fetch_card_price(name, number, set_name)
+            if fetched is not None:
+                fetched = self.apply_variant_multiplier(
+                    fetched, is_reverse=is_reverse, is_holo=is_holo
+                )
+                self.entries["cena"].delete(0, tk.END)
+                self.entries["cena"].insert(0, str(fetched))
+                self.log(f"Price for {name} {number}: {fetched} zł")
             else:
-                url = "https://www.tcggo.com/api/cards/"
-                params = {"name": name_api, "number": number_input, "set": set_code}
-
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-            if response.status_code != 200:
-                print(f"[ERROR] API error: {response.status_code}")
-                return None
-
-            cards = response.json()
-            if isinstance(cards, dict):
-                if "cards" in cards:
-                    cards = cards["cards"]
-                elif "data" in cards:
-                    cards = cards["data"]
-                else:
-                    cards = []
-
-            for card in cards:
-                card_name = normalize(card.get("name", ""))
-                card_number = str(card.get("card_number", "")).lower()
-                card_set = str(card.get("episode", {}).get("name", "")).lower()
-
-                name_match = name_input in card_name
-                number_match = number_input == card_number
-                set_match = set_input in card_set or card_set.startswith(set_input)
-
-                if name_match and number_match and set_match:
-                    price_eur = extract_cardmarket_price(card) or 0
-                    base_rate = self.get_exchange_rate()
-                    eur_pln = base_rate * PRICE_MULTIPLIER
-                    price_pln = round(float(price_eur) * eur_pln, 2)
-                    if is_holo or is_reverse:
-                        price_pln = round(price_pln * HOLO_REVERSE_MULTIPLIER, 2)
-                    set_info = card.get("episode") or card.get("set") or {}
-                    images = (
-                        set_info.get("images", {}) if isinstance(set_info, dict) else {}
-                    )
-                    set_logo = (
-                        images.get("logo")
-                        or images.get("logoUrl")
-                        or images.get("logo_url")
-                        or set_info.get("logo")
-                    )
-                    image_url = (
-                        card.get("images", {}).get("large")
-                        or card.get("image")
-                        or card.get("imageUrl")
-                        or card.get("image_url")
-                    )
-                    return {
-                        "image_url": image_url,
-                        "set_logo_url": set_logo,
-                        "price_eur": round(float(price_eur), 2),
-                        "eur_pln_rate": round(base_rate, 4),
-                        "price_pln": price_pln,
-                        "price_pln_80": round(price_pln * 0.8, 2),
-                    }
-        except requests.Timeout:
-            print("[ERROR] Request timed out")
-        except Exception as e:
-            print(f"[ERROR] Lookup failed: {e}")
-        return None
-
-    def fetch_card_data(self):
-        name = self.entries["nazwa"].get()
-        number = self.entries["numer"].get()
-        set_name = self.entries["set"].get()
-
-        is_reverse = self.type_vars["Reverse"].get()
-        is_holo = self.type_vars["Holo"].get()
-
-        cena = self.get_price_from_db(name, number, set_name)
-        if cena is not None:
-            cena = self.apply_variant_multiplier(
-                cena, is_reverse=is_reverse, is_holo=is_holo
-            )
-            self.entries["cena"].delete(0, tk.END)
-            self.entries["cena"].insert(0, str(cena))
-            self.log(f"Price for {name} {number}: {cena} zł")
-        else:
-            fetched = self.fetch_card_price(name, number, set_name)
-            if fetched is not None:
-                fetched = self.apply_variant_multiplier(
-                    fetched, is_reverse=is_reverse, is_holo=is_holo
-                )
-                self.entries["cena"].delete(0, tk.END)
-                self.entries["cena"].insert(0, str(fetched))
-                self.log(f"Price for {name} {number}: {fetched} zł")
-            else:
-                messagebox.showinfo(
-                    "Brak wyników",
-                    "Nie znaleziono ceny dla podanej karty w bazie danych.",
-                )
-                self.log(f"Card {name} {number} not found")
-
-    def show_variants(self):
-        """Display a list of matching cards from the API."""
-        name = self.entries["nazwa"].get()
-        number = self.entries["numer"].get()
-        set_name = self.entries["set"].get()
-
-        is_reverse = self.type_vars["Reverse"].get()
-        is_holo = self.type_vars["Holo"].get()
-
-        variants = self.fetch_card_variants(name, number, set_name)
-        if not variants:
-            messagebox.showinfo("Brak wyników", "Nie znaleziono dodatkowych wariantów.")
-            self.open_cardmarket_search()
-            return
-
+                messagebox.showinfo(
+                    "Brak wyników",
+                    "Nie znaleziono ceny dla podanej karty w bazie danych.",
+                )
+                self.log(f"Card {name} {number} not found")
+
+    def show_variants(self):
+        """Display a list of matching cards from the API."""
+        name = self.entries["nazwa"].get()
+        number = self.entries["numer"].get()
+        set_name = self.entries["set"].get()
+
+        is_reverse = self.type_vars["Reverse"].get()
+        is_holo = self.type_vars["Holo"].get()
+
+        variants = self.fetch_card_variants(name, number, set_name)
+        if not variants:
+            messagebox.showinfo("Brak wyników", "Nie znaleziono dodatkowych wariantów.")
+            self.open_cardmarket_search()
+            return
+
         top = ctk.CTkToplevel(self.root)
-        top.title("Inne warianty")
-        top.geometry("600x400")
-
+        top.title("Inne warianty")
+        top.geometry("600x400")
+
         logo_path = os.path.join(os.path.dirname(__file__), "banner22.png")
         if os.path.exists(logo_path):
             logo_img = Image.open(logo_path)
             logo_img.thumbnail((140, 140))
             top.logo_image = ctk.CTkImage(light_image=logo_img, size=logo_img.size)
             ctk.CTkLabel(top, image=top.logo_image, text="").pack(pady=(10, 10))
-
-        columns = ("name", "number", "set", "price")
-        tree = ttk.Treeview(top, columns=columns, show="headings")
-        tree.heading("name", text="Nazwa")
-        tree.heading("number", text="Numer")
-        tree.heading("set", text="Set")
-        tree.heading("price", text="Cena (PLN)")
-
-        for card in variants:
-            price = self.apply_variant_multiplier(
-                card["price"], is_reverse=is_reverse, is_holo=is_holo
-            )
-            tree.insert(
-                "", "end", values=(card["name"], card["number"], card["set"], price)
-            )
-
-        tree.pack(expand=True, fill="both", padx=10, pady=10)
-
-        def set_selected_price(event=None):
-            selected = tree.selection()
-            if not selected:
-                return
-            values = tree.item(selected[0], "values")
-            self.entries["cena"].delete(0, tk.END)
-            self.entries["cena"].insert(0, values[3])
-            top.destroy()
-
+
+        columns = ("name", "number", "set", "price")
+        tree = ttk.Treeview(top, columns=columns, show="headings")
+        tree.heading("name", text="Nazwa")
+        tree.heading("number", text="Numer")
+        tree.heading("set", text="Set")
+        tree.heading("price", text="Cena (PLN)")
+
+        for card in variants:
+            price = self.apply_variant_multiplier(
+                card["price"], is_reverse=is_reverse, is_holo=is_holo
+            )
+            tree.insert(
+                "", "end", values=(card["name"], card["number"], card["set"], price)
+            )
+
+        tree.pack(expand=True, fill="both", padx=10, pady=10)
+
+        def set_selected_price(event=None):
+            selected = tree.selection()
+            if not selected:
+                return
+            values = tree.item(selected[0], "values")
+            self.entries["cena"].delete(0, tk.END)
+            self.entries["cena"].insert(0, values[3])
+            top.destroy()
+
         self.create_button(top, text="Ustaw cenę", command=set_selected_price).pack(pady=5)
-        tree.bind("<Double-1>", set_selected_price)
-
-    def open_cardmarket_search(self):
-        """Open a Cardmarket search for the current card in the default browser."""
-        name = self.entries["nazwa"].get()
-        number = self.entries["numer"].get()
-        search_terms = " ".join(t for t in [name, number] if t)
-        params = urlencode({"searchString": search_terms})
-        url = f"https://www.cardmarket.com/en/Pokemon/Products/Search?{params}"
-        webbrowser.open(url)
-
-    def get_exchange_rate(self):
-        try:
-            res = requests.get(
-                "https://api.nbp.pl/api/exchangerates/rates/A/EUR/?format=json",
-                timeout=10,
-            )
-            if res.status_code == 200:
-                return res.json()["rates"][0]["mid"]
-        except requests.Timeout:
-            print("[ERROR] Exchange rate request timed out")
-        except Exception:
-            pass
-        return 4.265
-
+        tree.bind("<Double-1>", set_selected_price)
+
+    def open_cardmarket_search(self):
+        """Open a Cardmarket search for the current card in the default browser."""
+        name = self.entries["nazwa"].get()
+        number = self.entries["numer"].get()
+        search_terms = " ".join(t for t in [name, number] if t)
+        params = urlencode({"searchString": search_terms})
+        url = f"https://www.cardmarket.com/en/Pokemon/Products/Search?{params}"
+        webbrowser.open(url)
+
+    def get_exchange_rate(self):
+        return get_pricing(self).exchange_rate()
+
     def apply_variant_multiplier(self, price, is_reverse=False, is_holo=False):
         """Apply holo/reverse or special variant multiplier when needed."""
-        if price is None:
-            return None
-        multiplier = 1
-        if is_reverse or is_holo:
-            multiplier *= HOLO_REVERSE_MULTIPLIER
-
         types = getattr(self, "type_vars", {})
-        try:
-            if types.get("Masterball") and types["Masterball"].get():
-                multiplier *= MASTERBALL_MULTIPLIER
-            elif types.get("Pokeball") and types["Pokeball"].get():
-                multiplier *= POKEBALL_MULTIPLIER
-
-            return round(float(price) * multiplier, 2)
-        except (TypeError, ValueError):
-            return price
+        return pricing.apply_variant_multiplier(
+            price,
+            is_reverse=is_reverse,
+            is_holo=is_holo,
+            pokeball=bool(types.get("Pokeball") and types["Pokeball"].get()),
+            masterball=bool(types.get("Masterball") and types["Masterball"].get()),
+        )
 
     def save_current_data(self):
         """Store the data for the currently displayed card without changing
         the index."""
-        data = {k: v.get() for k, v in self.entries.items()}
-        data["typ"] = ",".join(
-            [name for name, var in self.type_vars.items() if var.get()]
-        )
-        data["rarity"] = ",".join([k for k, v in self.rarity_vars.items() if v.get()])
-        key = f"{data['nazwa']}|{data['numer']}|{data['set']}"
-        data["ilość"] = 1
-        self.card_cache[key] = {
-            "entries": {k: v for k, v in data.items()},
-            "types": {name: var.get() for name, var in self.type_vars.items()},
-            "rarities": {name: var.get() for name, var in self.rarity_vars.items()},
-        }
-
-        front_path = self.cards[self.index]
-        front_file = os.path.basename(front_path)
-        self.file_to_key[front_file] = key
-
-        data["image1"] = f"{BASE_IMAGE_URL}/{self.folder_name}/{front_file}"
-        if key not in self.product_code_map:
-            self.product_code_map[key] = self.next_product_code
-            self.next_product_code += 1
-        data["product_code"] = self.product_code_map[key]
-        prev = None
-        if 0 <= self.index < len(self.output_data):
-            existing = self.output_data[self.index]
-            if isinstance(existing, dict):
-                prev = existing.get("warehouse_code")
-        data["warehouse_code"] = prev or self.next_free_location()
-        data["active"] = 1
-        data["vat"] = "23%"
-        data["unit"] = "szt."
-        data["category"] = f"Karty Pokémon > {data['set']}"
-        data["producer"] = "Pokémon"
-        data["other_price"] = ""
-        data["pkwiu"] = ""
-        data["weight"] = 0.01
-        data["priority"] = 0
-
-        name = html.escape(data["nazwa"])
-        number = html.escape(data["numer"])
-        set_name = html.escape(data["set"])
-        card_type = html.escape(data["typ"])
-        condition = html.escape(data["stan"])
-
-        data["short_description"] = (
-            f"<p><strong>{name}</strong></p>"
-            "<ul>"
-            f"<li>Zestaw: {set_name}</li>"
-            f"<li>Numer karty: {number}</li>"
-            f"<li>Typ: {card_type}</li>"
-            f"<li>Stan: {condition}</li>"
-            "</ul>"
-        )
-
-        desc_paragraphs = [
-            f"{name} – Pokémon TCG",
-            f"Karta pochodzi z zestawu {set_name} i ma numer {number}. Typ karty: {card_type}. Stan: {condition}.",
-            "Każda karta jest dokładnie sprawdzana przed wysyłką i odpowiednio zabezpieczana – trafia do Ciebie w idealnym stanie, gotowa do gry lub kolekcji.",
-            "Zdjęcia przedstawiają rzeczywisty produkt lub jego odpowiednik. Jeśli szukasz więcej kart z tego setu – sprawdź pozostałe oferty.",
-        ]
-        data["description"] = "".join(f"<p>{p}</p>" for p in desc_paragraphs)
-
-        data["stock_warnlevel"] = 0
-        data["availability"] = 1
-        data["delivery"] = SHOPER_DELIVERY_ID
-        data["views"] = ""
-        data["rank"] = ""
-        data["rank_votes"] = ""
-
-        cena_local = self.get_price_from_db(data["nazwa"], data["numer"], data["set"])
-        is_reverse = self.type_vars["Reverse"].get()
-        is_holo = self.type_vars["Holo"].get()
-        if cena_local is not None:
-            cena_local = self.apply_variant_multiplier(
-                cena_local, is_reverse=is_reverse, is_holo=is_holo
-            )
-            data["cena"] = str(cena_local)
-        else:
-            fetched = self.fetch_card_price(
-                data["nazwa"],
-                data["numer"],
-                data["set"],
-            )
-            if fetched is not None:
-                fetched = self.apply_variant_multiplier(
-                    fetched, is_reverse=is_reverse, is_holo=is_holo
-                )
-                data["cena"] = str(fetched)
-            else:
-                data["cena"] = ""
+        store_card(
+            self,
+            self.index,
+            {k: v.get() for k, v in self.entries.items()},
+            {name: var.get() for name, var in self.type_vars.items()},
+            {name: var.get() for name, var in self.rarity_vars.items()},
+            BASE_IMAGE_URL,
+            SHOPER_DELIVERY_ID,
+        )
+        session_journal = getattr(self, "journal", None)
+        if session_journal is not None:
+            try:
+                session_journal.record(self, self.index)
+            except OSError as e:
+                print(f"[WARN] Cannot write session journal: {e}")
 
-        self.output_data[self.index] = data
-
     def save_and_next(self):
         """Save the current card data and display the next scan."""
         self.save_current_data()
@@ -2971,11 +2672,11 @@ class CardEditorApp:
                     self.output_data.remove(row)
                 break
         self.repack_column(box, column)
-
+
     def load_csv_data(self):
         """Load a CSV file and merge duplicate rows."""
         csv_utils.load_csv_data(self)
-
+
     def export_csv(self):
         self.in_scan = False
         csv_utils.export_csv(self)
@@ -2991,15 +2692,73 @@ class CardEditorApp:
         if not host or not user or not password:
             messagebox.showerror("Błąd", "Nie podano pełnych danych logowania")
             return
-        try:
-            with FTPClient(host, user, password) as ftp:
-                ftp.upload_directory(directory)
-            messagebox.showinfo("Sukces", "Obrazy zostały wysłane na serwer FTP")
-        except Exception as exc:
-            messagebox.showerror("Błąd", f"Nie udało się wysłać obrazów: {exc}")
+        top = ctk.CTkToplevel(self.root)
+        top.title("FTP Obrazy")
+        status = ctk.CTkLabel(top, text="Łączenie...", text_color=TEXT_COLOR)
+        status.pack(padx=20, pady=(20, 5))
+        bar = ctk.CTkProgressBar(top, width=360)
+        bar.set(0)
+        bar.pack(padx=20, pady=(0, 20))
+        started = time.perf_counter()
+        last_update = [0.0]
+
+        def show_progress(sent, total, name):
+            now = time.perf_counter()
+            if now - last_update[0] < 0.2 and sent < total:
+                return
+            last_update[0] = now
+            elapsed = max(now - started, 1e-6)
+            text = (
+                f"{sent / 1e6:.1f}/{total / 1e6:.1f} MB"
+                f" | {sent / 1e6 / elapsed:.2f} MB/s | {name}"
+            )
+            fraction = sent / total if total else 1
+            self.root.after(0, lambda: (bar.set(fraction), status.configure(text=text)))
+
+        def finish(summary=None, error=None):
+            top.destroy()
+            if error is not None:
+                messagebox.showerror("Błąd", f"Nie udało się wysłać obrazów: {error}")
+                return
+            counts = {
+                kind: f"nowe: {r['uploaded']}, wznowione: {r['resumed']}, pominięte: {r['skipped']}"
+                for kind, r in summary.items()
+            }
+            messagebox.showinfo(
+                "Sukces",
+                "Obrazy zostały wysłane na serwer FTP\n"
+                f"Zdjęcia – {counts['web']}\n"
+                f"Wycinki do rozpoznawania – {counts['rec']}",
+            )
+
+        def show_processing(done, total):
+            text = f"Przetwarzanie obrazów {done}/{total}"
+            self.root.after(0, lambda: (bar.set(done / total), status.configure(text=text)))
+
+        def run():
+            try:
+                derivatives.build_derivatives(directory, progress=show_processing)
+                out_dir = derivatives.derivatives_dir(directory)
+                with FTPClient(host, user, password) as ftp:
+                    summary = {
+                        "web": ftp.upload_directory(
+                            os.path.join(out_dir, "web"), progress=show_progress
+                        ),
+                        "rec": ftp.upload_directory(
+                            os.path.join(out_dir, "rec"), "rec", progress=show_progress
+                        ),
+                    }
+                # OpenAI is sent the rec/ copies from now on
+                derivatives.mark_recognition_uploaded(directory)
+            except Exception as exc:
+                self.root.after(0, lambda err=exc: finish(error=err))
+                return
+            self.root.after(0, lambda: finish(summary))
+
+        threading.Thread(target=run, daemon=True).start()
 
     def send_csv_to_shoper(self, file_path: str):
         """Send a CSV file using the Shoper API or FTP fallback."""
-        csv_utils.send_csv_to_shoper(self, file_path)
-
-
+        return csv_utils.send_csv_to_shoper(self, file_path)
+
+
@@ -5,7 +5,7 @@ import requests
 class ShoperClient:
     """Minimal wrapper for Shoper REST API."""
 
-    def __init__(self, base_url=None, token=None):
+    def __init__(self, base_url=None, token=None, timeout=15):
         env_url = os.getenv("SHOPER_API_URL", "").strip()
         self.base_url = (base_url or env_url).rstrip("/")
         # Ensure the URL points to the REST endpoint
@@ -13,6 +13,7 @@ class ShoperClient:
             self.base_url = f"{self.base_url}/webapi/rest"
         env_token = os.getenv("SHOPER_API_TOKEN", "").strip()
         self.token = token or env_token
+        self.timeout = timeout
         if not self.base_url or not self.token:
             raise ValueError("SHOPER_API_URL or SHOPER_API_TOKEN not set")
         self.session = requests.Session()
@@ -33,8 +34,9 @@ class ShoperClient:
         """
 
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        kwargs.setdefault("timeout", self.timeout)
         try:
-            resp = self.session.request(method, url, timeout=15, **kwargs)
+            resp = self.session.request(method, url, **kwargs)
             resp.raise_for_status()
             if resp.text:
                 return resp.json()
@@ -98,8 +100,14 @@ class ShoperClient:
             print("[INFO] orders/stats unavailable")
             return {}
 
-    def import_csv(self, file_path):
-        """Upload a CSV file using the Shoper API."""
+    def import_csv(self, file_path, timeout=None):
+        """Upload a CSV file using the Shoper API.
+
+        Large exports should be split with ``csv_utils.split_csv`` first so a
+        single request stays well below ``timeout``.
+        """
         with open(file_path, "rb") as fh:
             files = {"file": (os.path.basename(file_path), fh, "text/csv")}
-            return self.post("import/csv", files=files)
+            return self.post(
+                "import/csv", files=files, timeout=timeout or self.timeout
+            )
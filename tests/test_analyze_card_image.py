@@ -46,7 +46,7 @@ def test_show_card_uses_analyzer(tmp_path):
     dummy.stop_scan_animation = lambda *a, **k: None
     dummy._analyze_and_fill = lambda url, idx: ui.CardEditorApp._apply_analysis_result(dummy, ui.analyze_card_image(url), idx)
 
-    with patch.object(ui.Image, "open", return_value=MagicMock(thumbnail=lambda *a, **k: None)), \
+    with patch.object(ui.thumbnails, "load", return_value=MagicMock()), \
          patch.object(ui.ImageTk, "PhotoImage", return_value=MagicMock()), \
         patch.object(ui, "analyze_card_image", return_value={"name": "Pika", "number": "001", "suffix": "V"}) as mock_analyze:
         ui.CardEditorApp.show_card(dummy)
@@ -146,6 +146,8 @@ def test_analyze_and_fill_translates_for_jp(monkeypatch):
         update_set_options=lambda: None,
     )
     dummy._apply_analysis_result = ui.CardEditorApp._apply_analysis_result.__get__(dummy, ui.CardEditorApp)
+    dummy._translate_names = ui.CardEditorApp._translate_names.__get__(dummy, ui.CardEditorApp)
+    dummy._recognize_scan = ui.CardEditorApp._recognize_scan.__get__(dummy, ui.CardEditorApp)
 
     resp_analyze = SimpleNamespace(
         choices=[
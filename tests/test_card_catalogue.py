@@ -0,0 +1,128 @@
+import importlib
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.modules.setdefault("customtkinter", MagicMock())
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+import kartoteka.ui as ui
+importlib.reload(ui)
+from kartoteka.core import CardCatalogue
+from kartoteka.core.catalogue import normalize_number
+
+
+def api_card(name, number):
+    return {
+        "name": name,
+        "number": number,
+        "images": {"small": f"https://img/{number}.png", "large": f"https://img/{number}_hires.png"},
+    }
+
+
+def make_catalogue(tmp_path):
+    cat = CardCatalogue(str(tmp_path / "cards.db"))
+    cat.add_cards("sv3pt5", [
+        api_card("Bulbasaur", "1"),
+        api_card("Charizard ex", "6"),
+        api_card("Pikachu", "25"),
+        api_card("Mew ex", "151"),
+    ])
+    return cat
+
+
+def test_set_and_number_resolve_name_suffix_and_image(tmp_path):
+    cat = make_catalogue(tmp_path)
+    card = cat.lookup("SV3PT5", "006/165")
+    assert card["name"] == "Charizard"
+    assert card["suffix"] == "EX"
+    assert card["image"] == "https://img/6_hires.png"
+    assert cat.lookup("sv3pt5", "999") is None
+    assert [c["number"] for c in cat.find("mew")] == ["151"]
+    assert normalize_number("TG05") == "TG05"
+
+
+def test_tcggo_cards_are_understood(tmp_path):
+    cat = CardCatalogue(str(tmp_path / "cards.db"))
+    assert cat.add_cards("base1", [{"name": "Alakazam", "card_number": 1, "image": "a.png"}]) == 1
+    assert cat.lookup("base1", "01")["image"] == "a.png"
+
+
+def test_validate_fills_corrects_and_flags(tmp_path):
+    cat = make_catalogue(tmp_path)
+
+    filled = cat.validate({"name": "", "number": "6"}, "sv3pt5")
+    assert filled["name"] == "Charizard" and filled["suffix"] == "EX"
+    assert filled["validated"] is True
+
+    # agreeing values are kept as recognised
+    kept = cat.validate({"name": "pikachu", "number": "025/165"}, "sv3pt5")
+    assert kept == {"name": "pikachu", "number": "025/165", "suffix": "", "validated": True}
+
+    # the name identifies the card, so the misread number is corrected
+    corrected = cat.validate({"name": "Pikachu", "number": "52"}, "sv3pt5")
+    assert corrected["number"] == "25" and corrected["validated"] is True
+
+    wrong = cat.validate({"name": "Raichu", "number": "1"}, "sv3pt5")
+    assert wrong["validated"] is False
+    assert wrong["catalogue_name"] == "Bulbasaur"
+
+    # sets missing from the catalogue are not judged
+    assert cat.validate({"name": "Raichu", "number": "1"}, "base1") == {
+        "name": "Raichu", "number": "1"
+    }
+
+
+def test_sync_set_pages_through_the_api(tmp_path):
+    cat = CardCatalogue(str(tmp_path / "cards.db"))
+    pages = {1: [api_card(f"Card {i}", str(i)) for i in range(1, 251)], 2: [api_card("Mew", "251")]}
+
+    def fake_get(url, params=None, **kwargs):
+        return SimpleNamespace(status_code=200, json=lambda: {"data": pages[params["page"]]})
+
+    with patch("requests.get", side_effect=fake_get) as get:
+        assert cat.sync_set("sv3pt5") == 251
+    assert get.call_count == 2
+    assert get.call_args.kwargs["params"]["q"] == "set.id:sv3pt5"
+    assert cat.has_set("sv3pt5")
+    assert cat.lookup("sv3pt5", "251")["name"] == "Mew"
+
+
+def test_interrupted_sync_does_not_mark_the_set(tmp_path):
+    cat = CardCatalogue(str(tmp_path / "cards.db"))
+    first = [api_card(f"Card {i}", str(i)) for i in range(1, 251)]
+
+    def fake_get(url, params=None, **kwargs):
+        if params["page"] == 1:
+            return SimpleNamespace(status_code=200, json=lambda: {"data": first})
+        return SimpleNamespace(status_code=500, json=lambda: {})
+
+    with patch("requests.get", side_effect=fake_get):
+        assert cat.sync_set("sv3pt5") == 250
+    # the set is downloaded again next time instead of being judged on half
+    assert not cat.has_set("sv3pt5")
+    assert cat.validate({"name": "Raichu", "number": "1"}, "sv3pt5") == {
+        "name": "Raichu", "number": "1"
+    }
+
+
+def test_editor_fills_name_from_number(tmp_path):
+    entries = {"nazwa": MagicMock(), "numer": MagicMock()}
+    entries["nazwa"].get.return_value = ""
+    entries["numer"].get.return_value = "6"
+    dummy = SimpleNamespace(
+        card_catalogue=make_catalogue(tmp_path),
+        entries=entries,
+        set_var=MagicMock(get=lambda: "151"),
+        suffix_var=MagicMock(get=lambda: ""),
+    )
+    card = ui.CardEditorApp.fill_from_catalogue(dummy)
+    assert card["name"] == "Charizard"
+    entries["nazwa"].insert.assert_called_once_with(0, "Charizard")
+    dummy.suffix_var.set.assert_called_once_with("EX")
+
+    # a name that is not an exact set name is not looked up
+    dummy.set_var = MagicMock(get=lambda: "1511")
+    entries["nazwa"].insert.reset_mock()
+    assert ui.CardEditorApp.fill_from_catalogue(dummy) is None
+    entries["nazwa"].insert.assert_not_called()
@@ -0,0 +1,45 @@
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from kartoteka.core import export, templates
+from kartoteka.core.record import CardRecord
+
+FIELDS = {"nazwa": "Pika & Chu", "numer": "25", "set": "Base", "stan": "NM", "typ": "Holo", "suffix": ""}
+
+
+def test_row_behaves_like_the_old_dictionary():
+    row = export.build_card_row(dict(FIELDS), "https://img/a.jpg", 7, "K01R1P0001", delivery_id=2, price=3.5)
+    assert row["cena"] == "3.5"
+    assert row["vat"] == "23%" and row["producer"] == "Pokémon"
+    assert row["category"] == "Karty Pokémon > Base"
+    assert row.get("missing", "x") == "x"
+    data = dict(row)
+    assert data["delivery"] == 2 and data["image1"] == "https://img/a.jpg"
+    assert "Pika &amp; Chu" in data["short_description"]
+    assert export.shoper_row(row, stock=1)["name"] == "Pika & Chu 25"
+
+    row["stock"] = 2
+    row["vat"] = "8%"
+    assert row["stock"] == 2 and row["vat"] == "8%"
+    copy = row.copy()
+    copy["warehouse_code"] = "K01R1P0002"
+    assert row["warehouse_code"] == "K01R1P0001"
+    assert json.loads(json.dumps(row.fields()))["product_code"] == 7
+
+
+def test_descriptions_are_rendered_once_and_follow_changes():
+    row = CardRecord(FIELDS)
+    with patch.object(templates, "render_descriptions", wraps=templates.render_descriptions) as render:
+        assert "Stan: NM" in row["short_description"]
+        assert "Holo" in row["description"]
+        assert render.call_count == 1
+        row["cena"] = "1"
+        row["description"]
+        assert render.call_count == 1
+        row["stan"] = "LP"
+        assert "Stan: LP" in row["short_description"]
+        assert render.call_count == 2
+    assert not hasattr(row, "__dict__")
@@ -0,0 +1,62 @@
+import importlib
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.modules.setdefault("customtkinter", MagicMock())
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+import kartoteka.ui as ui
+importlib.reload(ui)
+from kartoteka import cheat_sheet
+
+
+def test_visible_rows_cover_only_the_viewport():
+    assert cheat_sheet.visible_rows(0, 440, 1000) == (0, 12)
+    assert cheat_sheet.visible_rows(44 * 500 + 10, 440, 1000) == (500, 12)
+    assert cheat_sheet.visible_rows(44 * 995, 440, 1000) == (995, 5)
+    assert cheat_sheet.visible_rows(0, 440, 3) == (0, 3)
+
+
+def test_flatten_sets_with_headers():
+    rows = cheat_sheet.flatten_sets({"SV": [{"name": "One", "code": "sv1"}]})
+    assert rows == [("header", "SV", None), ("set", "One (sv1)", "sv1")]
+    assert len(cheat_sheet.flatten_sets({"SV": [{"name": "One", "code": "sv1"}]}, False)) == 1
+
+
+def test_cheat_sheets_are_cached_per_language():
+    lang = MagicMock()
+    dummy = SimpleNamespace(
+        frame=MagicMock(),
+        root=MagicMock(),
+        lang_var=lang,
+        set_logos={},
+        cheat_frame=None,
+    )
+    with patch.object(ui.cheat_sheet, "CheatSheet") as sheet_cls:
+        sheet_cls.side_effect = lambda master, *a, **k: MagicMock(master=master)
+        lang.get.return_value = "ENG"
+        ui.CardEditorApp.create_cheat_frame(dummy)
+        eng = dummy.cheat_frame
+        lang.get.return_value = "JP"
+        ui.CardEditorApp.create_cheat_frame(dummy)
+        jp = dummy.cheat_frame
+        lang.get.return_value = "ENG"
+        ui.CardEditorApp.create_cheat_frame(dummy)
+        assert dummy.cheat_frame is eng
+        assert sheet_cls.call_count == 2
+        eng.grid_remove.assert_called_once()
+        jp.grid_remove.assert_called_once()
+
+        # a new catalogue refreshes the rows without rebuilding the widget
+        with patch.object(ui, "tcg_sets_eng_by_era", {"SV": [{"name": "X", "code": "x"}]}):
+            ui.CardEditorApp.create_cheat_frame(dummy)
+        eng.set_rows.assert_called_once_with(
+            [("header", "SV", None), ("set", "X (x)", "x")]
+        )
+        assert sheet_cls.call_count == 2
+
+        # a new main frame needs new widgets
+        dummy.frame = MagicMock()
+        ui.CardEditorApp.create_cheat_frame(dummy)
+        assert sheet_cls.call_count == 3
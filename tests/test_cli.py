@@ -0,0 +1,87 @@
+import csv
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from kartoteka import cli, storage
+from kartoteka.core import CardCatalogue, PricingService, ProductRegistry
+from kartoteka.core.session import load_review, review_path
+from kartoteka.set_search import SetSearchIndex
+
+RESULTS = {
+    "a.jpg": {"name": "Pikachu", "number": "25", "set": "Base"},
+    "b.jpg": {"name": "", "number": "4", "set": "Base"},
+    "c.jpg": {"name": "Charmander", "number": "46", "set": "Base"},
+}
+
+
+class FakeRecognition:
+    def recognize(self, path, translate_name=False):
+        return dict(RESULTS[Path(path).name])
+
+
+def test_location_index_round_trips():
+    assert storage.location_index("K02R3P0010") == 4000 + 2000 + 9
+    assert storage.generate_location(storage.location_index("K01R4P1000")) == "K01R4P1000"
+    assert storage.location_index("K01R5P0001") is None
+    assert storage.location_index("nonsense") is None
+
+
+def test_batch_exports_confident_cards_and_flags_the_rest(tmp_path):
+    for name in RESULTS:
+        (tmp_path / name).write_bytes(b"x")
+    service = PricingService(
+        price_db=[{"name": "Pikachu", "number": "25", "set": "Base", "price": "10"}]
+    )
+    card_catalogue = CardCatalogue(str(tmp_path / "cards.db"))
+    card_catalogue.add_cards("base1", [
+        {"name": "Charizard", "number": "4"},
+        {"name": "Pikachu", "number": "25"},
+        {"name": "Charmander", "number": "46"},
+    ])
+    out = tmp_path / "out.csv"
+    with patch.object(cli, "load_price_db", return_value=service.price_db), \
+            patch.object(cli.set_catalogue, "load_set_index",
+                         return_value=SetSearchIndex([("Base", "base1")])), \
+            patch.object(cli.recognition, "RecognitionService",
+                         return_value=FakeRecognition()), \
+            patch.object(cli.registry, "ProductRegistry",
+                         return_value=ProductRegistry(str(tmp_path / "products.db"))), \
+            patch.object(cli.catalogue, "CardCatalogue", return_value=card_catalogue), \
+            patch.object(PricingService, "prefetch_set", return_value=0) as prefetch, \
+            patch.object(PricingService, "fetch_price", return_value=None):
+        code = cli.main([
+            "batch", str(tmp_path), "--start", "K01R2P0005",
+            "--output", str(out), "--workers", "2",
+        ])
+    assert code == 0
+    prefetch.assert_called_with("Base")
+
+    with open(out, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f, delimiter=";"))
+    assert [r["name"] for r in rows] == ["Pikachu 25"]
+    assert rows[0]["warehouse_code"] == "K01R2P0005"
+    assert rows[0]["price"] == "10.0"
+
+    review = load_review(str(tmp_path))
+    assert review["next_location"] == "K01R2P0006"
+    flagged = {c["file"]: c for c in review["cards"]}
+    assert set(flagged) == {"b.jpg", "c.jpg"}
+    # the name missing from the scan comes from the catalogue
+    assert flagged["b.jpg"]["entries"]["nazwa"] == "Charizard"
+    assert flagged["b.jpg"]["reasons"] == ["brak ceny"]
+    assert flagged["c.jpg"]["reasons"] == ["brak ceny"]
+    assert flagged["c.jpg"]["entries"]["nazwa"] == "Charmander"
+    assert json.loads(Path(review_path(str(tmp_path))).read_text(encoding="utf-8"))
+
+
+def test_batch_rejects_invalid_start(tmp_path, capsys):
+    assert cli.main(["batch", str(tmp_path), "--start", "K1"]) == 2
+    assert "Invalid warehouse code" in capsys.readouterr().out
+
+
+def test_review_flags_cards_that_contradict_the_catalogue():
+    result = {"name": "Raichu", "number": "25", "set": "Base", "validated": False}
+    assert cli.review_reasons(result, 10.0, None, 0.0) == ["niezgodny z katalogiem"]
@@ -0,0 +1,86 @@
+import csv
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from kartoteka.core import CardSession, PricingService
+from kartoteka.core import recognition
+
+
+def api_response(cards):
+    return SimpleNamespace(status_code=200, json=lambda: cards)
+
+
+def test_session_builds_and_exports_rows_without_gui(tmp_path):
+    for name in ("b.jpg", "a.jpg", "notes.txt"):
+        (tmp_path / name).write_bytes(b"x")
+    service = PricingService(
+        price_db=[{"name": "Pikachu", "number": "25", "set": "Base", "price": "10"}]
+    )
+    session = CardSession.from_folder(
+        str(tmp_path), starting_idx=4000, pricing_service=service,
+        base_image_url="https://img", delivery_id=3,
+    )
+    assert [Path(p).name for p in session.cards] == ["a.jpg", "b.jpg"]
+
+    fields = {"nazwa": "Pikachu", "numer": "25", "set": "Base", "stan": "NM", "suffix": ""}
+    row = session.save_card(0, fields, types={"Reverse": True, "Holo": False})
+    assert row["cena"] == str(10 * 3.5)
+    assert row["warehouse_code"] == "K02R1P0001"
+    assert row["image1"] == f"https://img/{tmp_path.name}/a.jpg"
+    assert row["delivery"] == 3
+    session.save_card(1, fields)
+    assert session.output_data[1]["warehouse_code"] == "K02R1P0002"
+
+    out = tmp_path / "out.csv"
+    assert session.export(str(out)) == 1
+    with open(out, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f, delimiter=";"))
+    assert rows[0]["name"] == "Pikachu 25"
+    assert rows[0]["stock"] == "2"
+
+
+def test_pricing_service_shares_cached_searches():
+    cards = [{
+        "name": "Pikachu",
+        "card_number": "25",
+        "episode": {"name": "Base Set"},
+        "prices": {"cardmarket": {"30d_average": 2}},
+    }]
+    rate = SimpleNamespace(status_code=200, json=lambda: {"rates": [{"mid": 4.0}]})
+
+    def fake_get(url, **kwargs):
+        return rate if "nbp" in url else api_response(cards)
+
+    service = PricingService(resolve_set_code=lambda name: "base1")
+    with patch("requests.get", side_effect=fake_get) as get:
+        assert service.fetch_price("Pikachu", "25", "Base") == round(2 * 4.0 * 1.23, 2)
+        assert service.fetch_variants("Pikachu", "25", "Base")[0]["price"] == round(2 * 4.0 * 1.23, 2)
+        assert service.lookup("Pikachu", "25", "Base")["eur_pln_rate"] == 4.0
+    assert get.call_count == 2
+    assert get.call_args_list[0].kwargs["params"]["set"] == "base1"
+
+
+def test_recognize_card_skips_remote_when_local_is_confident(tmp_path):
+    local = {"name": "Pikachu", "number": "25", "suffix": "", "set_code": "sv1", "confidence": 0.9}
+    remote_calls = []
+
+    def remote():
+        remote_calls.append(1)
+        return {"name": "", "number": "25", "suffix": "", "set": ""}
+
+    with patch.object(recognition.ocr, "recognize", return_value=dict(local)):
+        result = recognition.recognize_card(
+            "scan.jpg", remote, str(tmp_path), set_name=lambda code: code.upper()
+        )
+        assert result["set"] == "SV1"
+        assert not remote_calls
+
+        partial = []
+        result = recognition.recognize_card(
+            "scan.jpg", remote, str(tmp_path), confidence=0.95, on_partial=partial.append
+        )
+    assert remote_calls == [1]
+    assert partial and result["name"] == "Pikachu"
@@ -0,0 +1,57 @@
+import csv
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import sys
+sys.modules.setdefault("customtkinter", MagicMock())
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from kartoteka import csv_utils
+
+
+def write_export(path, rows=50):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["product_code", "name", "description"])
+        for i in range(rows):
+            writer.writerow([i, f"Card {i}", "<p>opis; z separatorem</p>"])
+
+
+def test_split_keeps_header_and_rows(tmp_path):
+    src = tmp_path / "export.csv"
+    write_export(src)
+    chunks = csv_utils.split_csv(str(src), max_bytes=300)
+    assert len(chunks) > 1
+    rows = []
+    for chunk in chunks:
+        assert Path(chunk).stat().st_size <= 300
+        with open(chunk, encoding="utf-8", newline="") as f:
+            reader = csv.reader(f, delimiter=";")
+            assert next(reader) == ["product_code", "name", "description"]
+            rows.extend(reader)
+    assert [r[0] for r in rows] == [str(i) for i in range(50)]
+
+
+def test_upload_resumes_after_failure(tmp_path):
+    src = tmp_path / "export.csv"
+    write_export(src)
+    sent = []
+
+    def flaky(path):
+        if len(sent) == 2:
+            raise RuntimeError("timeout")
+        sent.append(Path(path).name)
+
+    try:
+        csv_utils.upload_csv_chunks(str(src), flaky, max_bytes=300, retries=2, delay=0)
+    except RuntimeError:
+        pass
+    assert len(sent) == 2
+    assert (tmp_path / "export.csv.upload.json").exists()
+
+    resumed = []
+    chunks = csv_utils.upload_csv_chunks(
+        str(src), lambda p: resumed.append(Path(p).name), max_bytes=300, delay=0
+    )
+    assert resumed == [Path(c).name for c in chunks[2:]]
+    assert not (tmp_path / "export.csv.upload.json").exists()
+    assert not (tmp_path / "export.csv.chunks").exists()
@@ -0,0 +1,54 @@
+import os
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from PIL import Image
+from kartoteka import derivatives
+
+
+def make_scan(path, size=(2000, 2800)):
+    img = Image.new("RGB", size, "white")
+    img.paste(Image.new("RGB", (1600, 2240), "red"), (200, 280))
+    img.save(path, "JPEG")
+
+
+def test_build_derivatives_writes_manifest(tmp_path):
+    make_scan(tmp_path / "a.jpg")
+    make_scan(tmp_path / "b.jpg")
+
+    manifest = derivatives.build_derivatives(str(tmp_path), workers=1)
+    assert set(manifest) == {"a.jpg", "b.jpg"}
+    out = Path(derivatives.derivatives_dir(str(tmp_path)))
+    with Image.open(out / manifest["a.jpg"]["web"]) as web:
+        assert max(web.size) <= derivatives.WEB_IMAGE_SIZE
+    with Image.open(out / manifest["a.jpg"]["rec"]) as rec:
+        assert rec.size[0] <= derivatives.RECOGNITION_SIZE[0]
+        # scanner margins are trimmed away
+        assert rec.getpixel((2, 2))[1] < 100
+
+    assert derivatives.web_name(str(tmp_path), "a.jpg") == "a.jpg"
+    assert derivatives.recognition_path(str(tmp_path / "a.jpg")).endswith(
+        os.path.join("rec", "a.jpg")
+    )
+    # the remote copy is only used once it has been uploaded
+    assert derivatives.recognition_name(str(tmp_path), "a.jpg") is None
+    derivatives.mark_recognition_uploaded(str(tmp_path))
+    assert derivatives.recognition_name(str(tmp_path), "a.jpg") == "rec/a.jpg"
+
+    # a changed scan needs its new crop uploaded again
+    make_scan(tmp_path / "a.jpg", size=(2100, 2900))
+    os.utime(tmp_path / "a.jpg", (1, 1))
+    derivatives.build_derivatives(str(tmp_path), workers=1)
+    assert derivatives.recognition_name(str(tmp_path), "a.jpg") is None
+    assert derivatives.recognition_name(str(tmp_path), "b.jpg") == "rec/b.jpg"
+
+
+def test_unchanged_scans_are_skipped(tmp_path):
+    make_scan(tmp_path / "a.jpg")
+    derivatives.build_derivatives(str(tmp_path), workers=1)
+    calls = []
+    derivatives.build_derivatives(
+        str(tmp_path), workers=1, progress=lambda d, t: calls.append(d)
+    )
+    assert calls == []
@@ -84,3 +84,32 @@ def test_export_appends_inventory(tmp_path, monkeypatch):
         assert rows[0]["warehouse_code"] == "K1R1P1"
 
 
+
+
+def test_export_clears_session_journal(tmp_path):
+    out_path = tmp_path / "out.csv"
+    dummy = SimpleNamespace(
+        output_data=[{
+            "nazwa": "Pikachu",
+            "numer": "1",
+            "set": "Base",
+            "suffix": "",
+            "product_code": 1,
+            "cena": "10",
+            "category": "Karty",
+            "producer": "Pokemon",
+            "short_description": "s",
+            "description": "d",
+            "warehouse_code": "K1R1P1",
+            "image1": "img.jpg",
+        }],
+        journal=MagicMock(),
+        back_to_welcome=lambda: None,
+    )
+    with patch("tkinter.filedialog.asksaveasfilename", return_value=str(out_path)), \
+         patch("tkinter.messagebox.showinfo"), \
+         patch("tkinter.messagebox.askyesno", return_value=False), \
+         patch.object(ui.csv_utils, "INVENTORY_CSV", str(tmp_path / "inv.csv")):
+        ui.CardEditorApp.export_csv(dummy)
+    assert out_path.exists()
+    dummy.journal.clear.assert_called_once_with()
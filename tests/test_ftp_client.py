@@ -0,0 +1,67 @@
+import threading
+from ftplib import error_perm
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+import ftp_client
+
+
+class FakeFTP:
+    """In-memory FTP server shared by all sessions."""
+
+    files = {}
+    lock = threading.Lock()
+    sessions = 0
+
+    def __init__(self, *a, **k):
+        with FakeFTP.lock:
+            FakeFTP.sessions += 1
+
+    def voidcmd(self, cmd):
+        if cmd.startswith("MDTM"):
+            raise error_perm("502 not supported")
+        return "200 OK"
+
+    def size(self, path):
+        with FakeFTP.lock:
+            if path not in FakeFTP.files:
+                raise error_perm("550 not found")
+            return len(FakeFTP.files[path])
+
+    def storbinary(self, cmd, fh, blocksize=8192, callback=None, rest=None):
+        path = cmd.split(" ", 1)[1]
+        data = fh.read()
+        with FakeFTP.lock:
+            prefix = FakeFTP.files.get(path, b"")[: rest or 0]
+            FakeFTP.files[path] = prefix + data
+        if callback:
+            callback(data)
+
+    def quit(self):
+        pass
+
+
+def test_upload_directory_skips_and_resumes(tmp_path):
+    for i in range(6):
+        (tmp_path / f"scan{i}.jpg").write_bytes(bytes([i]) * 100)
+    FakeFTP.files = {
+        "./scan0.jpg": bytes([0]) * 100,
+        "./scan1.jpg": bytes([1]) * 40,
+    }
+    FakeFTP.sessions = 0
+    progress = []
+
+    with patch.object(ftp_client, "FTP", FakeFTP):
+        with ftp_client.FTPClient("h", "u", "p") as ftp:
+            summary = ftp.upload_directory(
+                str(tmp_path), workers=3, progress=lambda s, t, n: progress.append((s, t))
+            )
+
+    assert summary == {"uploaded": 4, "resumed": 1, "skipped": 1}
+    assert FakeFTP.sessions == 3
+    for i in range(6):
+        assert FakeFTP.files[f"./scan{i}.jpg"] == bytes([i]) * 100
+    assert progress[-1][1] == 600
+    assert max(s for s, _ in progress) == 600
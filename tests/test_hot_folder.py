@@ -0,0 +1,126 @@
+import importlib
+import sys
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.modules.setdefault("customtkinter", MagicMock())
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from kartoteka import hot_folder
+import kartoteka.ui as ui
+importlib.reload(ui)
+
+
+def bind(dummy, *names):
+    """Give ``dummy`` the named :class:`CardEditorApp` methods."""
+    for name in names:
+        setattr(dummy, name, getattr(ui.CardEditorApp, name).__get__(dummy))
+    return dummy
+
+
+def test_poll_reports_new_scans_once_they_stop_growing(tmp_path):
+    (tmp_path / "old.jpg").write_bytes(b"x")
+    watcher = hot_folder.FolderWatcher(str(tmp_path), None, known=["old.jpg"])
+    scan = tmp_path / "new.jpg"
+    scan.write_bytes(b"ab")
+    (tmp_path / "notes.txt").write_bytes(b"x")
+    assert watcher.poll() == []
+    scan.write_bytes(b"abcd")
+    assert watcher.poll() == []
+    assert watcher.poll() == [str(scan)]
+    assert watcher.poll() == []
+
+
+def test_polling_watcher_calls_back_from_its_thread(tmp_path):
+    found = []
+    done = threading.Event()
+    watcher = hot_folder.FolderWatcher(
+        str(tmp_path), lambda paths: (found.extend(paths), done.set()),
+        interval=0.01, use_events=False,
+    )
+    watcher.start()
+    try:
+        (tmp_path / "a.png").write_bytes(b"x")
+        assert done.wait(5)
+    finally:
+        watcher.stop()
+    assert watcher.mode == "polling"
+    assert found == [str(tmp_path / "a.png")]
+
+
+def test_add_scans_appends_and_prefetches(tmp_path):
+    shown = []
+    dummy = SimpleNamespace(
+        cards=["a.jpg"],
+        output_data=[{"nazwa": "A"}],
+        index=1,
+        prefetched={},
+        watched_scans=set(),
+        progress_var=SimpleNamespace(set=lambda *a: None),
+        log=lambda *a: None,
+        show_card=lambda: shown.append(True),
+        _recognize_scan=MagicMock(return_value={"name": "B"}),
+    )
+    bind(dummy, "prefetch_scan", "_translate_names")
+    rec = dummy._recognize_scan
+    with patch.object(ui.thumbnails, "load"):
+        ui.CardEditorApp.add_scans(dummy, ["a.jpg", "b.jpg"])
+        future, translate = dummy.prefetched["b.jpg"]
+        assert future.result(timeout=5) == {"name": "B"}
+    # the new scan is not uploaded yet, so the file itself is recognised
+    rec.assert_called_once_with("b.jpg", "b.jpg", False, source="local")
+    assert translate is False
+    assert dummy.cards == ["a.jpg", "b.jpg"]
+    assert dummy.output_data == [{"nazwa": "A"}, None]
+    assert shown == [True]
+    ui.CardEditorApp.stop_watching(dummy)
+
+
+def test_prefetch_for_another_language_is_not_used():
+    done = Future()
+    done.set_result({"name": "English"})
+    shown = []
+    dummy = SimpleNamespace(
+        cards=["b.jpg"],
+        prefetched={"b.jpg": (done, False)},
+        watched_scans={"b.jpg"},
+        lang_var=SimpleNamespace(get=lambda: "JP"),
+        root=SimpleNamespace(after=lambda delay, fn: fn()),
+        _apply_analysis_result=lambda result, idx: shown.append(result),
+        _recognize_scan=MagicMock(return_value={"name": "JP"}),
+    )
+    bind(dummy, "_translate_names")
+    ui.CardEditorApp._analyze_and_fill(dummy, "https://example.com/x/b.jpg", 0)
+    rec = dummy._recognize_scan
+    assert shown == [{"name": "JP"}]
+    assert rec.call_args.args[:3] == ("b.jpg", "b.jpg", True)
+    assert rec.call_args.kwargs["source"] == "local"
+    assert dummy.prefetched == {}
+
+
+def test_watched_scan_is_sent_inline_in_remote_mode():
+    shown = []
+    dummy = SimpleNamespace(
+        cards=["a.jpg", "b.jpg"],
+        prefetched={},
+        watched_scans={"b.jpg"},
+        root=SimpleNamespace(after=lambda delay, fn: fn()),
+        _apply_analysis_result=lambda result, idx: shown.append(result),
+    )
+    bind(dummy, "_translate_names", "_recognize_scan")
+    with patch.object(ui, "RECOGNITION_SOURCE", "remote"), \
+            patch.object(ui.recognition, "recognize_card",
+                         side_effect=lambda path, remote, *a, **k: remote()), \
+            patch.object(ui.recognition, "analyze_card_image",
+                         return_value={"name": "B"}) as analyze:
+        ui.CardEditorApp._analyze_and_fill(dummy, "https://example.com/x/b.jpg", 1)
+        ui.CardEditorApp._analyze_and_fill(dummy, "https://example.com/x/a.jpg", 0)
+    assert shown == [{"name": "B"}, {"name": "B"}]
+    watched, uploaded = analyze.call_args_list
+    assert watched.args[0] == "b.jpg"
+    assert watched.kwargs["source"] == "local"
+    # scans loaded with the folder keep their uploaded URL
+    assert uploaded.args[0] == "https://example.com/x/a.jpg"
+    assert uploaded.kwargs["source"] == "remote"
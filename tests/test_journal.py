@@ -0,0 +1,47 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from kartoteka.core import CardSession, PricingService, SessionJournal
+
+FIELDS = {"nazwa": "Pikachu", "numer": "25", "set": "Base", "stan": "NM", "suffix": ""}
+
+
+def make_session(folder, journal):
+    return CardSession.from_folder(
+        str(folder), starting_idx=10, journal=journal,
+        pricing_service=PricingService(
+            price_db=[
+                {"name": "Pikachu", "number": "25", "set": "Base", "price": "10"},
+                {"name": "Raichu", "number": "26", "set": "Base", "price": "20"},
+            ]
+        ),
+    )
+
+
+def test_saved_cards_survive_a_restart(tmp_path):
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        (tmp_path / name).write_bytes(b"x")
+    session = make_session(tmp_path, SessionJournal(str(tmp_path), snapshot_every=2))
+    session.save_card(0, FIELDS)
+    session.save_card(1, FIELDS)  # folded into the snapshot
+    session.save_card(2, dict(FIELDS, nazwa="Raichu", numer="26"))
+    with open(session.journal.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"file": "c.jpg", "row"')  # crash while writing
+
+    (tmp_path / "0.jpg").write_bytes(b"x")  # rows follow their files
+    journal = SessionJournal(str(tmp_path))
+    assert journal.exists()
+    restored = make_session(tmp_path, journal)
+    assert journal.restore(restored) == 3
+    assert restored.output_data[0] is None
+    assert restored.output_data[1]["warehouse_code"] == "K01R1P0011"
+    assert restored.output_data[3]["nazwa"] == "Raichu"
+    assert restored.next_product_code == 3
+    assert restored.starting_idx == 10
+    assert restored.file_to_key["c.jpg"] == "Raichu|26|Base"
+    # new cards continue after the restored ones
+    assert restored.next_free_location() == "K01R1P0014"
+
+    journal.clear()
+    assert not journal.exists()
@@ -0,0 +1,33 @@
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from kartoteka.lazy import LazyModule
+
+
+def test_import_does_not_load_heavy_dependencies():
+    code = (
+        "import sys, kartoteka.ui; "
+        "print(','.join(m for m in ('openai', 'requests', 'PIL', 'customtkinter') "
+        "if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == ""
+
+
+def test_lazy_module_loads_once_and_can_be_patched():
+    stub = MagicMock()
+    loaded = MagicMock()
+    with patch.dict(sys.modules, {"fake_heavy": stub}):
+        proxy = LazyModule("fake_heavy", on_load=loaded)
+        assert proxy.value is stub.value
+        assert proxy.other is stub.other
+        loaded.assert_called_once_with(stub)
+        with patch.object(proxy, "value", "patched"):
+            assert proxy.value == "patched"
+        assert proxy.value is stub.value
@@ -0,0 +1,40 @@
+import base64
+import importlib
+import io
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.modules.setdefault("customtkinter", MagicMock())
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from PIL import Image
+import kartoteka.ui as ui
+
+
+def test_local_scan_sent_as_data_url(tmp_path, monkeypatch):
+    monkeypatch.setenv("RECOGNITION_SOURCE", "local")
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    importlib.reload(ui)
+    scan = tmp_path / "card.jpg"
+    Image.new("RGB", (1500, 2100), "blue").save(scan, "JPEG")
+
+    content = '{"name": "Pikachu", "number": "025/198", "suffix": ""}'
+    resp = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+    )
+    with patch.object(ui.openai.chat.completions, "create", return_value=resp) as create:
+        result = ui.analyze_card_image(str(scan))
+
+    assert result["name"] == "Pikachu"
+    assert result["number"] == "25"
+    parts = create.call_args.kwargs["messages"][0]["content"]
+    url = parts[1]["image_url"]["url"]
+    assert url.startswith("data:image/jpeg;base64,")
+    img = Image.open(io.BytesIO(base64.b64decode(url.split(",", 1)[1])))
+    assert img.width == ui.RECOGNITION_WIDTH
+    assert img.height < 2100 * 0.3 * ui.RECOGNITION_WIDTH / 1500 + 2
+
+    monkeypatch.delenv("RECOGNITION_SOURCE")
+    monkeypatch.delenv("OPENAI_API_KEY")
+    importlib.reload(ui)
@@ -0,0 +1,35 @@
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from PIL import Image
+from kartoteka import logo_cache
+
+
+def test_logos_are_decoded_lazily_and_thumbnails_cached(tmp_path):
+    Image.new("RGBA", (200, 100), "red").save(tmp_path / "sv1.png")
+    Image.new("RGB", (80, 80), "blue").save(tmp_path / "sv2.jpg")
+
+    with patch.object(logo_cache, "ImageTk") as tk:
+        tk.PhotoImage.side_effect = lambda img: img.size
+        cache = logo_cache.LogoCache(str(tmp_path))
+        assert len(cache) == 0
+        assert cache.get("sv1") == (40, 20)
+        assert cache.get("sv1") == (40, 20)
+        assert cache.get("missing") is None
+        assert tk.PhotoImage.call_count == 1
+    thumb = tmp_path / logo_cache.THUMBS_DIR / "sv1.png"
+    assert thumb.exists()
+    assert not (tmp_path / logo_cache.THUMBS_DIR / "sv2.png").exists()
+
+    reloaded = logo_cache.LogoCache(str(tmp_path))
+    with patch.object(logo_cache.Image, "open", wraps=Image.open) as opener:
+        assert reloaded.thumbnail("sv1").size == (40, 20)
+    opener.assert_called_once_with(str(thumb))
+
+    stale = os.path.getmtime(tmp_path / "sv1.png") - 10
+    os.utime(thumb, (stale, stale))
+    assert reloaded.thumbnail("sv1").size == (40, 20)
+    assert os.path.getmtime(thumb) > stale
@@ -53,6 +53,9 @@ def test_load_images_sets_start(monkeypatch, tmp_path):
         start_pos_var=SimpleNamespace(get=lambda: 5),
         scan_folder_var=SimpleNamespace(get=lambda: "", set=lambda v: None),
     )
+    dummy.stop_watching = lambda: ui.CardEditorApp.stop_watching(dummy)
+    dummy.load_batch_review = lambda folder: ui.CardEditorApp.load_batch_review(dummy, folder)
+    dummy.resume_session = lambda folder: ui.CardEditorApp.resume_session(dummy, folder)
 
     ui.CardEditorApp.browse_scans(dummy)
 
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from PIL import Image, ImageDraw
+from kartoteka import ocr
+
+
+def test_parse_number():
+    words = [("Illus.", 0.9), ("Ken", 0.8), ("025/198", 0.93), ("SVI", 0.7)]
+    assert ocr.parse_number(words) == ("25", 0.93)
+    assert ocr.parse_number([("TG05/TG30", 0.9)]) == ("5", 0.9)
+    assert ocr.parse_number([("Pokemon", 0.9)]) == ("", 0.0)
+
+
+def test_parse_name_strips_noise_and_suffix():
+    words = [("BASIC", 0.95), ("Charizard", 0.91), ("ex", 0.88), ("330", 0.9)]
+    assert ocr.parse_name(words) == ("Charizard", "EX", 0.91)
+
+
+def draw_symbol(shape):
+    img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    if shape == "circle":
+        draw.ellipse((8, 8, 56, 56), fill="black")
+    elif shape == "half":
+        draw.rectangle((0, 0, 31, 63), fill="black")
+    else:
+        draw.polygon([(32, 4), (60, 60), (4, 60)], fill="black")
+    return img
+
+
+def test_match_set_symbol(tmp_path):
+    for code, shape in (("sv1", "circle"), ("sv2", "half"), ("sv3", "triangle")):
+        draw_symbol(shape).save(tmp_path / f"{code}.png")
+    symbol = draw_symbol("half")
+    crop = Image.new("RGB", symbol.size, "white")
+    crop.paste(symbol, mask=symbol)
+    crop = crop.resize((40, 40))
+    code, conf = ocr.match_set_symbol(crop, str(tmp_path))
+    assert code == "sv2"
+    assert conf > ocr.OCR_CONFIDENCE
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from kartoteka.core import CardSession, PricingService, ProductRegistry
+from kartoteka.core.registry import product_code
+
+FIELDS = {"nazwa": "Pikachu", "numer": "25", "set": "Base", "stan": "NM", "suffix": ""}
+
+
+def test_codes_continue_across_sessions(tmp_path):
+    db = str(tmp_path / "products.db")
+    for name in ("a.jpg", "b.jpg"):
+        (tmp_path / name).write_bytes(b"x")
+
+    def session():
+        return CardSession.from_folder(
+            str(tmp_path),
+            pricing_service=PricingService(
+                price_db=[{"name": "Pikachu", "number": "25", "set": "Base", "price": "1"},
+                          {"name": "Eevee", "number": "1", "set": "Base", "price": "1"}]
+            ),
+            product_registry=ProductRegistry(db),
+        )
+
+    first = session()
+    assert first.save_card(0, FIELDS)["product_code"] == 1
+    assert first.save_card(1, dict(FIELDS, nazwa="Eevee", numer="1"))["product_code"] == 2
+    first.product_registry.close()
+
+    second = session()
+    # a card seen before keeps its code, a new one continues the catalogue
+    assert second.save_card(1, FIELDS)["product_code"] == 1
+    assert second.save_card(0, dict(FIELDS, nazwa="Mew", numer="151"))["product_code"] == 3
+    assert len(second.product_registry) == 3
+
+
+def test_imported_codes_and_pushed_products(tmp_path):
+    reg = ProductRegistry(str(tmp_path / "products.db"))
+    state = SimpleNamespace(product_code_map={}, next_product_code=1, product_registry=reg)
+    assert product_code(state, "A|1|X", preferred=40) == 40
+    # the code is taken, so another card gets the next free one
+    assert product_code(state, "B|2|X", preferred=40) == 41
+    assert state.next_product_code == 42
+    assert reg.owner(41) == "B|2|X"
+
+    assert not reg.is_pushed("A|1|X")
+    reg.mark_pushed(["A|1|X"], shoper_id=7)
+    assert reg.is_pushed("A|1|X") and reg.shoper_id("A|1|X") == 7
+    assert "C|3|X" not in reg
+
+
+def test_without_registry_codes_stay_per_session():
+    state = SimpleNamespace(product_code_map={}, next_product_code=1)
+    assert product_code(state, "A|1|X") == 1
+    assert product_code(state, "B|2|X", preferred=10) == 10
+    assert product_code(state, "C|3|X") == 11
+    assert product_code(state, "A|1|X") == 1
@@ -0,0 +1,76 @@
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from kartoteka import scan_animation
+
+
+def make_gif(path, frames=3):
+    images = [Image.new("RGBA", (20, 30), (255, 0, 0, 100 + i)) for i in range(frames)]
+    images[0].save(path, save_all=True, append_images=images[1:], duration=50, loop=0)
+
+
+class FakeLabel:
+    def __init__(self):
+        self.calls = []
+        self.image = None
+
+    def after(self, delay, func, *args):
+        self.calls.append((delay, func, args))
+        return len(self.calls)
+
+    def after_cancel(self, after_id):
+        pass
+
+    def configure(self, image=None):
+        self.image = image
+
+
+def test_overlay_is_decoded_once_per_size(tmp_path, monkeypatch):
+    gif = tmp_path / "scan.gif"
+    make_gif(gif)
+    opened = []
+    real_open = Image.open
+    monkeypatch.setattr(scan_animation.Image, "open", lambda p: opened.append(p) or real_open(p))
+
+    frames = scan_animation.overlay_frames((40, 60), str(gif))
+    assert len(frames) == 3 and frames[0][0].size == (40, 60)
+    assert scan_animation.overlay_frames((40, 60), str(gif)) is frames
+    assert len(opened) == 1
+    scan_animation.overlay_frames((10, 10), str(gif))
+    assert len(opened) == 2
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_frames_are_composed_off_thread_and_dropped_after_stop(tmp_path):
+    gif = tmp_path / "scan.gif"
+    make_gif(gif)
+    label = FakeLabel()
+    made = []
+    anim = scan_animation.ScanAnimation(label, lambda img: made.append(img) or img, str(gif))
+    card = Image.new("RGB", (20, 30), "blue")
+
+    anim.start(card, (40, 60))
+    wait_for(lambda: label.calls)
+    delay, play, args = label.calls.pop()
+    assert delay == 0
+    play(*args)
+    assert label.image.size == (40, 60)
+    assert len(made) == 1  # frames are converted only when shown
+
+    anim.start(card, (40, 60))
+    wait_for(lambda: any(d == 0 for d, _, _ in label.calls))
+    _, play, args = [c for c in label.calls if c[0] == 0][-1]
+    anim.stop()
+    label.image = None
+    play(*args)
+    assert label.image is None
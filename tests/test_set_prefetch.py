@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from kartoteka.core import PricingService
+
+
+def card(name, number):
+    return {
+        "name": name,
+        "card_number": number,
+        "episode": {"name": "Base Set"},
+        "prices": {"cardmarket": {"30d_average": 2}},
+    }
+
+
+PAGES = {
+    1: [card("Alakazam", 1), card("Blastoise", 2)],
+    2: [card("Pikachu", 58)],
+    3: [],
+}
+
+
+def fake_get(url, params=None, **kwargs):
+    if "nbp" in url:
+        return SimpleNamespace(status_code=200, json=lambda: {"rates": [{"mid": 4.0}]})
+    cards = PAGES[params["page"]] if "page" in params else [card("Mew", 8)]
+    return SimpleNamespace(status_code=200, json=lambda: {"data": cards})
+
+
+def test_prefetched_set_prices_cards_without_requests():
+    service = PricingService(resolve_set_code=lambda name: "base1")
+    with patch("requests.get", side_effect=fake_get) as get:
+        assert service.prefetch_set("Base") == 3
+        assert [c.kwargs["params"] for c in get.call_args_list] == [
+            {"set": "base1", "page": 1},
+            {"set": "base1", "page": 2},
+            {"set": "base1", "page": 3},
+        ]
+        # a second prefetch of the same set is skipped
+        assert service.prefetch_set("base") == 0
+        get.reset_mock()
+
+        assert service.fetch_price("Pikachu", "58", "Base") == round(2 * 4.0 * 1.23, 2)
+        assert service.fetch_price("Blastoise", "2", "Base") is not None
+        assert all("nbp" in c.args[0] for c in get.call_args_list)
+
+        # cards missing from the prefetched list still go to the API
+        service.search("Mew", "8", "Base")
+        assert get.call_args.kwargs["params"] == {"name": "mew", "number": "8", "set": "base1"}
+
+
+def test_no_set_prefetch_through_rapidapi():
+    # RapidAPI's search matches card names, not sets
+    service = PricingService(rapidapi_key="key", rapidapi_host="host.example")
+    with patch("requests.get", side_effect=fake_get) as get:
+        assert service.prefetch_set("Base") == 0
+    get.assert_not_called()
+    assert service.prefetched_set("Base") is None
@@ -0,0 +1,64 @@
+import importlib
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+sys.modules.setdefault("customtkinter", MagicMock())
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+import kartoteka.ui as ui
+importlib.reload(ui)
+from kartoteka.set_search import SetSearchIndex
+
+SETS = {
+    "Scarlet & Violet": [
+        {"name": "Scarlet & Violet", "code": "sv1"},
+        {"name": "Paldea Evolved", "code": "sv2"},
+        {"name": "Prismatic Evolutions", "code": "sv8pt5"},
+    ],
+    "Sword & Shield": [
+        {"name": "Evolving Skies", "code": "swsh7"},
+        {"name": "Evolutions", "code": "xy12"},
+    ],
+}
+
+
+def test_search_ranks_exact_prefix_word_and_substring():
+    index = SetSearchIndex.from_eras(SETS)
+    assert index.search("evol") == [
+        "Evolving Skies",
+        "Evolutions",
+        "Paldea Evolved",
+        "Prismatic Evolutions",
+    ]
+    assert index.search("evolutions") == ["Evolutions", "Prismatic Evolutions"]
+    assert index.search("v", limit=2) == ["Scarlet & Violet", "Paldea Evolved"]
+    assert index.search("") == index.names
+
+
+def test_search_and_resolution_tolerate_typos():
+    index = SetSearchIndex.from_eras(SETS)
+    assert index.search("prismtic")[0] == "Prismatic Evolutions"
+    assert index.code("Paldea Evloved") == "sv2"
+    assert index.code("SWSH7") == "swsh7"
+    assert index.code("Base Set") is None
+    assert index.name("SV2") == "Paldea Evolved"
+
+
+def test_unknown_set_names_are_not_resolved_to_similar_sets():
+    ui.ensure_sets()
+    for name in ("Sun & Moon 2", "Base Set 3", "Jungle 2", "Fossil 2"):
+        assert ui.get_set_code(name) == name
+    assert ui.get_set_code("Jungle") == ui.set_index.code("Jungle", fuzzy=False)
+
+
+def test_autocomplete_uses_language_index():
+    widget = MagicMock()
+    dummy = SimpleNamespace(
+        set_var=MagicMock(),
+        lang_var=MagicMock(),
+    )
+    dummy.set_var.get.return_value = "prismatic"
+    dummy.lang_var.get.return_value = "ENG"
+    ui.CardEditorApp.autocomplete_set(dummy, SimpleNamespace(widget=widget))
+    dummy.set_var.set.assert_called_once_with("Prismatic Evolutions")
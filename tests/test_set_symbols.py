@@ -0,0 +1,44 @@
+import queue
+from pathlib import Path
+from types import SimpleNamespace
+
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from kartoteka import set_symbols
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls.append((url, dict(headers or {})))
+        if "sv09" in url:
+            return SimpleNamespace(status_code=404, content=b"", headers={})
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return SimpleNamespace(status_code=304, content=b"", headers={})
+        return SimpleNamespace(status_code=200, content=b"png", headers={"ETag": '"v1"'})
+
+
+def test_download_symbols_conditional_and_progress(tmp_path):
+    sets = [
+        {"name": "One", "code": "sv1"},
+        {"name": "Nine", "code": "sv09"},
+        {"name": "Two", "code": "sv2"},
+    ]
+    session = FakeSession()
+    progress = queue.Queue()
+    summary = set_symbols.download_symbols(
+        sets, str(tmp_path), workers=2, progress_queue=progress, session=session
+    )
+    assert summary == {"saved": 3, "unchanged": 0, "missing": 0, "error": 0}
+    assert (tmp_path / "sv09.png").read_bytes() == b"png"
+    assert any(url.endswith("/sv9/symbol.png") for url, _ in session.calls)
+    messages = [progress.get_nowait() for _ in range(3)]
+    assert [m[0] for m in messages] == [1, 2, 3]
+    assert all(m[1] == 3 for m in messages)
+
+    session = FakeSession()
+    summary = set_symbols.download_symbols(sets, str(tmp_path), session=session)
+    assert summary["unchanged"] == 3
+    assert all(h.get("If-None-Match") == '"v1"' for _, h in session.calls)
@@ -11,11 +11,8 @@ import kartoteka.ui as ui
 importlib.reload(ui)
 
 
-def make_dummy(tmp_path, sets_file):
+def make_dummy():
     return SimpleNamespace(
-        sets_file=str(sets_file),
-        loading_label=SimpleNamespace(configure=lambda *a, **k: None),
-        root=SimpleNamespace(update=lambda *a, **k: None),
         download_set_symbols=MagicMock(),
     )
 
@@ -44,33 +41,77 @@ def test_update_set_options_sets_file_eng():
     dummy.set_dropdown.configure.assert_called_with(values=ui.tcg_sets_eng)
 
 
-def run_update_sets(tmp_path, filename):
-    sets_file = tmp_path / filename
-    sets_file.write_text("{}", encoding="utf-8")
-    dummy = make_dummy(tmp_path, sets_file)
-
-    resp = SimpleNamespace(
-        status_code=200,
+def make_resp(status_code=200, etag='"abc"'):
+    return SimpleNamespace(
+        status_code=status_code,
         json=lambda: {"data": [{"series": "X", "id": "CODE", "name": "Name"}]},
         raise_for_status=lambda: None,
+        headers={"ETag": etag},
     )
-    with patch("requests.get", return_value=resp), patch.object(ui, "reload_sets") as reload_mock:
-        ui.CardEditorApp.update_sets(dummy)
+
+
+def set_files(tmp_path):
+    eng = tmp_path / "tcg_sets.json"
+    jp = tmp_path / "tcg_sets_jp.json"
+    eng.write_text("{}", encoding="utf-8")
+    jp.write_text(json.dumps({"X": [{"name": "Name", "code": "code"}]}), encoding="utf-8")
+    return eng, jp
+
+
+def test_update_sets_writes_both_catalogues(tmp_path):
+    eng, jp = set_files(tmp_path)
+    dummy = make_dummy()
+    with patch.object(ui.set_catalogue, "SET_FILES", (str(eng), str(jp))), \
+         patch.object(ui.set_catalogue, "CACHE_DIR", str(tmp_path / "cache")), \
+         patch("requests.get", return_value=make_resp()), \
+         patch.object(ui, "reload_sets") as reload_mock:
+        assert ui.CardEditorApp.update_sets(dummy) == 1
         reload_mock.assert_called_once()
 
-    data = json.loads(sets_file.read_text(encoding="utf-8"))
+    data = json.loads(eng.read_text(encoding="utf-8"))
     # expect inserted under "X" with code and name
     assert "X" in data
     assert {"name": "Name", "code": "CODE"} in data["X"]
+    # the JP catalogue already knew the code and is left untouched
+    assert json.loads(jp.read_text(encoding="utf-8")) == {"X": [{"name": "Name", "code": "code"}]}
     dummy.download_set_symbols.assert_called_once_with([{"name": "Name", "code": "CODE"}])
-
-
-
-def test_update_sets_eng(tmp_path):
-    run_update_sets(tmp_path, "tcg_sets.json")
-
-
-
-def test_update_sets_jp(tmp_path):
-    run_update_sets(tmp_path, "tcg_sets_jp.json")
-
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_update_sets_conditional_and_interval(tmp_path):
+    eng, jp = set_files(tmp_path)
+    dummy = make_dummy()
+    with patch.object(ui.set_catalogue, "SET_FILES", (str(eng), str(jp))), \
+         patch.object(ui.set_catalogue, "CACHE_DIR", str(tmp_path / "cache")), \
+         patch.object(ui, "reload_sets"):
+        with patch("requests.get", return_value=make_resp()) as get:
+            ui.CardEditorApp.update_sets(dummy)
+        # within the refresh interval no request is made
+        with patch("requests.get") as get:
+            assert ui.CardEditorApp.update_sets(dummy) == 0
+            get.assert_not_called()
+        # forced checks send the cached validator and accept 304
+        with patch("requests.get", return_value=make_resp(304)) as get:
+            assert ui.CardEditorApp.update_sets(dummy, force=True) == 0
+            assert get.call_args.kwargs["headers"]["If-None-Match"] == '"abc"'
+    assert dummy.download_set_symbols.call_count == 1
+
+
+def test_update_sets_skips_missing_jp_catalogue(tmp_path):
+    eng = tmp_path / "tcg_sets.json"
+    jp = tmp_path / "tcg_sets_jp.json"
+    eng.write_text(json.dumps({"X": [{"name": "Old", "code": "old"}]}), encoding="utf-8")
+    resp = make_resp()
+    resp.json = lambda: {"data": [
+        {"series": "X", "id": "old", "name": "Old"},
+        {"series": "X", "id": "CODE", "name": "Name"},
+    ]}
+    with patch.object(ui.set_catalogue, "SET_FILES", (str(eng), str(jp))), \
+         patch.object(ui.set_catalogue, "CACHE_DIR", str(tmp_path / "cache")), \
+         patch("requests.get", return_value=resp), \
+         patch.object(ui, "reload_sets"):
+        assert ui.CardEditorApp.update_sets(make_dummy()) == 1
+    assert json.loads(eng.read_text(encoding="utf-8"))["X"][-1] == {"name": "Name", "code": "CODE"}
+    assert not jp.exists()
+    # only the validators are cached, not the response
+    assert [p.name for p in (tmp_path / "cache").iterdir()] == ["sets_meta.json"]
@@ -0,0 +1,43 @@
+import importlib
+import queue
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.modules.setdefault("customtkinter", MagicMock())
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+import kartoteka.ui as ui
+importlib.reload(ui)
+
+
+def make_dummy(added):
+    dummy = SimpleNamespace(
+        update_sets=MagicMock(return_value=added),
+        load_set_logos=MagicMock(),
+        update_set_options=MagicMock(),
+        set_dropdown=MagicMock(),
+        progress_queue=queue.Queue(),
+        startup_started=0.0,
+        root=SimpleNamespace(after=lambda delay, cb: cb()),
+    )
+    dummy.finish_set_sync = lambda a, e: ui.CardEditorApp.finish_set_sync(dummy, a, e)
+    return dummy
+
+
+def test_background_sync_hot_reloads_new_sets():
+    dummy = make_dummy(2)
+    with patch.object(ui.symbol_index, "get_index"):
+        ui.CardEditorApp.startup_tasks(dummy)
+    dummy.load_set_logos.assert_called_once()
+    dummy.update_set_options.assert_called_once()
+    assert dummy.progress_queue.get_nowait() == "Dodano nowe sety: 2"
+    assert dummy.sets_synced_at > 0
+
+
+def test_offline_sync_keeps_local_sets():
+    dummy = make_dummy(None)
+    with patch.object(ui.symbol_index, "get_index"):
+        ui.CardEditorApp.startup_tasks(dummy)
+    dummy.load_set_logos.assert_not_called()
+    assert "Brak połączenia" in dummy.progress_queue.get_nowait()
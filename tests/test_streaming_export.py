@@ -0,0 +1,49 @@
+import csv
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from kartoteka.core import build_card_row, export
+
+
+def rows(count):
+    for i in range(count):
+        data = {"nazwa": f"Card {i % 3}", "numer": str(i % 3), "set": "Base", "stan": "NM", "typ": "", "suffix": ""}
+        yield build_card_row(data, f"img{i}.jpg", i % 3 + 1, f"K01R1P{i + 1:04d}")
+    yield None
+
+
+def read(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f, delimiter=";"))
+
+
+def test_one_pass_writes_export_and_inventory(tmp_path):
+    out = tmp_path / "out.csv"
+    inventory = tmp_path / "magazyn.csv"
+    assert export.write_shoper_csv(str(out), rows(7), inventory_path=str(inventory)) == 3
+    products = read(out)
+    assert [p["stock"] for p in products] == ["3", "2", "2"]
+    assert products[0]["warehouse_code"] == "K01R1P0001"
+    lines = read(inventory)
+    assert len(lines) == 7 and {line["stock"] for line in lines} == {"1"}
+
+    export.write_shoper_csv(str(out), rows(2), inventory_path=str(inventory))
+    assert len(read(inventory)) == 9  # appended under the existing header
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["magazyn.csv", "out.csv"]
+
+
+def test_failed_export_leaves_files_untouched(tmp_path):
+    out = tmp_path / "out.csv"
+    inventory = tmp_path / "magazyn.csv"
+    out.write_text("old", encoding="utf-8")
+    inventory.write_text("inventory\n", encoding="utf-8")
+    with patch.object(export.os, "replace", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            export.write_shoper_csv(str(out), rows(3), inventory_path=str(inventory))
+    assert out.read_text(encoding="utf-8") == "old"
+    assert inventory.read_text(encoding="utf-8") == "inventory\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["magazyn.csv", "out.csv"]
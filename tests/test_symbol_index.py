@@ -0,0 +1,38 @@
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import sys
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from PIL import Image, ImageDraw
+from kartoteka import symbol_index
+
+
+def logo(box):
+    img = Image.new("RGBA", (48, 48), (0, 0, 0, 0))
+    ImageDraw.Draw(img).rectangle(box, fill="black")
+    return img
+
+
+def test_index_is_persisted_and_incremental(tmp_path):
+    logo((0, 0, 23, 47)).save(tmp_path / "sv1.png")
+    logo((0, 0, 47, 23)).save(tmp_path / "sv2.png")
+
+    index = symbol_index.SymbolIndex(str(tmp_path)).load()
+    assert index.refresh()
+    assert len(index) == 2
+    assert (tmp_path / symbol_index.INDEX_FILE).exists()
+
+    crop = Image.new("RGB", (48, 48), "white")
+    crop.paste(logo((0, 0, 47, 23)), mask=logo((0, 0, 47, 23)))
+    assert index.query(crop.resize((30, 30)), k=2)[0][0] == "sv2"
+
+    reloaded = symbol_index.SymbolIndex(str(tmp_path)).load()
+    with patch.object(symbol_index, "symbol_hash", MagicMock(return_value=0)) as hasher:
+        assert not reloaded.refresh()
+        hasher.assert_not_called()
+        logo((24, 0, 47, 47)).save(tmp_path / "sv3.png")
+        os.remove(tmp_path / "sv1.png")
+        assert reloaded.refresh()
+        assert hasher.call_count == 1
+    assert sorted(reloaded.entries) == ["sv2", "sv3"]
@@ -0,0 +1,52 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from kartoteka.core import templates
+
+CARD = {"nazwa": "Pika <Chu>", "numer": "25", "set": "Base", "typ": "Holo", "stan": "NM", "język": "ENG"}
+
+
+@pytest.fixture(autouse=True)
+def restore_templates():
+    saved = {key: dict(value) for key, value in templates._sources.items()}
+    yield
+    templates._sources.clear()
+    templates._sources.update(saved)
+    templates.templates_for.cache_clear()
+
+
+def test_default_templates_match_the_shop_copy():
+    short, full = templates.render_descriptions(CARD)
+    assert short == (
+        "<p><strong>Pika &lt;Chu&gt;</strong></p><ul><li>Zestaw: Base</li>"
+        "<li>Numer karty: 25</li><li>Typ: Holo</li><li>Stan: NM</li></ul>"
+    )
+    assert full.startswith("<p>Pika &lt;Chu&gt; – Pokémon TCG</p><p>Karta pochodzi z zestawu Base i ma numer 25.")
+    assert full.count("<p>") == 4
+    assert templates.render_many([CARD, CARD]) == [(short, full)] * 2
+
+
+def test_set_and_language_templates_override_the_default(tmp_path):
+    path = tmp_path / "templates.json"
+    path.write_text(json.dumps({
+        "*": {"Base": {"short_description": "<b>{name}</b> {{{number}}}"}},
+        "JP": {"*": {"description": "<p>{name} ({language})</p>"}},
+    }), encoding="utf-8")
+    assert templates.load(str(path)) == 2
+
+    short, full = templates.render_descriptions(CARD)
+    assert short == "<b>Pika &lt;Chu&gt;</b> {25}"
+    assert full.startswith("<p>Pika &lt;Chu&gt; – Pokémon TCG")
+
+    short, full = templates.render_descriptions(dict(CARD, set="Jungle", język="JP"))
+    assert short.startswith("<p><strong>")
+    assert full == "<p>Pika &lt;Chu&gt; (JP)</p>"
+
+
+def test_unknown_placeholder_is_rejected():
+    with pytest.raises(ValueError):
+        templates.Template("{price}")
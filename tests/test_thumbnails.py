@@ -0,0 +1,59 @@
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from kartoteka import thumbnails
+
+
+def make_scan(path, size=(2000, 2800), orientation=None):
+    img = Image.new("RGB", size, "white")
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    img.save(path, "JPEG", exif=exif)
+
+
+def test_jpeg_is_decoded_at_reduced_scale(tmp_path):
+    scan = tmp_path / "a.jpg"
+    make_scan(scan)
+    drafts = []
+    real_draft = Image.Image.draft
+
+    def draft(img, mode, size):
+        result = real_draft(img, mode, size)
+        drafts.append(img.size)
+        return result
+
+    with patch.object(Image.Image, "draft", draft, create=True):
+        thumb = thumbnails.scaled(str(scan), (400, 560))
+    assert thumb.size == (400, 560)
+    assert drafts and drafts[0][0] < 2000
+
+
+def test_exif_orientation_is_applied(tmp_path):
+    scan = tmp_path / "a.jpg"
+    make_scan(scan, size=(2800, 2000), orientation=6)
+    assert thumbnails.scaled(str(scan), (400, 560)).size == (400, 560)
+
+
+def test_thumbnails_are_cached_until_the_scan_changes(tmp_path):
+    scan = tmp_path / "a.jpg"
+    make_scan(scan)
+    cache = tmp_path / "cache"
+    first = thumbnails.load(str(scan), (400, 560), str(cache))
+    assert first.size == (400, 560)
+    assert len(os.listdir(cache)) == 1
+
+    with patch.object(thumbnails, "scaled") as scaled:
+        assert thumbnails.load(str(scan), (400, 560), str(cache)).size == (400, 560)
+    scaled.assert_not_called()
+
+    stat = scan.stat()
+    os.utime(scan, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    thumbnails.load(str(scan), (400, 560), str(cache))
+    thumbnails.load(str(scan), (200, 280), str(cache))
+    assert len(os.listdir(cache)) == 3